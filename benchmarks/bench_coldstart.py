@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Cold-start cost of importing pyhwm2014 and loading the coefficients.
+
+Each measurement starts a new interpreter, as seen by short-lived CLI
+invocations and serverless calls, and times one statement:
+
+* ``import numpy``: the floor of every case
+* ``import pyhwm2014``: the package import alone
+* ``import + profile``: the import and a short ``HWM14`` height profile
+* ``fortran``: the first evaluation of one point, including ``inithwm``
+  reading the files through Fortran I/O
+* ``numpy (parse)``: the NumPy backend parsing the files
+* ``numpy (bundle)``: the NumPy backend mapping the coefficient bundle
+
+Usage:
+    python benchmarks/bench_coldstart.py [--repeat 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Setup and timed statement of each case
+CASES: dict[str, tuple[str, str]] = {
+    "import numpy": ("", "import numpy"),
+    "import pyhwm2014": ("", "import pyhwm2014"),
+    "import + profile": (
+        "",
+        "import pyhwm2014; pyhwm2014.HWM14(altlim=[90, 200], altstp=1, ap=[-1, 35], "
+        "day=323, option=1, ut=11.66667, verbose=False, year=1993)",
+    ),
+    "fortran": (
+        "from pyhwm2014 import evaluate",
+        "evaluate(93323, 42000.0, 250.0, -11.95, -76.77, ap=35.0)",
+    ),
+    "numpy (parse)": (
+        "from pyhwm2014 import numpy_backend as nb, HWMPATH",
+        "nb.hwmqt(93323, 42000.0, 250.0, -11.95, -76.77, "
+        "qwm=nb.QWMCoefficients(HWMPATH + '/hwm123114.bin'))",
+    ),
+    "numpy (bundle)": (
+        "from pyhwm2014 import numpy_backend as nb",
+        "nb.hwmqt(93323, 42000.0, 250.0, -11.95, -76.77)",
+    ),
+}
+
+TEMPLATE = """
+import time
+{setup}
+t0 = time.perf_counter()
+{stmt}
+print(time.perf_counter() - t0)
+"""
+
+
+def cold_start(setup: str, stmt: str, cache: str) -> float:
+    """Run stmt in a fresh interpreter and return its time in seconds."""
+    code = TEMPLATE.format(setup=setup, stmt=stmt)
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        env={**os.environ, "PYHWM2014_CACHE": cache},
+        text=True,
+    )
+    return float(result.stdout.split()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="number of fresh processes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache:
+        # The first process builds the bundle in the empty cache
+        build = cold_start(*CASES["numpy (bundle)"], cache)
+        print(f"bundle build: {build * 1e3:.1f} ms")
+        print(f"{'case':>16} {'median (ms)':>12} {'min (ms)':>10}")
+        for name, (setup, stmt) in CASES.items():
+            times = [cold_start(setup, stmt, cache) for _ in range(args.repeat)]
+            print(f"{name:>16} {statistics.median(times) * 1e3:>12.1f} {min(times) * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Thread scaling of the OpenMP batch kernels.
+
+Evaluates HWM14 at a random sample of points (uniform in day, UT, altitude,
+latitude and longitude, with half of the points disturbed) on 1 to N threads
+and reports the throughput and parallel efficiency.
+
+Usage:
+    python benchmarks/bench_threads.py [--points 1000000] [--max-threads N]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from pyhwm2014 import evaluate, get_num_threads, set_num_threads
+
+
+def random_points(n: int, seed: int = 14) -> tuple[np.ndarray, ...]:
+    """Return (iyd, sec, alt, glat, glon, ap) for n random points."""
+    rng = np.random.default_rng(seed)
+    return (
+        (23000 + rng.integers(1, 366, n)).astype(np.int32),
+        rng.uniform(0.0, 86400.0, n).astype(np.float32),
+        rng.uniform(0.0, 500.0, n).astype(np.float32),
+        rng.uniform(-90.0, 90.0, n).astype(np.float32),
+        rng.uniform(-180.0, 180.0, n).astype(np.float32),
+        rng.choice([-1.0, 4.0, 35.0, 200.0], n).astype(np.float32),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=float, default=1e6, help="number of points")
+    parser.add_argument(
+        "--max-threads", type=int, default=os.cpu_count() or 1, help="largest thread count"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="best of this many runs")
+    args = parser.parse_args()
+
+    iyd, sec, alt, glat, glon, ap = random_points(int(args.points))
+    evaluate(iyd[:10], sec[:10], alt[:10], glat[:10], glon[:10], ap=ap[:10])  # load coefficients
+
+    threads = sorted({1, *range(2, args.max_threads + 1, 2), args.max_threads})
+    print(f"{iyd.size} points, best of {args.repeat}")
+    print(f"{'threads':>8} {'time (s)':>10} {'Mpts/s':>8} {'speedup':>8} {'efficiency':>10}")
+
+    reference = None
+    baseline = None
+    try:
+        for n in threads:
+            set_num_threads(n)
+            if get_num_threads() != n:
+                print(f"{n:>8} skipped (built without OpenMP)")
+                continue
+            best = np.inf
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                w = evaluate(iyd, sec, alt, glat, glon, ap=ap)
+                best = min(best, time.perf_counter() - t0)
+            if reference is None:
+                reference, baseline = w, best
+            elif not np.array_equal(w, reference):
+                raise RuntimeError(f"results on {n} threads differ from 1 thread")
+            speedup = baseline / best
+            print(
+                f"{n:>8} {best:>10.3f} {iyd.size / best / 1e6:>8.3f} "
+                f"{speedup:>8.2f} {speedup / n:>10.2f}"
+            )
+    finally:
+        set_num_threads()
+
+
+if __name__ == "__main__":
+    main()
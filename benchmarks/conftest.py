@@ -0,0 +1,53 @@
+"""Fixtures of the pytest-benchmark suite.
+
+Every fast path is benchmarked in the same ``group`` as the per-point loop
+over ``hwm14.hwm14`` on the same inputs, so that the report of each group
+shows its speedup. Run the suite with ``make bench``; see the README.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Number of points of the random clouds
+CLOUD_SIZE: int = 2000
+
+
+@pytest.fixture(scope="session", autouse=True)
+def model():
+    """Load the coefficients before any benchmark runs."""
+    import pyhwm2014
+
+    pyhwm2014.init()
+
+
+@pytest.fixture(scope="session")
+def per_point():
+    """Evaluate HWM14 one point at a time, the baseline of every group."""
+    from pyhwm2014 import hwm14
+
+    def loop(iyd, sec, alt, glat, glon, ap=-1.0) -> np.ndarray:
+        inputs = np.broadcast_arrays(iyd, sec, alt, glat, glon, ap)
+        return np.array(
+            [
+                hwm14.hwm14(int(d), s, z, la, lo, -1.0, -1.0, -1.0, [-1.0, a])
+                for d, s, z, la, lo, a in zip(*(x.ravel() for x in inputs))
+            ]
+        )
+
+    return loop
+
+
+@pytest.fixture(scope="session")
+def cloud() -> tuple[np.ndarray, ...]:
+    """Random points over the whole input space: iyd, sec, alt, glat, glon, ap."""
+    rng = np.random.default_rng(2014)
+    return (
+        rng.integers(1, 366, CLOUD_SIZE) + 93000,
+        rng.uniform(0.0, 86400.0, CLOUD_SIZE),
+        rng.uniform(0.0, 500.0, CLOUD_SIZE),
+        rng.uniform(-90.0, 90.0, CLOUD_SIZE),
+        rng.uniform(-180.0, 180.0, CLOUD_SIZE),
+        np.where(rng.random(CLOUD_SIZE) < 0.5, -1.0, rng.uniform(0.0, 300.0, CLOUD_SIZE)),
+    )
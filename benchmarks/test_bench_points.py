@@ -0,0 +1,70 @@
+"""Single points and random point clouds."""
+
+import numpy as np
+import pytest
+
+from pyhwm2014 import Model, evaluate, hwm14, numpy_backend, parallel
+
+POINT = (93323, 42000.0, 250.0, -11.95, -76.77)
+
+
+@pytest.mark.benchmark(group="point")
+def test_hwm14_point(benchmark):
+    benchmark(hwm14.hwm14, *POINT, -1.0, -1.0, -1.0, [-1.0, 35.0])
+
+
+@pytest.mark.benchmark(group="point")
+def test_dwm07_point(benchmark):
+    benchmark(hwm14.dwm07, *POINT, [-1.0, 35.0])
+
+
+@pytest.mark.benchmark(group="point")
+def test_evaluate_point(benchmark):
+    benchmark(evaluate, *POINT, ap=35.0)
+
+
+@pytest.mark.benchmark(group="cloud")
+def test_cloud_per_point(benchmark, per_point, cloud):
+    benchmark(per_point, *cloud)
+
+
+@pytest.mark.benchmark(group="cloud")
+@pytest.mark.parametrize("sort", [False, True])
+def test_cloud_evaluate(benchmark, per_point, cloud, sort):
+    w = benchmark(evaluate, *cloud[:5], ap=cloud[5], sort=sort)
+    np.testing.assert_array_equal(w, per_point(*cloud))
+
+
+@pytest.mark.benchmark(group="cloud")
+def test_cloud_parallel(benchmark, cloud):
+    benchmark.pedantic(
+        parallel.evaluate, cloud[:5], {"ap": cloud[5], "workers": 2}, rounds=3, warmup_rounds=1
+    )
+
+
+@pytest.mark.benchmark(group="cloud")
+def test_cloud_numpy(benchmark, cloud):
+    numpy_backend.load_qwm()
+    benchmark(numpy_backend.hwm14, *cloud)
+
+
+@pytest.mark.benchmark(group="cloud")
+def test_cloud_model(benchmark, cloud):
+    benchmark(Model().evaluate, *cloud)
+
+
+@pytest.mark.benchmark(group="cloud-disturbance")
+def test_cloud_dwm07_per_point(benchmark, cloud):
+    def loop():
+        return [
+            hwm14.dwm07(int(d), s, z, la, lo, [-1.0, a])
+            for d, s, z, la, lo, a in zip(*cloud, strict=True)
+        ]
+
+    benchmark(loop)
+
+
+@pytest.mark.benchmark(group="cloud-disturbance")
+def test_cloud_dwm07_numpy(benchmark, cloud):
+    numpy_backend.load_dwm()
+    benchmark(numpy_backend.dwm07, *cloud)
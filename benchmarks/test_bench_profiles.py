@@ -0,0 +1,66 @@
+"""HWM14 profiles, HWM142D maps and their fast paths."""
+
+import numpy as np
+import pytest
+
+from pyhwm2014 import HWM14, HWM142D, evaluate, evaluate_grid, height_profile
+
+# Profile of each HWM14 option at its default limits
+PROFILES: dict[int, dict] = {
+    1: {"altlim": [0.0, 500.0], "altstp": 2.5},
+    2: {"glatlim": [-90.0, 90.0], "glatstp": 1.0},
+    3: {"utlim": [0.0, 23.75], "utstp": 0.125},
+    4: {"glonlim": [-180.0, 180.0], "glonstp": 2.0},
+}
+
+
+@pytest.mark.benchmark(group="HWM14")
+@pytest.mark.parametrize("option", PROFILES)
+def test_hwm14_option(benchmark, option):
+    benchmark(HWM14, option=option, ap=[-1, 35], verbose=False, **PROFILES[option])
+
+
+@pytest.mark.benchmark(group="HWM142D")
+@pytest.mark.parametrize("option", [1, 2, 3, 4, 5, 6])
+def test_hwm142d_option(benchmark, option):
+    benchmark(HWM142D, option=option, ap=[-1, 35], verbose=False)
+
+
+@pytest.mark.benchmark(group="profile")
+def test_profile_per_point(benchmark, per_point):
+    alt = np.arange(0.0, 500.0, 1.0)
+    benchmark(per_point, 93323, 42000.0, alt, -11.95, -76.77, 35.0)
+
+
+@pytest.mark.benchmark(group="profile")
+def test_profile_evaluate(benchmark):
+    alt = np.arange(0.0, 500.0, 1.0)
+    benchmark(evaluate, 93323, 42000.0, alt, -11.95, -76.77, ap=35.0)
+
+
+@pytest.mark.benchmark(group="profile")
+def test_profile_height_profile(benchmark, per_point):
+    alt = np.arange(0.0, 500.0, 1.0)
+    w = benchmark(height_profile, 93323, 42000.0, alt, -11.95, -76.77, ap=35.0)
+    np.testing.assert_array_equal(w, per_point(93323, 42000.0, alt, -11.95, -76.77, 35.0))
+
+
+@pytest.mark.benchmark(group="map")
+def test_map_per_point(benchmark, per_point):
+    glat, glon = np.meshgrid(np.arange(-90.0, 91.0, 5.0), np.arange(-180.0, 180.0, 5.0))
+    benchmark(per_point, 93323, 42000.0, 250.0, glat, glon, 35.0)
+
+
+@pytest.mark.benchmark(group="map")
+@pytest.mark.parametrize("workers", [None, 2])
+def test_map_evaluate_grid(benchmark, workers):
+    benchmark(
+        evaluate_grid,
+        alt=250.0,
+        glat=np.arange(-90.0, 91.0, 5.0),
+        glon=np.arange(-180.0, 180.0, 5.0),
+        ut=42000.0 / 3600.0,
+        doy=323,
+        ap=35.0,
+        workers=workers,
+    )
@@ -0,0 +1,36 @@
+"""Cold import and initialization, each in a new interpreter.
+
+The timings include the start of the interpreter; ``import numpy`` is the
+floor of the group.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Statement run by each fresh interpreter
+STARTUP: dict[str, str] = {
+    "numpy": "import numpy",
+    "import": "import pyhwm2014",
+    "init": "import pyhwm2014; pyhwm2014.init()",
+    "first-evaluate": (
+        "import pyhwm2014; pyhwm2014.evaluate(93323, 42000.0, 250.0, -11.95, -76.77, ap=35.0)"
+    ),
+    "numpy-bundle": (
+        "from pyhwm2014 import numpy_backend; "
+        "numpy_backend.hwm14(93323, 42000.0, 250.0, -11.95, -76.77, ap=35.0)"
+    ),
+}
+
+
+@pytest.mark.benchmark(group="startup")
+@pytest.mark.parametrize("case", STARTUP)
+def test_startup(benchmark, case):
+    benchmark.pedantic(
+        subprocess.run,
+        ([sys.executable, "-c", STARTUP[case]],),
+        {"check": True},
+        rounds=5,
+        warmup_rounds=1,
+    )
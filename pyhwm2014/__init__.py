@@ -2,11 +2,84 @@
 
 This package provides a Python interface to the HWM14 model for calculating
 atmospheric wind speeds at various geophysical locations and conditions.
+
+The plotting classes, :class:`Model`, :class:`ResultCache`, :func:`stream`
+and :mod:`pyhwm2014.parallel` are imported on first access, and the model
+coefficients are read on first evaluation (or by :func:`init`), so importing
+the package stays cheap.
 """
 
+import importlib
+from typing import Any
+
+from .batch import (
+    canonicalize,
+    evaluate,
+    get_alf_cache_size,
+    get_num_threads,
+    height_profile,
+    init,
+    reset_stats,
+    set_alf_cache_size,
+    set_num_threads,
+    set_profiling,
+    stats,
+    time_series,
+    time_to_iyd,
+    unique_points,
+)
 from .core import HWM14, HWM142D
-from .plotting import HWM14Plot, HWM142DPlot
 from .data import HWMPATH
+from .grid import GridResult, evaluate_grid
+
+# Attributes imported on first access, and the submodules providing them
+_LAZY: dict[str, str] = {
+    "HWM14Plot": ".plotting",
+    "HWM142DPlot": ".plotting",
+    "Model": ".model",
+    "ResultCache": ".cache",
+    "parallel": ".parallel",
+    "stream": ".streaming",
+}
+
+__all__ = [
+    "HWM14",
+    "HWM142D",
+    "HWM14Plot",
+    "HWM142DPlot",
+    "HWMPATH",
+    "GridResult",
+    "Model",
+    "ResultCache",
+    "canonicalize",
+    "evaluate",
+    "evaluate_grid",
+    "get_alf_cache_size",
+    "get_num_threads",
+    "height_profile",
+    "init",
+    "reset_stats",
+    "set_alf_cache_size",
+    "set_num_threads",
+    "set_profiling",
+    "stats",
+    "stream",
+    "time_series",
+    "time_to_iyd",
+    "unique_points",
+    "parallel",
+]
+__version__ = "1.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY[name], __name__)
+    value = module if module.__name__ == f"{__name__}.{name}" else getattr(module, name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["HWM14", "HWM142D", "HWM14Plot", "HWM142DPlot", "HWMPATH"]
-__version__ = "1.1.0"
\ No newline at end of file
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,994 @@
+"""Vectorized batch evaluation of HWM14 over NumPy arrays."""
+
+import functools
+import threading
+from typing import TYPE_CHECKING, Literal, overload
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from . import hwm14
+from .data import HWMPATH, data_version
+
+if TYPE_CHECKING:
+    from .bundle import CoefficientBundle
+    from .cache import ResultCache
+
+# Serializes loading the coefficients; the batch kernels release the GIL and
+# each call keeps its basis caches in a private Fortran workspace, so they are
+# safe to run concurrently once the model is initialized.
+_init_lock = threading.Lock()
+
+# Directory the Fortran coefficients are read from. Setting it here also
+# spares direct calls into the extension the search of the working
+# directory, $HWMPATH and ../Meta.
+_data_dir: str = HWMPATH
+
+# Digest of the coefficient files last read from _data_dir, see
+# coefficients_version. Recomputed by every load, so that it follows edits
+# made in place before init(force=True).
+_data_version: str | None = None
+
+# Length of the Fortran ``hwm.datadir`` buffer; longer paths would be cut.
+_DATA_DIR_MAX: int = 256
+hwm14.hwm.datadir = _data_dir
+
+# Implementations selectable with evaluate(backend=...)
+BACKENDS: tuple[str, ...] = ("fortran", "numpy")
+
+# Names of the counters reported by cache_hits, one per cache in hwmqt.
+CACHE_COUNTERS: tuple[str, ...] = (
+    "season",
+    "latitude",
+    "longitude",
+    "tides",
+    "altitude",
+    "basis",
+)
+
+# Names of the Fortran profiling counters reported by stats, in the order of
+# hwm14_get_stats: points and input-driven refresh(1:5) flags of hwmqt, its
+# level projections, bz rebuilds and vertwght calls; dwm07 points and the
+# ap2kp, gd2qd and mltcalc recomputations; dwm07b calls and its vshterms,
+# mltterms and kpterms rebuilds; hits and misses of the alfbasis caches.
+STAT_COUNTERS: tuple[str, ...] = (
+    "hwmqt",
+    "hwmqt_refresh1",
+    "hwmqt_refresh2",
+    "hwmqt_refresh3",
+    "hwmqt_refresh4",
+    "hwmqt_refresh5",
+    "hwmqt_levels",
+    "hwmqt_bz",
+    "vertwght",
+    "dwm07",
+    "ap2kp",
+    "gd2qd",
+    "mltcalc",
+    "dwm07b",
+    "dwm07b_vshterms",
+    "dwm07b_mltterms",
+    "dwm07b_kpterms",
+    "alf_hwmqt_hits",
+    "alf_hwmqt_misses",
+    "alf_gd2qd_hits",
+    "alf_gd2qd_misses",
+    "alf_dwm07b_hits",
+    "alf_dwm07b_misses",
+)
+
+# Names of the Fortran stage timers; dwm07 includes the other dwm stages.
+STAT_STAGES: tuple[str, ...] = ("hwmqt", "dwm07", "gd2qd", "mltcalc", "dwm07b")
+
+# Keys of the cache_hits counters, in the order they are stored in a ResultCache
+_HIT_NAMES: tuple[str, ...] = ("points",) + CACHE_COUNTERS
+
+# Record layout of the effective points compared by unique_points
+_POINT_DTYPE = np.dtype(
+    [
+        ("doy", "<i4"),
+        ("sec", "<f4"),
+        ("alt", "<f4"),
+        ("glat", "<f4"),
+        ("glon", "<f4"),
+        ("ap", "<f4"),
+    ]
+)
+
+
+def init(force: bool = False, data_dir: str | None = None) -> None:
+    """Load the model coefficients, once per process.
+
+    The evaluation functions call this themselves; calling it up front only
+    moves the cost of reading the coefficient files out of the first
+    evaluation. Later calls return immediately, and concurrent first calls
+    read the files only once.
+
+    Parameters
+    ----------
+    force : bool, optional
+        Read the coefficient files again, e.g. after changing them. Must not
+        run concurrently with evaluations. Default is False.
+    data_dir : str, optional
+        Directory holding ``hwm123114.bin``, ``dwm07b104i.dat`` and
+        ``gd2qd.dat``. A directory other than the current one reloads the
+        coefficients for the whole process. Default keeps the current
+        directory, initially :data:`pyhwm2014.HWMPATH`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If a data file is missing. The coefficients of the previous
+        directory are then read again on next use.
+    ValueError
+        If ``data_dir`` is longer than 256 bytes, the size of the path
+        buffer of the Fortran model.
+    """
+    global _data_dir, _data_version
+
+    def stale() -> bool:
+        return force or hwm14.hwm.hwminit or (data_dir is not None and data_dir != _data_dir)
+
+    if stale():
+        with _init_lock:
+            if stale():
+                path = _data_dir if data_dir is None else str(data_dir)
+                if len(path.encode()) > _DATA_DIR_MAX:
+                    raise ValueError(
+                        f"data_dir must be at most {_DATA_DIR_MAX} bytes long, got {path!r}"
+                    )
+                if hwm14.hwm14_init(path) != 0:
+                    raise FileNotFoundError(f"HWM14 data files not found in {path}")
+                _data_dir = path
+                _data_version = data_version(path)
+
+
+def coefficients_version() -> str:
+    """Digest of the coefficient files the model uses.
+
+    The digest is computed when :func:`init` reads the files (or on first
+    call, before the model is initialized), so it changes with every reload
+    of edited or different coefficients.
+
+    Returns
+    -------
+    str
+        Short hex digest of ``hwm123114.bin``, ``dwm07b104i.dat`` and
+        ``gd2qd.dat`` in the current data directory.
+    """
+    global _data_version
+    if _data_version is None:
+        with _init_lock:
+            if _data_version is None:
+                _data_version = data_version(_data_dir)
+    return _data_version
+
+
+@functools.cache
+def _numpy_coefficients(data_dir: str, version: str) -> "CoefficientBundle":
+    """Coefficients of the NumPy backend, read once per digest of the files."""
+    from .bundle import load_bundle
+
+    return load_bundle(data_dir=data_dir)
+
+
+def set_num_threads(n: int | None = None) -> None:
+    """Set the number of threads used by the batch kernels.
+
+    The batch kernels split the points into contiguous blocks (at least 64
+    points each) evaluated in parallel with OpenMP. Without OpenMP support in
+    the build they always run on one thread.
+
+    Parameters
+    ----------
+    n : int, optional
+        Number of threads. None or a non-positive value restores the OpenMP
+        default, which follows ``OMP_NUM_THREADS``.
+    """
+    hwm14.hwm14_set_num_threads(0 if n is None else int(n))
+
+
+def get_num_threads() -> int:
+    """Return the number of threads used by the batch kernels."""
+    return int(hwm14.hwm14_get_num_threads())
+
+
+def set_alf_cache_size(n: int = 128) -> None:
+    """Set how many latitudes each Legendre basis cache keeps.
+
+    ``hwmqt``, ``gd2qd``/``mltcalc`` and ``dwm07b`` each keep the
+    ``alfbasis`` arrays of their recently used colatitudes in a
+    least-recently-used cache, so sweeps that revisit latitudes (e.g.
+    longitude-latitude maps) skip the recurrence. The size applies to caches
+    created or resized after the call.
+
+    Parameters
+    ----------
+    n : int, optional
+        Number of colatitudes per cache, rounded up to a multiple of 4.
+        Values below 1 are treated as 1. Default is 128.
+    """
+    hwm14.hwm14_set_alf_cache_size(int(n))
+
+
+def get_alf_cache_size() -> int:
+    """Return the number of latitudes kept by each Legendre basis cache."""
+    return int(hwm14.hwm14_get_alf_cache_size())
+
+
+def set_profiling(enabled: bool = True) -> None:
+    """Switch the profiling counters and stage timers of the Fortran kernels.
+
+    While enabled, every workspace counts its calls and cache refreshes and
+    times its stages; the counts are added to the process totals reported by
+    :func:`stats` when a batch call returns. Profiling is off by default and
+    costs a few percent of the evaluation time when on.
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        Turn profiling on (True) or off (False). Default is True.
+    """
+    hwm14.hwm.hwmprofile = bool(enabled)
+
+
+def stats(reset: bool = False) -> dict:
+    """Return the profiling counters and stage timers of the Fortran kernels.
+
+    The totals cover every call of this process since the last reset while
+    :func:`set_profiling` was enabled, including the single-point functions
+    of the extension. Workers of :mod:`pyhwm2014.parallel` and the NumPy
+    backend are not counted.
+
+    Parameters
+    ----------
+    reset : bool, optional
+        Clear the totals after reading them. Default is False.
+
+    Returns
+    -------
+    dict
+        ``profiling`` (whether profiling is enabled), ``counts`` mapping each
+        name of :data:`STAT_COUNTERS` plus ``alfbasis`` (all cache misses,
+        i.e. ``alfbasis`` invocations) to its count, and ``seconds`` mapping
+        each stage of :data:`STAT_STAGES` to its wall time.
+
+    Examples
+    --------
+    >>> set_profiling(True)
+    >>> w = evaluate(93323, 42000.0, np.arange(100.0, 400.0), -11.95, -76.77, ap=35.0)
+    >>> counts = stats(reset=True)["counts"]
+    """
+    counts, seconds = hwm14.hwm14_get_stats()
+    if reset:
+        reset_stats()
+    result = {name: int(c) for name, c in zip(STAT_COUNTERS, counts)}
+    result["alfbasis"] = sum(result[name] for name in STAT_COUNTERS if name.endswith("_misses"))
+    return {
+        "profiling": bool(hwm14.hwm.hwmprofile),
+        "counts": result,
+        "seconds": {name: float(t) for name, t in zip(STAT_STAGES, seconds)},
+    }
+
+
+def reset_stats() -> None:
+    """Clear the profiling totals reported by :func:`stats`."""
+    hwm14.hwm14_reset_stats()
+
+
+def time_to_iyd(time: ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+    """Convert UTC times to the model's day and time inputs.
+
+    Parameters
+    ----------
+    time : array_like
+        UTC times as ``datetime64`` values, ``datetime`` objects, ISO 8601
+        strings or timezone-naive ``pandas`` timestamps, of any shape.
+
+    Returns
+    -------
+    iyd : ndarray of int32
+        Year and day as YYDDD, with the shape of ``time``.
+    sec : ndarray of float64
+        Seconds since the start of the UTC day.
+
+    Examples
+    --------
+    >>> time_to_iyd(np.datetime64("1993-11-19T11:40"))
+    (array(93323, dtype=int32), array(42000.))
+    """
+    time = np.asarray(time).astype("datetime64[us]")
+    days = time.astype("datetime64[D]")
+    years = days.astype("datetime64[Y]")
+    doy = (days - years).astype(np.int64) + 1
+    iyd = (np.mod(years.astype(np.int64) + 1970, 100) * 1000 + doy).astype(np.int32)
+    return np.asarray(iyd), np.asarray((time - days) / np.timedelta64(1, "s"))
+
+
+def schedule(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    ap: ArrayLike = -1.0,
+) -> np.ndarray:
+    """Return the evaluation order that maximizes reuse of the model caches.
+
+    ``hwmqt`` only skips recomputing its seasonal terms (``fs``), Legendre
+    basis (``alfbasis``), longitude and tidal terms (``fm``, ``fl``) and the
+    basis vector ``bz`` when consecutive calls repeat the corresponding
+    inputs. Sorting the points by (doy, glat, glon, ut, alt, ap), outermost
+    first, groups such repeats together.
+
+    Parameters
+    ----------
+    iyd, sec, alt, glat, glon, ap : array_like
+        1-D model inputs of equal length, see :func:`evaluate`.
+
+    Returns
+    -------
+    ndarray
+        Permutation of ``range(N)`` giving the evaluation order.
+    """
+    iyd, sec, alt, glat, glon, ap = np.broadcast_arrays(iyd, sec, alt, glat, glon, ap)
+    return np.lexsort((ap, alt, sec, glon, glat, np.fmod(iyd, 1000)))
+
+
+def canonicalize(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    ap: ArrayLike = -1.0,
+) -> tuple[np.ndarray, ...]:
+    """Reduce model inputs to the values the winds depend on.
+
+    ``hwmqt`` and ``dwm07`` only use the day of year, ``mod(iyd, 1000)``,
+    and the disturbance winds are only added where ``ap >= 0``. The year,
+    ``stl``, ``f107`` and ``f107a`` never change the result, so points that
+    differ only in those are the same point.
+
+    Parameters
+    ----------
+    iyd, sec, alt, glat, glon, ap : array_like
+        Model inputs, see :func:`evaluate`; broadcast against each other.
+
+    Returns
+    -------
+    tuple of ndarray
+        Flattened ``doy`` (int32) and ``sec``, ``alt``, ``glat``, ``glon``
+        and ``ap`` (float32) as passed to the model, with ``ap`` set to -1
+        wherever it selects the quiet-time model only and signed zeros
+        cleared.
+    """
+    arrays = np.broadcast_arrays(iyd, sec, alt, glat, glon, ap)
+    # fmod keeps the sign of iyd like the Fortran mod
+    doy = np.ascontiguousarray(np.fmod(arrays[0].ravel(), 1000), dtype=np.int32)
+    sec, alt, glat, glon, ap = (
+        np.ascontiguousarray(a.ravel(), dtype=np.float32) + np.float32(0.0) for a in arrays[1:]
+    )
+    ap[~(ap >= 0.0)] = -1.0
+    return doy, sec, alt, glat, glon, ap
+
+
+def unique_points(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    ap: ArrayLike = -1.0,
+) -> tuple[tuple[np.ndarray, ...], np.ndarray]:
+    """Return the distinct effective points of a batch.
+
+    Parameters
+    ----------
+    iyd, sec, alt, glat, glon, ap : array_like
+        Model inputs, see :func:`evaluate`; broadcast against each other.
+
+    Returns
+    -------
+    tuple of ndarray
+        :func:`canonicalize` output reduced to its distinct points.
+    ndarray
+        Index of each input point into the distinct points, so that
+        ``w[inverse]`` scatters their winds back.
+
+    Examples
+    --------
+    >>> (doy, *_), inverse = unique_points([93323, 14323], 42000.0, 250.0, 0.0, 0.0)
+    >>> doy, inverse
+    (array([323], dtype=int32), array([0, 0]))
+    """
+    points = canonicalize(iyd, sec, alt, glat, glon, ap)
+    # Compare whole points as 24-byte records; the float32 fields carry no
+    # negative zeros after canonicalize, so equal values have equal bytes.
+    records = np.rec.fromarrays(points, dtype=_POINT_DTYPE)
+    _, first, inverse = np.unique(
+        records.view(f"V{_POINT_DTYPE.itemsize}"), return_index=True, return_inverse=True
+    )
+    return tuple(a[first] for a in points), inverse.ravel()
+
+
+def cache_hits(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+) -> dict[str, int]:
+    """Count how often ``hwmqt`` reuses each of its caches for a point sequence.
+
+    The counts mirror the ``previous(1:5)`` checks in ``hwmqt`` for points
+    evaluated in the given order, starting from a cold cache. They count
+    consecutive repeats only; the ``alfbasis`` arrays of latitudes seen
+    earlier are also reused from the cache sized by
+    :func:`set_alf_cache_size`.
+
+    Parameters
+    ----------
+    iyd, sec, alt, glat, glon : array_like
+        1-D model inputs of equal length, in evaluation order.
+
+    Returns
+    -------
+    dict[str, int]
+        ``points`` plus one hit counter per cache: ``season`` (``fs``),
+        ``latitude`` (``alfbasis``), ``longitude`` (``fm``), ``tides``
+        (``fl``), ``altitude`` (``vertwght``) and ``basis`` (the full ``bz``
+        vector, reused when day, UT, latitude and longitude all repeat).
+    """
+    doy = np.fmod(np.asarray(iyd), 1000)
+    sec, alt, glat, glon = (np.asarray(a, dtype=np.float32) for a in (sec, alt, glat, glon))
+
+    def _same(a: np.ndarray) -> np.ndarray:
+        same: np.ndarray = a[1:] == a[:-1]
+        return same
+
+    season, latitude, longitude = _same(doy), _same(glat), _same(glon)
+    tides = _same(sec) & longitude
+    hits = {
+        "season": season,
+        "latitude": latitude,
+        "longitude": longitude,
+        "tides": tides,
+        "altitude": _same(alt),
+        "basis": season & latitude & tides,
+    }
+    stats = {"points": int(doy.size)}
+    stats.update({name: int(np.count_nonzero(hits[name])) for name in CACHE_COUNTERS})
+    return stats
+
+
+@overload
+def evaluate(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    f107a: ArrayLike = -1.0,
+    f107: ArrayLike = -1.0,
+    ap: ArrayLike = -1.0,
+    components: bool = False,
+    sort: bool = False,
+    return_stats: Literal[False] = False,
+    backend: str = "fortran",
+    cache: "ResultCache | None" = None,
+    dedupe: bool = False,
+) -> np.ndarray | tuple[np.ndarray, ...]: ...
+
+
+@overload
+def evaluate(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    f107a: ArrayLike = -1.0,
+    f107: ArrayLike = -1.0,
+    ap: ArrayLike = -1.0,
+    components: bool = False,
+    sort: bool = False,
+    *,
+    return_stats: Literal[True],
+    backend: str = "fortran",
+    cache: "ResultCache | None" = None,
+    dedupe: bool = False,
+) -> tuple[np.ndarray | tuple[np.ndarray, ...], dict[str, int]]: ...
+
+
+@overload
+def evaluate(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    f107a: ArrayLike = -1.0,
+    f107: ArrayLike = -1.0,
+    ap: ArrayLike = -1.0,
+    components: bool = False,
+    sort: bool = False,
+    return_stats: bool = False,
+    backend: str = "fortran",
+    cache: "ResultCache | None" = None,
+    dedupe: bool = False,
+) -> (
+    np.ndarray | tuple[np.ndarray, ...] | tuple[np.ndarray | tuple[np.ndarray, ...], dict[str, int]]
+): ...
+
+
+def evaluate(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    f107a: ArrayLike = -1.0,
+    f107: ArrayLike = -1.0,
+    ap: ArrayLike = -1.0,
+    components: bool = False,
+    sort: bool = False,
+    return_stats: bool = False,
+    backend: str = "fortran",
+    cache: "ResultCache | None" = None,
+    dedupe: bool = False,
+) -> (
+    np.ndarray | tuple[np.ndarray, ...] | tuple[np.ndarray | tuple[np.ndarray, ...], dict[str, int]]
+):
+    """Evaluate HWM14 at many points with a single call into Fortran.
+
+    All inputs are broadcast against each other and flattened into contiguous
+    1-D arrays, so the loop over points runs entirely inside ``hwm14_batch``.
+    The points are evaluated on :func:`get_num_threads` OpenMP threads. The
+    Fortran call releases the GIL and uses its own basis caches, so chunks of
+    a large batch can also be evaluated on a ``ThreadPoolExecutor``.
+
+    Parameters
+    ----------
+    iyd : array_like of int
+        Year and day as YYDDD (only the day of year is used by the model).
+    sec : array_like of float
+        Universal time in seconds.
+    alt : array_like of float
+        Altitude in kilometers.
+    glat : array_like of float
+        Geodetic latitude in degrees.
+    glon : array_like of float
+        Geodetic longitude in degrees.
+    f107a : array_like of float, optional
+        F10.7 average solar flux index (not used). Default is -1.
+    f107 : array_like of float, optional
+        F10.7 solar flux index (not used). Default is -1.
+    ap : array_like of float, optional
+        Current 3-hour ap index. Negative values select the quiet-time
+        model only. Default is -1.
+    components : bool, optional
+        If True, also return the quiet-time and disturbance winds. All three
+        come from a single pass over the points, with the total formed as
+        quiet + disturbance (the disturbance is zero where ``ap < 0``).
+        Default is False, which skips the decomposition.
+    sort : bool, optional
+        Evaluate the points in :func:`schedule` order and scatter the results
+        back to the input order. This helps unordered batches that repeat
+        days, latitudes, longitudes or times. Default is False.
+    return_stats : bool, optional
+        Also return the :func:`cache_hits` counters of the evaluation order.
+        Default is False.
+    backend : {"fortran", "numpy"}, optional
+        ``"fortran"`` calls the compiled batch kernels. ``"numpy"`` uses
+        :mod:`pyhwm2014.numpy_backend`, which evaluates the points as
+        matrices with the coefficients of the :func:`init` data directory and
+        agrees with Fortran to float32 precision. Default is ``"fortran"``.
+    cache : ResultCache, optional
+        Look the result up in this :class:`pyhwm2014.ResultCache` before
+        evaluating, and store it there afterwards. Default is None.
+    dedupe : bool, optional
+        Evaluate each distinct :func:`canonicalize` point once and scatter
+        the winds back. Batches that repeat points in all but the year,
+        ``f107``, ``f107a`` or a negative ``ap``, such as multi-year or
+        F10.7 ensembles, then cost only their distinct points. Default is
+        False.
+
+    Returns
+    -------
+    ndarray or tuple of ndarray
+        float32 array of shape ``broadcast_shape + (2,)``, i.e. ``(N, 2)`` for
+        1-D inputs, holding the meridional (``[..., 0]``, +northward) and zonal
+        (``[..., 1]``, +eastward) winds in m/s. With ``components=True`` a
+        ``(quiet, disturbance, total)`` tuple of such arrays is returned.
+    dict[str, int]
+        Cache-hit counters, only returned if ``return_stats`` is True.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> w = evaluate(93323, 42000.0, np.arange(90.0, 201.0), -11.95, -76.77, ap=35)
+    >>> w.shape
+    (111, 2)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+
+    arrays = np.broadcast_arrays(iyd, sec, alt, glat, glon, f107a, f107, ap)
+    shape = arrays[0].shape
+
+    iyd_ = np.ascontiguousarray(arrays[0].ravel(), dtype=np.int32)
+    sec_, alt_, glat_, glon_, f107a_, f107_, ap_ = (
+        np.ascontiguousarray(a.ravel(), dtype=np.float32) for a in arrays[1:]
+    )
+
+    if dedupe and iyd_.size > 1:
+        winds, stats = _evaluate_unique(
+            iyd_,
+            sec_,
+            alt_,
+            glat_,
+            glon_,
+            ap_,
+            components=components,
+            sort=sort,
+            backend=backend,
+            cache=cache,
+            return_stats=return_stats,
+        )
+    elif cache is not None:
+        winds, stats = _evaluate_cached(
+            iyd_,
+            sec_,
+            alt_,
+            glat_,
+            glon_,
+            f107a_,
+            f107_,
+            ap_,
+            components=components,
+            sort=sort,
+            backend=backend,
+            cache=cache,
+        )
+    else:
+        winds, stats = _evaluate_points(
+            iyd_,
+            sec_,
+            alt_,
+            glat_,
+            glon_,
+            f107a_,
+            f107_,
+            ap_,
+            components=components,
+            sort=sort,
+            backend=backend,
+            return_stats=return_stats,
+        )
+
+    shaped = tuple(w.reshape(shape + (2,)) for w in winds)
+    result = shaped if components else shaped[0]
+    return (result, stats) if return_stats else result
+
+
+def _evaluate_points(
+    iyd: np.ndarray,
+    sec: np.ndarray,
+    alt: np.ndarray,
+    glat: np.ndarray,
+    glon: np.ndarray,
+    f107a: np.ndarray,
+    f107: np.ndarray,
+    ap: np.ndarray,
+    *,
+    components: bool,
+    sort: bool,
+    backend: str,
+    return_stats: bool,
+) -> tuple[tuple[np.ndarray, ...], dict[str, int]]:
+    """Evaluate contiguous 1-D inputs with one backend call.
+
+    Returns the ``(N, 2)`` winds, one array or the ``(quiet, disturbance,
+    total)`` arrays, and the :func:`cache_hits` counters of the evaluation
+    order if ``return_stats`` is True (an empty dict otherwise).
+    """
+    order: np.ndarray | None = None
+    if sort and iyd.size > 1:
+        order = schedule(iyd, sec, alt, glat, glon, ap)
+        iyd, sec, alt, glat, glon, f107a, f107, ap = (
+            a[order] for a in (iyd, sec, alt, glat, glon, f107a, f107, ap)
+        )
+
+    if backend == "fortran":
+        init()
+
+    if backend == "numpy":
+        from . import numpy_backend
+
+        coefficients = _numpy_coefficients(_data_dir, coefficients_version())
+        quiet, disturbance, total = numpy_backend.hwm14(
+            iyd,
+            sec,
+            alt,
+            glat,
+            glon,
+            ap,
+            components=True,
+            qwm=coefficients.qwm,
+            dwm=coefficients.dwm,
+            gd=coefficients.gd2qd,
+        )
+        winds = [quiet.T, disturbance.T, total.T]
+        if not components:
+            winds = winds[2:]
+    elif iyd.size == 0:
+        empty = np.empty((2, 0), dtype=np.float32, order="F")
+        winds = [empty] * 3 if components else [empty]
+    elif components:
+        winds = hwm14.hwm14_batch_components(iyd, sec, alt, glat, glon, f107a, f107, ap)
+    else:
+        winds = [hwm14.hwm14_batch(iyd, sec, alt, glat, glon, f107a, f107, ap)]
+
+    # The winds come back Fortran-ordered with shape (2, N); their transpose
+    # is a C-contiguous (N, 2) view.
+    def _finish(w: np.ndarray) -> np.ndarray:
+        w = w.T
+        if order is not None:
+            scattered = np.empty_like(w)
+            scattered[order] = w
+            w = scattered
+        return w
+
+    stats = cache_hits(iyd, sec, alt, glat, glon) if return_stats else {}
+    return tuple(_finish(w) for w in winds), stats
+
+
+def _evaluate_cached(
+    iyd: np.ndarray,
+    sec: np.ndarray,
+    alt: np.ndarray,
+    glat: np.ndarray,
+    glon: np.ndarray,
+    f107a: np.ndarray,
+    f107: np.ndarray,
+    ap: np.ndarray,
+    *,
+    components: bool,
+    sort: bool,
+    backend: str,
+    cache: "ResultCache",
+) -> tuple[tuple[np.ndarray, ...], dict[str, int]]:
+    """Look up the winds of 1-D inputs in ``cache``, evaluating them on a miss.
+
+    The :func:`cache_hits` counters of the evaluation are stored with the
+    winds, so a hit returns them as well.
+    """
+    # Key on the effective float32 inputs, so that points the model cannot
+    # tell apart share an entry. The winds do not depend on the evaluation
+    # order, but the stored counters do.
+    key = cache.key(
+        "evaluate",
+        *canonicalize(iyd, sec, alt, glat, glon, ap),
+        components=components,
+        sort=sort,
+        backend=backend,
+    )
+
+    def compute() -> tuple[np.ndarray, ...]:
+        winds, stats = _evaluate_points(
+            iyd,
+            sec,
+            alt,
+            glat,
+            glon,
+            f107a,
+            f107,
+            ap,
+            components=components,
+            sort=sort,
+            backend=backend,
+            return_stats=True,
+        )
+        return (*winds, np.array([stats[name] for name in _HIT_NAMES], dtype=np.int64))
+
+    *winds, counts = cache.fetch(key, compute)
+    return tuple(winds), {name: int(c) for name, c in zip(_HIT_NAMES, counts)}
+
+
+def _evaluate_unique(
+    iyd: np.ndarray,
+    sec: np.ndarray,
+    alt: np.ndarray,
+    glat: np.ndarray,
+    glon: np.ndarray,
+    ap: np.ndarray,
+    *,
+    components: bool,
+    sort: bool,
+    backend: str,
+    cache: "ResultCache | None",
+    return_stats: bool,
+) -> tuple[tuple[np.ndarray, ...], dict[str, int]]:
+    """Evaluate each distinct effective point of 1-D inputs once.
+
+    The winds are scattered back to the input points; the counters describe
+    the evaluation of the distinct points.
+    """
+    (doy, sec, alt, glat, glon, ap), inverse = unique_points(iyd, sec, alt, glat, glon, ap)
+    # f107a and f107 do not change the winds
+    unused = np.full(doy.size, -1.0, dtype=np.float32)
+    if cache is not None:
+        winds, stats = _evaluate_cached(
+            doy,
+            sec,
+            alt,
+            glat,
+            glon,
+            unused,
+            unused,
+            ap,
+            components=components,
+            sort=sort,
+            backend=backend,
+            cache=cache,
+        )
+    else:
+        winds, stats = _evaluate_points(
+            doy,
+            sec,
+            alt,
+            glat,
+            glon,
+            unused,
+            unused,
+            ap,
+            components=components,
+            sort=sort,
+            backend=backend,
+            return_stats=return_stats,
+        )
+    return tuple(w[inverse] for w in winds), stats
+
+
+def height_profile(
+    iyd: int,
+    sec: float,
+    alt: ArrayLike,
+    glat: float,
+    glon: float,
+    f107a: float = -1.0,
+    f107: float = -1.0,
+    ap: float = -1.0,
+    components: bool = False,
+    cache: "ResultCache | None" = None,
+) -> np.ndarray | tuple[np.ndarray, ...]:
+    """Evaluate HWM14 at many altitudes of a single location and time.
+
+    ``hwm14_profile`` builds the horizontal basis of the location once and
+    projects it onto every model level the altitudes touch; each altitude
+    is then a B-spline weighted sum of a few level projections. The results
+    are identical to :func:`evaluate` at a fraction of the cost.
+
+    Parameters
+    ----------
+    iyd, sec, glat, glon, f107a, f107, ap : scalar
+        Model inputs shared by all altitudes, see :func:`evaluate`.
+    alt : array_like of float
+        Altitudes in kilometers.
+    components : bool, optional
+        If True, also return the quiet-time and disturbance winds, as in
+        :func:`evaluate`. Default is False.
+    cache : ResultCache, optional
+        Result cache, see :func:`evaluate`. Default is None.
+
+    Returns
+    -------
+    ndarray or tuple of ndarray
+        float32 array of shape ``alt.shape + (2,)`` holding the meridional
+        and zonal winds in m/s, or a ``(quiet, disturbance, total)`` tuple of
+        such arrays with ``components=True``.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> w = height_profile(93323, 42000.0, np.arange(90.0, 201.0), -11.95, -76.77, ap=35)
+    >>> w.shape
+    (111, 2)
+    """
+    alt = np.asarray(alt, dtype=np.float32)
+    shape = alt.shape
+
+    if cache is not None:
+        key = cache.key("height_profile", *canonicalize(iyd, sec, 0.0, glat, glon, ap), alt)
+        result = cache.fetch(
+            key, lambda: height_profile(iyd, sec, alt, glat, glon, f107a, f107, ap, True)
+        )
+        return result if components else result[2]
+
+    if alt.size == 0:
+        empty = np.empty((2, 0), dtype=np.float32, order="F")
+        winds = (empty,) * 3
+    else:
+        init()
+        winds = hwm14.hwm14_profile(
+            int(iyd), sec, np.ascontiguousarray(alt.ravel()), glat, glon, f107a, f107, ap
+        )
+
+    result = tuple(w.T.reshape(shape + (2,)) for w in winds)
+    return result if components else result[2]
+
+
+def time_series(
+    time: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    f107a: ArrayLike = -1.0,
+    f107: ArrayLike = -1.0,
+    ap: ArrayLike = -1.0,
+    components: bool = False,
+    dedupe: bool = False,
+    backend: str = "fortran",
+    cache: "ResultCache | None" = None,
+) -> np.ndarray | tuple[np.ndarray, ...]:
+    """Evaluate HWM14 over a series of UTC times, at fixed or moving locations.
+
+    The times are converted with :func:`time_to_iyd` and the points
+    evaluated with :func:`evaluate`. ``hwmqt`` recomputes its seasonal terms
+    only when the day changes from one point to the next, so a chronological
+    series computes them once per day; out-of-order times are evaluated in
+    :func:`schedule` order to keep each day together.
+
+    Parameters
+    ----------
+    time : array_like
+        UTC times, see :func:`time_to_iyd`.
+    alt, glat, glon, f107a, f107, ap : array_like
+        Model inputs, see :func:`evaluate`; broadcast against ``time``, so
+        scalars give a fixed location and arrays of the shape of ``time`` a
+        moving one (e.g. ``time[:, None]`` and ``alt`` for a height-time
+        section).
+    components : bool, optional
+        Also return the quiet-time and disturbance winds. Default is False.
+    dedupe : bool, optional
+        Evaluate repeated effective points once, see :func:`evaluate`; use it
+        for multi-year series at a fixed location, whose years repeat the
+        same days. Default is False.
+    backend : {"fortran", "numpy"}, optional
+        Implementation, see :func:`evaluate`. Default is ``"fortran"``.
+    cache : ResultCache, optional
+        Result cache, see :func:`evaluate`. Default is None.
+
+    Returns
+    -------
+    ndarray or tuple of ndarray
+        float32 winds of shape ``broadcast_shape + (2,)``, as in
+        :func:`evaluate`.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> time = np.arange("2023-01-01T00", "2024-01-01T00", dtype="datetime64[h]")
+    >>> w = time_series(time, 250.0, -11.95, -76.77, ap=35)
+    >>> w.shape
+    (8760, 2)
+    """
+    iyd, sec = time_to_iyd(time)
+    stamps = np.ravel(np.asarray(time).astype("datetime64[us]"))
+    chronological = bool(np.all(stamps[1:] >= stamps[:-1]))
+    return evaluate(
+        iyd,
+        sec,
+        alt,
+        glat,
+        glon,
+        f107a,
+        f107,
+        ap,
+        components=components,
+        sort=not chronological,
+        backend=backend,
+        cache=cache,
+        dedupe=dedupe,
+    )
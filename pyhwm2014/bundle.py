@@ -0,0 +1,195 @@
+"""Versioned, memory-mappable bundle of the model coefficients.
+
+The coefficient files are parsed once (including the parity split of the
+quiet-time coefficients) and the resulting arrays are written as raw ``.npy``
+files next to a ``manifest.json``. Later processes memory-map the arrays
+read-only instead of parsing the files again, so the operating system shares
+their pages between all processes on a host, e.g. the workers of a job array.
+
+A bundle lives in ``coefficients-v<version>-<hash>`` under
+:func:`pyhwm2014.qdtable.cache_dir`, where the hash covers the source
+files; editing a coefficient file or changing :data:`BUNDLE_VERSION` selects
+a new bundle.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .data import HWMPATH, SOURCES, coefficient_hash
+from .numpy_backend import DWMCoefficients, GD2QDCoefficients, QWMCoefficients
+from .qdtable import cache_dir
+
+# Layout version of the bundle; bump when the stored arrays change
+BUNDLE_VERSION: int = 1
+
+# Arrays and scalar attributes of each set of coefficients
+_ARRAYS: dict[str, tuple[str, ...]] = {
+    "qwm": ("vnode", "order", "mparm", "tparm", "e1", "e2"),
+    "dwm": ("termarr", "coeff"),
+    "gd2qd": ("coeff", "normadj"),
+}
+_SCALARS: dict[str, tuple[str, ...]] = {
+    "qwm": ("nbf", "maxs", "maxm", "maxl", "maxn", "p", "nnode", "alttns"),
+    "dwm": ("nterm", "nmax", "mmax", "twidth"),
+    "gd2qd": ("nmax", "mmax", "nterm", "epoch", "alt"),
+}
+
+
+class CoefficientBundle:
+    """The quiet-time, disturbance and quasi-dipole coefficients of a bundle.
+
+    Parameters
+    ----------
+    qwm : QWMCoefficients
+        Quiet-time model coefficients.
+    dwm : DWMCoefficients
+        Disturbance wind coefficients.
+    gd2qd : GD2QDCoefficients
+        Quasi-dipole coordinate coefficients.
+    path : Path, optional
+        Directory the arrays are mapped from, None if they are in memory.
+    """
+
+    def __init__(
+        self,
+        qwm: QWMCoefficients,
+        dwm: DWMCoefficients,
+        gd2qd: GD2QDCoefficients,
+        path: Path | None = None,
+    ) -> None:
+        self.qwm = qwm
+        self.dwm = dwm
+        self.gd2qd = gd2qd
+        self.path = path
+
+
+def _array_hash(a: np.ndarray) -> str:
+    """Digest of the bytes of an array."""
+    return hashlib.sha256(np.ascontiguousarray(a).data).hexdigest()
+
+
+def _parse(source: Path) -> CoefficientBundle:
+    """Parse the coefficient files in ``source``."""
+    return CoefficientBundle(
+        qwm=QWMCoefficients(source / SOURCES["qwm"]),
+        dwm=DWMCoefficients(source / SOURCES["dwm"]),
+        gd2qd=GD2QDCoefficients(source / SOURCES["gd2qd"]),
+    )
+
+
+def _write(bundle: CoefficientBundle, path: Path, sources: dict[str, str]) -> None:
+    """Write the arrays and manifest of a bundle into the directory path."""
+    manifest: dict = {"version": BUNDLE_VERSION, "sources": sources, "arrays": {}, "scalars": {}}
+    for name in SOURCES:
+        coefficients = getattr(bundle, name)
+        for attr in _ARRAYS[name]:
+            a = np.ascontiguousarray(getattr(coefficients, attr))
+            np.save(path / f"{name}.{attr}.npy", a)
+            manifest["arrays"][f"{name}.{attr}"] = {
+                "dtype": a.dtype.str,
+                "shape": list(a.shape),
+                "sha256": _array_hash(a),
+            }
+        for attr in _SCALARS[name]:
+            value = getattr(coefficients, attr)
+            if isinstance(value, np.generic):
+                value = value.item()
+            manifest["scalars"][f"{name}.{attr}"] = value
+    # The manifest goes last: a directory with a manifest is complete.
+    (path / "manifest.json").write_text(json.dumps(manifest, indent=1))
+
+
+def _read(path: Path, verify: bool) -> CoefficientBundle:
+    """Memory-map the arrays of the bundle in the directory path."""
+    manifest = json.loads((path / "manifest.json").read_text())
+    if manifest.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"bundle {path} has version {manifest.get('version')}")
+
+    def restore[T](cls: type[T], name: str) -> T:
+        coefficients = cls.__new__(cls)
+        for attr in _ARRAYS[name]:
+            key = f"{name}.{attr}"
+            a = np.load(path / f"{key}.npy", mmap_mode="r")
+            if verify and _array_hash(a) != manifest["arrays"][key]["sha256"]:
+                raise ValueError(f"array {key} of bundle {path} does not match its manifest")
+            setattr(coefficients, attr, a)
+        for attr in _SCALARS[name]:
+            setattr(coefficients, attr, manifest["scalars"][f"{name}.{attr}"])
+        return coefficients
+
+    dwm = restore(DWMCoefficients, "dwm")
+    # dwm07 evaluates its height profile in single precision
+    dwm.twidth = np.float32(dwm.twidth)
+    return CoefficientBundle(
+        qwm=restore(QWMCoefficients, "qwm"),
+        dwm=dwm,
+        gd2qd=restore(GD2QDCoefficients, "gd2qd"),
+        path=path,
+    )
+
+
+def load_bundle(
+    directory: str | None = None, verify: bool = False, data_dir: str | Path | None = None
+) -> CoefficientBundle:
+    """Return the coefficient bundle, building and caching it on first use.
+
+    The bundle of the files in ``data_dir`` is written once to
+    :func:`pyhwm2014.qdtable.cache_dir` (or ``directory``) and its arrays are
+    memory-mapped read-only on later loads. If the directory is not writable
+    the coefficients are parsed and only kept in memory. Bundles are kept in
+    memory by the hashes of the source files, so an edited file is read again.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Cache directory. Default is :func:`pyhwm2014.qdtable.cache_dir`.
+    verify : bool, optional
+        Check the arrays against the hashes in the manifest and raise
+        ``ValueError`` on a mismatch. Default is False.
+    data_dir : str or Path, optional
+        Directory holding the coefficient files. Default is
+        :data:`pyhwm2014.HWMPATH`.
+
+    Examples
+    --------
+    >>> from pyhwm2014 import numpy_backend
+    >>> bundle = load_bundle()
+    >>> w = numpy_backend.hwmqt(93323, 42000.0, 250.0, -11.95, -76.77, qwm=bundle.qwm)
+    """
+    source = Path(HWMPATH if data_dir is None else data_dir)
+    digests = tuple(coefficient_hash(source / filename) for filename in SOURCES.values())
+    return _load_bundle(source, digests, directory, verify)
+
+
+@functools.cache
+def _load_bundle(
+    source: Path, digests: tuple[str, ...], directory: str | None, verify: bool
+) -> CoefficientBundle:
+    """Load the bundle of the files in ``source``, which have the given digests."""
+    sources = dict(zip(SOURCES, digests, strict=True))
+    digest = hashlib.sha256("".join(digests).encode()).hexdigest()[:12]
+    path = Path(directory) if directory else cache_dir()
+    path = path / f"coefficients-v{BUNDLE_VERSION}-{digest}"
+    if (path / "manifest.json").exists():
+        return _read(path, verify)
+
+    bundle = _parse(source)
+    # Build under a temporary name so that concurrent loads never see a
+    # partial bundle; the first process to finish wins.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.mkdir(parents=True, exist_ok=True)
+        _write(bundle, tmp, sources)
+        os.replace(tmp, path)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not (path / "manifest.json").exists():
+            return bundle
+    return _read(path, verify)
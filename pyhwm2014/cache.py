@@ -0,0 +1,213 @@
+"""Two-tier cache of model results keyed by their inputs.
+
+A :class:`ResultCache` keeps recent results in memory, evicting the least
+recently used ones beyond a size limit, and optionally stores every result as
+a compressed ``.npz`` file in a directory shared by the processes of a host.
+Keys hash the inputs as the model sees them (after the float32 conversion of
+the batch kernels) together with a digest of the coefficient files, so
+editing or switching the coefficients never returns stale winds.
+
+Examples
+--------
+>>> from pyhwm2014 import HWM14, ResultCache
+>>> cache = ResultCache(directory="/tmp/hwm14-results")
+>>> first = HWM14(altlim=[90, 200], altstp=1, ap=[-1, 35], verbose=False, cache=cache)
+>>> again = HWM14(altlim=[90, 200], altstp=1, ap=[-1, 35], verbose=False, cache=cache)
+>>> cache.stats()["hits"]
+1
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from zipfile import BadZipFile
+
+import numpy as np
+
+# Layout version of the keys and stored files; bump when either changes
+CACHE_VERSION: int = 1
+
+
+class ResultCache:
+    """In-memory LRU of model results, backed by an optional on-disk store.
+
+    Parameters
+    ----------
+    maxbytes : int, optional
+        Size limit of the in-memory tier in bytes; the least recently used
+        results are evicted beyond it. Default is 256 MiB.
+    directory : str or Path, optional
+        Directory of the on-disk tier, e.g. ``pyhwm2014.qdtable.cache_dir() /
+        "results"``. Results are written atomically, so any number of
+        processes on one machine can share it. Default is None, which keeps
+        results in memory only.
+
+    Notes
+    -----
+    The cache is thread-safe. Cached results are returned as copies, so
+    callers may modify them.
+    """
+
+    def __init__(self, maxbytes: int = 256 * 2**20, directory: str | Path | None = None) -> None:
+        self.maxbytes = int(maxbytes)
+        self.directory = None if directory is None else Path(directory)
+        self._entries: OrderedDict[str, tuple[tuple[np.ndarray, ...], bool]] = OrderedDict()
+        self._nbytes = 0
+        self._counts = {"hits": 0, "disk_hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def key(self, kind: str, *arrays: np.ndarray, **params: Any) -> str:
+        """Content hash of a request.
+
+        Parameters
+        ----------
+        kind : str
+            Name of the computation, e.g. ``"evaluate"``.
+        *arrays : ndarray
+            Model inputs, hashed with their dtype and shape.
+        **params
+            Options that change the result, hashed through their ``repr``.
+
+        Returns
+        -------
+        str
+            Hex digest covering the request, the coefficient files in use and
+            :data:`CACHE_VERSION`.
+        """
+        from . import batch
+
+        h = hashlib.sha256()
+        h.update(f"{CACHE_VERSION}:{batch.coefficients_version()}:{kind}".encode())
+        for name in sorted(params):
+            h.update(f":{name}={params[name]!r}".encode())
+        for a in arrays:
+            a = np.ascontiguousarray(a)
+            h.update(f":{a.dtype.str}{a.shape}".encode())
+            h.update(a.data)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / key[:2] / f"{key}.npz"
+
+    def _remember(self, key: str, arrays: tuple[np.ndarray, ...], is_tuple: bool) -> None:
+        """Add a result to the in-memory tier and evict beyond maxbytes."""
+        nbytes = sum(a.nbytes for a in arrays)
+        if nbytes > self.maxbytes:
+            return
+        for a in arrays:
+            a.flags.writeable = False
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = (arrays, is_tuple)
+            self._nbytes += nbytes
+            while self._nbytes > self.maxbytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._nbytes -= sum(a.nbytes for a in evicted)
+
+    def _read(self, key: str) -> tuple[tuple[np.ndarray, ...], bool] | None:
+        """Load a result from the on-disk tier, None if it is not there."""
+        if self.directory is None:
+            return None
+        try:
+            with np.load(self._path(key)) as npz:
+                count = int(npz["count"])
+                arrays = tuple(npz[f"arr_{k}"] for k in range(count))
+                is_tuple = bool(npz["is_tuple"])
+        except (OSError, KeyError, ValueError, BadZipFile):
+            return None
+        return arrays, is_tuple
+
+    def _write(self, key: str, arrays: tuple[np.ndarray, ...], is_tuple: bool) -> None:
+        """Store a result in the on-disk tier, ignoring an unwritable directory."""
+        if self.directory is None:
+            return
+        path = self._path(key)
+        # Write under a temporary name so that readers never see a partial
+        # file; concurrent writers of one key store the same result.
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as f:
+                np.savez_compressed(
+                    f,
+                    *arrays,
+                    count=np.int64(len(arrays)),
+                    is_tuple=np.bool_(is_tuple),
+                )
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    def get(self, key: str) -> Any:
+        """Return the result stored under ``key``, or None.
+
+        Returns
+        -------
+        ndarray, tuple of ndarray or None
+            A copy of the result, in the form it was stored in.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._counts["hits"] += 1
+        if entry is None:
+            entry = self._read(key)
+            with self._lock:
+                self._counts["disk_hits" if entry is not None else "misses"] += 1
+            if entry is None:
+                return None
+            self._remember(key, *entry)
+        arrays, is_tuple = entry
+        arrays = tuple(a.copy() for a in arrays)
+        return arrays if is_tuple else arrays[0]
+
+    def put(self, key: str, result: np.ndarray | tuple[np.ndarray, ...]) -> None:
+        """Store a result (an array or a tuple of arrays) under ``key``."""
+        is_tuple = isinstance(result, tuple)
+        arrays = tuple(np.array(a) for a in (result if is_tuple else (result,)))
+        self._remember(key, arrays, is_tuple)
+        self._write(key, arrays, is_tuple)
+
+    def fetch(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the result under ``key``, computing and storing it on a miss."""
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            self.put(key, result)
+        return result
+
+    def stats(self) -> dict[str, int]:
+        """Return the hit and miss counters and the size of the memory tier.
+
+        Returns
+        -------
+        dict[str, int]
+            ``hits`` (memory), ``disk_hits``, ``misses``, ``entries`` and
+            ``bytes`` held in memory.
+        """
+        with self._lock:
+            return {**self._counts, "entries": len(self._entries), "bytes": self._nbytes}
+
+    def clear(self, disk: bool = False) -> None:
+        """Empty the memory tier and reset the counters.
+
+        Parameters
+        ----------
+        disk : bool, optional
+            Also delete the stored files. Default is False.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self._counts = dict.fromkeys(self._counts, 0)
+        if disk and self.directory is not None:
+            for path in self.directory.glob("*/*.npz"):
+                path.unlink(missing_ok=True)
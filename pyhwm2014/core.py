@@ -1,12 +1,20 @@
 """HWM14 core model classes for wind speed calculations."""
 
+import functools
 import logging
-from typing import Literal
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Literal
 
 import numpy as np
-from numpy import append, arange, ones, reshape
+from numpy import arange, ones
+from numpy.typing import DTypeLike
 
 from . import hwm14
+from .batch import evaluate, height_profile, init
+from .grid import evaluate_grid
+
+if TYPE_CHECKING:
+    from .cache import ResultCache
 
 
 class HWM14:
@@ -62,12 +70,18 @@ class HWM14:
         Print message to screen during calculation. Default is True.
     year : int, optional
         Year (YYYY). Default is 1993.
+    dtype : DTypeLike, optional
+        Floating point type of the wind arrays (float32 or float64).
+        Default is float64.
+    cache : ResultCache, optional
+        Reuse profiles stored in this :class:`pyhwm2014.ResultCache` and
+        store new ones there. Default is None.
     
     Attributes
     ----------
-    Uwind : list[float]
+    Uwind : ndarray
         Zonal wind component (m/s) for each profile point.
-    Vwind : list[float]
+    Vwind : ndarray
         Meridional wind component (m/s) for each profile point.
     altbins : ndarray
         Altitude values (km) for option=1.
@@ -108,6 +122,8 @@ class HWM14:
         utstp: float = 1.0,
         verbose: bool = True,
         year: int = 1993,
+        dtype: DTypeLike = np.float64,
+        cache: "ResultCache | None" = None,
     ) -> None:
         """Initialize HWM14 model calculation."""
         # Apply defaults to mutable arguments
@@ -125,10 +141,12 @@ class HWM14:
         self.option = option
         self.year = year
         self.doy = day
+        self.dtype = np.dtype(dtype)
+        self.cache = cache
 
         # Initialize wind arrays early (before validation)
-        self.Uwind: list[float] = []
-        self.Vwind: list[float] = []
+        self.Uwind: np.ndarray = np.empty(0, dtype=self.dtype)
+        self.Vwind: np.ndarray = np.empty(0, dtype=self.dtype)
 
         # Validate option and set profile-specific parameters
         if option == 1:  # Height profile
@@ -197,41 +215,9 @@ class HWM14:
             self.altlim[0], self.altlim[1] + self.altstp, self.altstp
         )
 
-        for alt in self.altbins:
-            wqt = hwm14.hwm14(
-                self.iyd,
-                self.sec,
-                alt,
-                self.glat,
-                self.glon,
-                self.stl,
-                self.f107a,
-                self.f107,
-                self.apqt,
-            )
-
-            wdt = hwm14.dwm07(self.iyd, self.sec, alt, self.glat, self.glon, self.ap)
-
-            w = hwm14.hwm14(
-                self.iyd,
-                self.sec,
-                alt,
-                self.glat,
-                self.glon,
-                self.stl,
-                self.f107a,
-                self.f107,
-                self.ap,
-            )
-
-            if self.verbose:
-                print(
-                    " %3i %8.3f %8.3f %8.3f %8.3f %8.3f %8.3f"
-                    % (alt, wqt[0], wqt[1], wdt[0], wdt[1], w[0], w[1])
-                )
-
-            self.Uwind.append(w[1])
-            self.Vwind.append(w[0])
+        self._evaluate(
+            self.altbins, " %3i", self.sec, self.altbins, self.glat, self.glon, height_profile
+        )
 
     def LatProfile(self) -> None:
         """Calculate latitude profile (varying latitude)."""
@@ -244,41 +230,9 @@ class HWM14:
             self.glatlim[0], self.glatlim[1] + self.glatstp, self.glatstp
         )
 
-        for glat in self.glatbins:
-            wqt = hwm14.hwm14(
-                self.iyd,
-                self.sec,
-                self.alt,
-                glat,
-                self.glon,
-                self.stl,
-                self.f107a,
-                self.f107,
-                self.apqt,
-            )
-
-            wdt = hwm14.dwm07(self.iyd, self.sec, self.alt, glat, self.glon, self.ap)
-
-            w = hwm14.hwm14(
-                self.iyd,
-                self.sec,
-                self.alt,
-                glat,
-                self.glon,
-                self.stl,
-                self.f107a,
-                self.f107,
-                self.ap,
-            )
-
-            if self.verbose:
-                print(
-                    " %5.1f %8.3f %8.3f %8.3f %8.3f %8.3f %8.3f"
-                    % (glat, wqt[0], wqt[1], wdt[0], wdt[1], w[0], w[1])
-                )
-
-            self.Uwind.append(w[1])
-            self.Vwind.append(w[0])
+        self._evaluate(
+            self.glatbins, " %5.1f", self.sec, self.alt, self.glatbins, self.glon
+        )
 
     def GMTProfile(self) -> None:
         """Calculate GMT profile (varying UTC time)."""
@@ -296,42 +250,9 @@ class HWM14:
             self.toMLT(ut)
             self.mltbins.append(self.mlt)
 
-            sec = ut * 3600.0
-
-            wqt = hwm14.hwm14(
-                self.iyd,
-                sec,
-                self.alt,
-                self.glat,
-                self.glon,
-                -1,
-                self.f107a,
-                self.f107,
-                self.apqt,
-            )
-
-            wdt = hwm14.dwm07(self.iyd, sec, self.alt, self.glat, self.glon, self.ap)
-
-            w = hwm14.hwm14(
-                self.iyd,
-                sec,
-                self.alt,
-                self.glat,
-                self.glon,
-                -1,
-                self.f107a,
-                self.f107,
-                self.ap,
-            )
-
-            if self.verbose:
-                print(
-                    " %5.1f %8.3f %8.3f %8.3f %8.3f %8.3f %8.3f"
-                    % (ut, wqt[0], wqt[1], wdt[0], wdt[1], w[0], w[1])
-                )
-
-            self.Uwind.append(w[1])
-            self.Vwind.append(w[0])
+        self._evaluate(
+            self.utbins, " %5.1f", self.utbins * 3600.0, self.alt, self.glat, self.glon
+        )
 
     def LonProfile(self) -> None:
         """Calculate longitude profile (varying longitude)."""
@@ -344,41 +265,45 @@ class HWM14:
             self.glonlim[0], self.glonlim[1] + self.glonstp, self.glonstp
         )
 
-        for glon in self.glonbins:
-            wqt = hwm14.hwm14(
-                self.iyd,
-                self.sec,
-                self.alt,
-                self.glat,
-                glon,
-                -1,
-                self.f107a,
-                self.f107,
-                self.apqt,
-            )
+        self._evaluate(
+            self.glonbins, " %5.1f", self.sec, self.alt, self.glat, self.glonbins
+        )
 
-            wdt = hwm14.dwm07(self.iyd, self.sec, self.alt, self.glat, glon, self.ap)
-
-            w = hwm14.hwm14(
-                self.iyd,
-                self.sec,
-                self.alt,
-                self.glat,
-                glon,
-                -1,
-                self.f107a,
-                self.f107,
-                self.ap,
-            )
+    def _evaluate(
+        self,
+        bins: np.ndarray,
+        binfmt: str,
+        sec: float | np.ndarray,
+        alt: float | np.ndarray,
+        glat: float | np.ndarray,
+        glon: float | np.ndarray,
+        kernel: Callable[..., Any] = evaluate,
+    ) -> None:
+        """Evaluate all profile points in one pass and store the total winds.
 
-            if self.verbose:
+        The quiet-time/disturbance decomposition is only computed when it is
+        printed, i.e. when ``verbose`` is set. The wind arrays are allocated
+        once from ``bins`` and filled in place. ``kernel`` is
+        :func:`evaluate`, or :func:`height_profile` when only the altitude
+        varies; both look the winds up in ``cache`` first.
+        """
+        args = (self.iyd, sec, alt, glat, glon, self.f107a, self.f107, self.ap[1])
+        kernel = functools.partial(kernel, cache=self.cache)
+
+        if self.verbose:
+            wqt, wdt, w = kernel(*args, components=True)
+            for x, q, d, t in zip(bins, wqt, wdt, w):
                 print(
-                    " %5.1f %8.3f %8.3f %8.3f %8.3f %8.3f %8.3f"
-                    % (glon, wqt[0], wqt[1], wdt[0], wdt[1], w[0], w[1])
+                    (binfmt + " %8.3f %8.3f %8.3f %8.3f %8.3f %8.3f")
+                    % (x, q[0], q[1], d[0], d[1], t[0], t[1])
                 )
+        else:
+            w = kernel(*args)
 
-            self.Uwind.append(w[1])
-            self.Vwind.append(w[0])
+        self.Uwind = np.empty(len(bins), dtype=self.dtype)
+        self.Vwind = np.empty(len(bins), dtype=self.dtype)
+        self.Uwind[:] = w[:, 1]
+        self.Vwind[:] = w[:, 0]
 
     def toMLT(self, ut: float) -> None:
         """Calculate magnetic local time.
@@ -388,7 +313,7 @@ class HWM14:
         ut : float
             Universal time (UTC) in hours.
         """
-        hwm14.inithwm()
+        init()
         mlat, mlon, f1e, f1n, f2e, f2n = hwm14.gd2qd(self.glat, self.glon)
         self.mlt = hwm14.mltcalc(mlat, mlon, self.doy, ut)
 
@@ -407,6 +332,16 @@ class HWM142D:
         - 5: GMT vs Longitude (varies UTC and longitude)
         - 6: Longitude vs Latitude (varies longitude and latitude)
         Default is 1.
+    dtype : DTypeLike, optional
+        Floating point type of the wind grids (float32 or float64).
+        Default is float64.
+    workers : int, optional
+        Number of worker processes used to evaluate the grid, see
+        :func:`pyhwm2014.parallel.evaluate`. Default is None, which
+        evaluates it in this process.
+    cache : ResultCache, optional
+        Reuse grids stored in this :class:`pyhwm2014.ResultCache` and store
+        new ones there. Default is None.
     **kwargs
         Additional keyword arguments passed to individual profile calculations.
         See HWM14 for parameter descriptions.
@@ -414,7 +349,9 @@ class HWM142D:
     Attributes
     ----------
     Uwind : ndarray
-        2D array of zonal wind components (m/s).
+        2D array of zonal wind components (m/s), with rows following the
+        first and columns the second varying coordinate (e.g. altitude rows
+        and UTC columns for option 1).
     Vwind : ndarray
         2D array of meridional wind components (m/s).
     """
@@ -441,6 +378,9 @@ class HWM142D:
         ut: float = 12.0,
         verbose: bool = True,
         year: int = 1993,
+        dtype: DTypeLike = np.float64,
+        workers: int | None = None,
+        cache: "ResultCache | None" = None,
     ) -> None:
         """Initialize 2D HWM14 calculation."""
         # Apply defaults to mutable arguments
@@ -493,7 +433,7 @@ class HWM142D:
             self.glonstp = glonstp
         elif option == 5:  # GMT vs Longitude
             self.alt = alt
-            self.glon = glon
+            self.glat = glat
             self.glonlim = glonlim
             self.glonstp = glonstp
             self.utlim = utlim
@@ -508,7 +448,7 @@ class HWM142D:
             logging.error("Invalid option! Must be 1-6.")
             return
 
-        self.iyd = int((year - (2000 if year > 1999 else 1900)) * 10000) + day
+        self.iyd = int((year - (2000 if year > 1999 else 1900)) * 1000) + day
         if option != 3:
             self.sec = ut * 3600.0
         self.ap = ap
@@ -518,8 +458,11 @@ class HWM142D:
         self.f107a = f107a
         self.verbose = verbose
 
-        self.Uwind: list[np.ndarray] = []
-        self.Vwind: list[np.ndarray] = []
+        self.dtype = np.dtype(dtype)
+        self.workers = workers
+        self.cache = cache
+        self.Uwind: np.ndarray = np.empty((0, 0), dtype=self.dtype)
+        self.Vwind: np.ndarray = np.empty((0, 0), dtype=self.dtype)
 
         # Execute appropriate 2D profile calculation
         if "alt" not in self.__dict__:
@@ -534,6 +477,11 @@ class HWM142D:
             and "ut" not in self.__dict__
         ):
             self.LatVsGMTArray()
+        elif (
+            "glon" not in self.__dict__
+            and "ut" not in self.__dict__
+        ):
+            self.LonVsGMTArray()
         elif "glat" not in self.__dict__:
             self.LatVsHeiArray()
         elif "glon" not in self.__dict__:
@@ -544,142 +492,129 @@ class HWM142D:
     def HeiVsLTArray(self) -> None:
         """Calculate height vs local time 2D array."""
         self.utbins = arange(self.utlim[0], self.utlim[1] + self.utstp, self.utstp)
+        self.altbins = arange(
+            self.altlim[0], self.altlim[1] + self.altstp, self.altstp
+        )
 
-        for ut in self.utbins:
-            hwm14obj = HWM14(
-                altlim=self.altlim,
-                altstp=self.altstp,
-                ap=self.ap,
-                glat=self.glat,
-                glon=self.glon,
-                option=1,
-                ut=ut,
-                verbose=self.verbose,
-            )
-
-            uwind = reshape(hwm14obj.Uwind, (len(hwm14obj.Uwind), 1))
-            vwind = reshape(hwm14obj.Vwind, (len(hwm14obj.Vwind), 1))
-            self.Uwind = (
-                uwind
-                if ut == self.utlim[0]
-                else append(self.Uwind, uwind, axis=1)
-            )
-            self.Vwind = (
-                vwind
-                if ut == self.utlim[0]
-                else append(self.Vwind, vwind, axis=1)
-            )
-
-        self.altbins = hwm14obj.altbins
+        self._evaluate_grid(
+            "HEIGHT VS GMT ARRAY",
+            alt=self.altbins,
+            ut=self.utbins,
+            glat=self.glat,
+            glon=self.glon,
+        )
 
     def LatVsHeiArray(self) -> None:
         """Calculate latitude vs height 2D array."""
         self.altbins = arange(
             self.altlim[0], self.altlim[1] + self.altstp, self.altstp
         )
+        self.glatbins = arange(
+            self.glatlim[0], self.glatlim[1] + self.glatstp, self.glatstp
+        )
 
-        for _alt in self.altbins:
-            hwm14obj = HWM14(
-                alt=_alt,
-                ap=self.ap,
-                glatlim=self.glatlim,
-                glatstp=self.glatstp,
-                glon=self.glon,
-                option=2,
-                verbose=self.verbose,
-                ut=self.ut,
-            )
-
-            uwind = reshape(hwm14obj.Uwind, (len(hwm14obj.Uwind), 1))
-            vwind = reshape(hwm14obj.Vwind, (len(hwm14obj.Vwind), 1))
-            self.Uwind = (
-                uwind
-                if _alt == self.altlim[0]
-                else append(self.Uwind, uwind, axis=1)
-            )
-            self.Vwind = (
-                vwind
-                if _alt == self.altlim[0]
-                else append(self.Vwind, vwind, axis=1)
-            )
-
-        self.glatbins = hwm14obj.glatbins
-
-        self.Uwind = self.Uwind.T
-        self.Vwind = self.Vwind.T
+        self._evaluate_grid(
+            "HEIGHT VS LATITUDE ARRAY",
+            alt=self.altbins,
+            glat=self.glatbins,
+            glon=self.glon,
+            ut=self.ut,
+        )
 
     def LonVsHeiArray(self) -> None:
         """Calculate longitude vs height 2D array."""
         self.altbins = arange(
             self.altlim[0], self.altlim[1] + self.altstp, self.altstp
         )
+        self.glonbins = arange(
+            self.glonlim[0], self.glonlim[1] + self.glonstp, self.glonstp
+        )
 
-        for alt in self.altbins:
-            hwm14obj = HWM14(
-                alt=alt,
-                ap=self.ap,
-                glat=self.glat,
-                glonlim=self.glonlim,
-                glonstp=self.glonstp,
-                option=4,
-                verbose=self.verbose,
-                ut=self.ut,
-            )
-
-            uwind = reshape(hwm14obj.Uwind, (len(hwm14obj.Uwind), 1))
-            vwind = reshape(hwm14obj.Vwind, (len(hwm14obj.Vwind), 1))
-            self.Uwind = (
-                uwind
-                if alt == self.altlim[0]
-                else append(self.Uwind, uwind, axis=1)
-            )
-            self.Vwind = (
-                vwind
-                if alt == self.altlim[0]
-                else append(self.Vwind, vwind, axis=1)
-            )
-
-        self.glonbins = hwm14obj.glonbins
-
-        self.Uwind = self.Uwind.T
-        self.Vwind = self.Vwind.T
+        self._evaluate_grid(
+            "HEIGHT VS LONGITUDE ARRAY",
+            alt=self.altbins,
+            glon=self.glonbins,
+            glat=self.glat,
+            ut=self.ut,
+        )
 
     def LonVsLatArray(self) -> None:
         """Calculate longitude vs latitude 2D array."""
         self.glatbins = arange(
             self.glatlim[0], self.glatlim[1] + self.glatstp, self.glatstp
         )
+        self.glonbins = arange(
+            self.glonlim[0], self.glonlim[1] + self.glonstp, self.glonstp
+        )
 
-        for glat in self.glatbins:
-            hwm14obj = HWM14(
-                alt=self.alt,
-                ap=self.ap,
-                glat=glat,
-                glonlim=self.glonlim,
-                glonstp=self.glonstp,
-                option=4,
-                verbose=self.verbose,
-                ut=self.ut,
-            )
+        self._evaluate_grid(
+            "LATITUDE VS LONGITUDE ARRAY",
+            alt=self.alt,
+            glat=self.glatbins,
+            glon=self.glonbins,
+            ut=self.ut,
+        )
 
-            uwind = reshape(hwm14obj.Uwind, (len(hwm14obj.Uwind), 1))
-            vwind = reshape(hwm14obj.Vwind, (len(hwm14obj.Vwind), 1))
-            self.Uwind = (
-                uwind
-                if glat == self.glatlim[0]
-                else append(self.Uwind, uwind, axis=1)
-            )
-            self.Vwind = (
-                vwind
-                if glat == self.glatlim[0]
-                else append(self.Vwind, vwind, axis=1)
-            )
+    def LatVsGMTArray(self) -> None:
+        """Calculate latitude vs GMT 2D array."""
+        self.utbins = arange(self.utlim[0], self.utlim[1] + self.utstp, self.utstp)
+        self.glatbins = arange(
+            self.glatlim[0], self.glatlim[1] + self.glatstp, self.glatstp
+        )
 
-        self.glonbins = hwm14obj.glonbins
+        self._evaluate_grid(
+            "LATITUDE VS GMT ARRAY",
+            alt=self.alt,
+            glat=self.glatbins,
+            glon=self.glon,
+            ut=self.utbins,
+        )
 
-        self.Uwind = self.Uwind.T
-        self.Vwind = self.Vwind.T
+    def LonVsGMTArray(self) -> None:
+        """Calculate longitude vs GMT 2D array."""
+        self.utbins = arange(self.utlim[0], self.utlim[1] + self.utstp, self.utstp)
+        self.glonbins = arange(
+            self.glonlim[0], self.glonlim[1] + self.glonstp, self.glonstp
+        )
 
-    def LatVsGMTArray(self) -> None:
-        """Calculate latitude vs GMT 2D array."""
-        pass
+        self._evaluate_grid(
+            "LONGITUDE VS GMT ARRAY",
+            alt=self.alt,
+            glat=self.glat,
+            glon=self.glonbins,
+            ut=self.utbins,
+        )
+
+    def _evaluate_grid(self, title: str, **coords: float | np.ndarray) -> None:
+        """Evaluate the 2D grid in one batch and store the total winds.
+
+        Rows of ``Uwind``/``Vwind`` follow the first varying coordinate in
+        ``evaluate_grid`` keyword order and columns the second.
+        """
+        grid = evaluate_grid(
+            doy=self.doy,
+            ap=self.ap[1],
+            components=self.verbose,
+            dtype=self.dtype,
+            workers=self.workers,
+            cache=self.cache,
+            **coords,
+        )
+
+        if self.verbose:
+            ynam, xnam = grid.axes
+            ybins, xbins = grid.coords[ynam], grid.coords[xnam]
+            print(title)
+            print("                             quiet         disturbed             total")
+            print(
+                f" {ynam:>7s} {xnam:>7s}      mer      zon      mer      zon      mer      zon"
+            )
+            for i, j in np.ndindex(grid.shape):
+                q, d, t = grid.quiet[i, j], grid.disturbance[i, j], grid.wind[i, j]
+                print(
+                    " %7.2f %7.2f %8.3f %8.3f %8.3f %8.3f %8.3f %8.3f"
+                    % (ybins[i], xbins[j], q[0], q[1], d[0], d[1], t[0], t[1])
+                )
+
+        self.Uwind = np.ascontiguousarray(grid.Uwind)
+        self.Vwind = np.ascontiguousarray(grid.Vwind)
@@ -1,11 +1,28 @@
 """Data path management for HWM14 model data files."""
 
+import hashlib
 from pathlib import Path
-from os import environ
 
-# Set HWMPATH to the location of data files:
+# Location of the data files:
 # - hwm123114.bin
 # - dwm07b104i.dat
 # - gd2qd.dat
 HWMPATH: str = str(Path(__file__).parent / "data")
-environ["HWMPATH"] = HWMPATH
+
+# Coefficient file of each part of the model
+SOURCES: dict[str, str] = {
+    "qwm": "hwm123114.bin",
+    "dwm": "dwm07b104i.dat",
+    "gd2qd": "gd2qd.dat",
+}
+
+
+def coefficient_hash(filename: str | Path) -> str:
+    """Short SHA-256 digest of a coefficient file, to key caches."""
+    return hashlib.sha256(Path(filename).read_bytes()).hexdigest()[:12]
+
+
+def data_version(directory: str | Path) -> str:
+    """Digest of the coefficient files in ``directory``."""
+    digests = "".join(coefficient_hash(Path(directory) / name) for name in SOURCES.values())
+    return hashlib.sha256(digests.encode()).hexdigest()[:12]
@@ -0,0 +1,155 @@
+"""Reduced-fidelity quiet-time coefficients and their error.
+
+Every level of the quiet-time model sums a zonal mean (Legendre degree
+``n`` up to ``amaxn`` with seasonal harmonics ``s`` up to ``amaxs``),
+stationary planetary waves (longitude order ``m``) and migrating tides
+(order ``l``), as listed in ``order``. :func:`truncate` drops the higher
+degrees and harmonics, or whole groups, by repacking the coefficients for a
+smaller ``order``, so :func:`pyhwm2014.numpy_backend.hwmqt` builds and
+projects a shorter basis. :func:`rms_error` measures what that costs
+against the full model on a reference grid.
+
+Examples
+--------
+>>> from pyhwm2014 import numpy_backend
+>>> qwm = truncate(maxn=5, maxs=1)
+>>> error = rms_error(qwm)
+>>> w = numpy_backend.hwmqt(93323, 42000.0, 250.0, -11.95, -76.77, qwm=qwm)
+"""
+
+import copy
+
+import numpy as np
+
+from .numpy_backend import QWMCoefficients, _basis_recipe, hwmqt, load_qwm
+
+# Reference grid of rms_error: day of year, UT (hours), altitude (km),
+# latitude and longitude (degrees)
+REFERENCE_GRID: dict[str, np.ndarray] = {
+    "doy": np.array([80, 172, 266, 355]),
+    "ut": np.arange(0.0, 24.0, 6.0),
+    "alt": np.arange(100.0, 451.0, 50.0),
+    "glat": np.arange(-80.0, 81.0, 20.0),
+    "glon": np.arange(-180.0, 180.0, 30.0),
+}
+
+
+def truncate(
+    qwm: QWMCoefficients | None = None,
+    maxn: int | None = None,
+    maxs: int | None = None,
+    maxm: int | None = None,
+    maxl: int | None = None,
+    mean: bool = True,
+    waves: bool = True,
+    tides: bool = True,
+) -> QWMCoefficients:
+    """Return quiet-time coefficients with fewer spectral terms.
+
+    Parameters
+    ----------
+    qwm : QWMCoefficients, optional
+        Full coefficients. Default is :func:`numpy_backend.load_qwm`.
+    maxn : int, optional
+        Largest Legendre degree ``n`` kept in every group.
+    maxs : int, optional
+        Largest seasonal harmonic ``s`` kept in every group.
+    maxm : int, optional
+        Largest stationary planetary wave order ``m`` kept.
+    maxl : int, optional
+        Largest migrating tide order ``l`` kept.
+    mean, waves, tides : bool, optional
+        Keep the zonal mean, the stationary planetary waves and the migrating
+        tides. Default keeps all three.
+
+    Returns
+    -------
+    QWMCoefficients
+        Copy of ``qwm`` with the reduced ``order`` and the coefficients of
+        the kept terms. Limits of None keep the full order.
+    """
+    qwm = qwm or load_qwm()
+
+    def cap(value: int, limit: int | None, keep: bool = True) -> int:
+        return 0 if not keep else value if limit is None else min(value, limit)
+
+    order = np.array(
+        [
+            (
+                cap(amaxs, maxs, mean),
+                cap(amaxn, maxn, mean),
+                cap(pmaxm, maxm, waves),
+                cap(pmaxs, maxs, waves),
+                cap(pmaxn, maxn, waves),
+                cap(tmaxl, maxl, tides),
+                cap(tmaxs, maxs, tides),
+                cap(tmaxn, maxn, tides),
+            )
+            for amaxs, amaxn, pmaxm, pmaxs, pmaxn, tmaxl, tmaxs, tmaxn in qwm.order.tolist()
+        ],
+        dtype=np.int32,
+    )
+
+    # The columns of bz only depend on the level order; with the same
+    # global limits each one is identified by its factors.
+    limits = (qwm.maxn, qwm.maxm, qwm.maxl, qwm.maxs)
+    kept = []
+    for full, reduced in zip(qwm.order.tolist(), order.tolist()):
+        position = {
+            column: c for c, column in enumerate(zip(*_basis_recipe(tuple(full), *limits)))
+        }
+        kept.append(
+            [position[column] for column in zip(*_basis_recipe(tuple(reduced), *limits))]
+        )
+
+    result = copy.copy(qwm)
+    result.order = order
+    result.nbf = max(len(keep) for keep in kept)
+    result.mparm = np.zeros((result.nbf, order.shape[0]))
+    result.tparm = np.zeros((result.nbf, order.shape[0]))
+    for d, keep in enumerate(kept):
+        result.mparm[: len(keep), d] = qwm.mparm[keep, d]
+        result.tparm[: len(keep), d] = qwm.tparm[keep, d]
+
+    # Smaller global limits shrink the Legendre and Fourier tables; tides
+    # share the Legendre table of the waves, so maxm covers both.
+    result.maxs = int(order[:, [0, 3, 6]].max())
+    result.maxn = int(order[:, [1, 4, 7]].max())
+    result.maxl = int(order[:, 5].max())
+    result.maxm = max(int(order[:, 2].max()), result.maxl)
+    return result
+
+
+def rms_error(
+    qwm: QWMCoefficients,
+    reference: QWMCoefficients | None = None,
+    grid: dict[str, np.ndarray] | None = None,
+) -> dict[str, float]:
+    """RMS and maximum deviation of the quiet-time winds from a reference.
+
+    Parameters
+    ----------
+    qwm : QWMCoefficients
+        Coefficients to assess, e.g. from :func:`truncate`.
+    reference : QWMCoefficients, optional
+        Reference coefficients. Default is :func:`numpy_backend.load_qwm`.
+    grid : dict, optional
+        ``doy``, ``ut``, ``alt``, ``glat`` and ``glon`` values whose outer
+        product is evaluated. Default is :data:`REFERENCE_GRID`.
+
+    Returns
+    -------
+    dict[str, float]
+        ``meridional`` and ``zonal`` RMS deviations and the largest absolute
+        deviation ``max``, in m/s.
+    """
+    grid = grid or REFERENCE_GRID
+    doy, ut, alt, glat, glon = np.meshgrid(
+        *(np.asarray(grid[k]) for k in ("doy", "ut", "alt", "glat", "glon")), indexing="ij"
+    )
+    args = (doy.ravel(), ut.ravel() * 3600.0, alt.ravel(), glat.ravel(), glon.ravel())
+    delta = hwmqt(*args, qwm=qwm).astype(np.float64) - hwmqt(
+        *args, qwm=reference or load_qwm()
+    ).astype(np.float64)
+    rms = np.sqrt(np.mean(delta**2, axis=0))
+    return {"meridional": float(rms[0]), "zonal": float(rms[1]), "max": float(np.abs(delta).max())}
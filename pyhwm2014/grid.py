@@ -0,0 +1,199 @@
+"""N-dimensional grid evaluation of HWM14."""
+
+import functools
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike
+
+from .batch import evaluate
+
+if TYPE_CHECKING:
+    from .cache import ResultCache
+
+# Grid axes in the order the points are fed to the model, outermost first.
+# ``hwmqt`` caches its basis on exact repeats of the previous inputs: a new
+# day refreshes everything, a new latitude recomputes ``alfbasis`` (and, in
+# ``dwm07``, ``gd2qd``), a new longitude the planetary waves and tides, and a
+# new UT only the tides. A new altitude only reruns ``vertwght`` and a new ap
+# only touches the disturbance model's Kp terms, so those vary fastest.
+LOOP_ORDER: tuple[str, ...] = ("doy", "glat", "glon", "ut", "alt", "ap")
+
+# Default order of the output axes (the keyword order of evaluate_grid).
+AXES: tuple[str, ...] = ("alt", "glat", "glon", "ut", "doy", "ap")
+
+
+class GridResult:
+    """Winds evaluated on a labelled N-D grid.
+
+    Parameters
+    ----------
+    axes : tuple[str, ...]
+        Names of the grid axes, in array axis order.
+    coords : dict[str, ndarray]
+        Coordinate values of every input; 1-D for grid axes, 0-D otherwise.
+    wind : ndarray
+        Total winds with shape ``grid_shape + (2,)``; ``[..., 0]`` is the
+        meridional and ``[..., 1]`` the zonal component (m/s).
+    quiet, disturbance : ndarray, optional
+        Quiet-time and disturbance winds, same layout as ``wind``.
+
+    Attributes
+    ----------
+    Uwind : ndarray
+        Zonal wind on the grid (m/s).
+    Vwind : ndarray
+        Meridional wind on the grid (m/s).
+    """
+
+    def __init__(
+        self,
+        axes: tuple[str, ...],
+        coords: dict[str, np.ndarray],
+        wind: np.ndarray,
+        quiet: np.ndarray | None = None,
+        disturbance: np.ndarray | None = None,
+    ) -> None:
+        self.axes = axes
+        self.coords = coords
+        self.wind = wind
+        self.quiet = quiet
+        self.disturbance = disturbance
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """Shape of the grid (without the wind component axis)."""
+        return self.wind.shape[:-1]
+
+    @property
+    def Uwind(self) -> np.ndarray:
+        """Zonal wind (m/s, +eastward)."""
+        return self.wind[..., 1]
+
+    @property
+    def Vwind(self) -> np.ndarray:
+        """Meridional wind (m/s, +northward)."""
+        return self.wind[..., 0]
+
+    def __repr__(self) -> str:
+        dims = ", ".join(f"{name}: {len(self.coords[name])}" for name in self.axes)
+        return f"GridResult({dims})"
+
+
+def evaluate_grid(
+    alt: ArrayLike = 300.0,
+    glat: ArrayLike = 0.0,
+    glon: ArrayLike = 0.0,
+    ut: ArrayLike = 12.0,
+    doy: ArrayLike = 1,
+    ap: ArrayLike = -1.0,
+    axes: tuple[str, ...] | None = None,
+    components: bool = False,
+    dtype: DTypeLike = np.float32,
+    workers: int | None = None,
+    cache: "ResultCache | None" = None,
+) -> GridResult:
+    """Evaluate HWM14 on the outer product of any subset of its inputs.
+
+    Every input given as a 1-D array becomes a grid axis; scalars are held
+    fixed. The points are evaluated in a single batch call, looping in
+    :data:`LOOP_ORDER` so that the Fortran basis caches in ``hwmqt``
+    (``previous(1:5)`` and ``vertwght``) hit as often as possible, and the
+    result is then transposed to the requested axis order. Latitudes that
+    recur further apart reuse their ``alfbasis`` arrays from the LRU cache
+    each expansion keeps, see :func:`pyhwm2014.set_alf_cache_size`.
+
+    Parameters
+    ----------
+    alt : float or array_like, optional
+        Altitude in kilometers. Default is 300.
+    glat : float or array_like, optional
+        Geodetic latitude in degrees. Default is 0.
+    glon : float or array_like, optional
+        Geodetic longitude in degrees. Default is 0.
+    ut : float or array_like, optional
+        Universal time in hours. Default is 12.
+    doy : int or array_like, optional
+        Day of year. Default is 1.
+    ap : float or array_like, optional
+        Current 3-hour ap index, negative for quiet time only. Default is -1.
+    axes : tuple[str, ...], optional
+        Order of the grid axes in the output. Must name exactly the array
+        inputs. Default is the keyword order of this function.
+    components : bool, optional
+        Also return the quiet-time and disturbance winds. Default is False.
+    dtype : DTypeLike, optional
+        Floating point type of the output arrays. Default is float32.
+    workers : int, optional
+        Evaluate the grid on this many worker processes with
+        :func:`pyhwm2014.parallel.evaluate`. Default is None, a single batch
+        call in this process.
+    cache : ResultCache, optional
+        Look the grid up in this :class:`pyhwm2014.ResultCache` before
+        evaluating it, and store it there afterwards. Default is None.
+
+    Returns
+    -------
+    GridResult
+        Winds with shape ``(len(axis) for axis in axes) + (2,)``.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> g = evaluate_grid(alt=np.arange(100.0, 401.0, 50.0), ut=np.arange(24.0), doy=323)
+    >>> g.axes, g.Uwind.shape
+    (('alt', 'ut'), (7, 24))
+    """
+    coords: dict[str, np.ndarray] = {
+        name: np.asarray(value, dtype=np.int32 if name == "doy" else np.float64)
+        for name, value in zip(AXES, (alt, glat, glon, ut, doy, ap))
+    }
+    for name, value in coords.items():
+        if value.ndim > 1:
+            raise ValueError(f"{name} must be a scalar or a 1-D array")
+
+    grid_axes = tuple(name for name in AXES if coords[name].ndim == 1)
+    if axes is None:
+        axes = grid_axes
+    elif sorted(axes) != sorted(grid_axes):
+        raise ValueError(f"axes must be a permutation of {grid_axes}, got {tuple(axes)}")
+
+    # Lay each grid axis along its own dimension in loop order and let
+    # ``evaluate`` broadcast; C order then makes the last loop axis fastest.
+    loop_axes = [name for name in LOOP_ORDER if name in grid_axes]
+    inputs = {}
+    for name, value in coords.items():
+        if name in loop_axes:
+            shape = [1] * len(loop_axes)
+            shape[loop_axes.index(name)] = -1
+            value = value.reshape(shape)
+        inputs[name] = value
+
+    args = (inputs["doy"], inputs["ut"] * 3600.0, inputs["alt"], inputs["glat"], inputs["glon"])
+    if workers is None:
+        compute = functools.partial(evaluate, *args, ap=inputs["ap"], components=components)
+    else:
+        from . import parallel
+
+        compute = functools.partial(
+            parallel.evaluate, *args, ap=inputs["ap"], components=components, workers=workers
+        )
+    if cache is None:
+        result = compute()
+    else:
+        # Key on the axes as the model sees them, before broadcasting.
+        ap = np.where(inputs["ap"] >= 0.0, inputs["ap"], -1.0)
+        keyed = (np.asarray(a, dtype=np.float32) for a in args + (ap,))
+        result = cache.fetch(cache.key("grid", *keyed, components=components), compute)
+    loop_shape = tuple(len(coords[name]) for name in loop_axes)
+    perm = [loop_axes.index(name) for name in axes] + [len(loop_axes)]
+
+    def _arrange(w: np.ndarray) -> np.ndarray:
+        w = np.broadcast_to(w, loop_shape + (2,))
+        return np.ascontiguousarray(w.transpose(perm), dtype=dtype)
+
+    if components:
+        wqt, wdt, w = result
+        return GridResult(tuple(axes), coords, _arrange(w), _arrange(wqt), _arrange(wdt))
+    assert isinstance(result, np.ndarray)
+    return GridResult(tuple(axes), coords, _arrange(result))
@@ -0,0 +1,161 @@
+"""Model handles that own their coefficients."""
+
+import threading
+from collections.abc import Callable, Mapping
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from . import numpy_backend
+from .bundle import CoefficientBundle, load_bundle
+from .data import HWMPATH, SOURCES
+from .numpy_backend import DWMCoefficients, GD2QDCoefficients, QWMCoefficients
+
+
+class Model:
+    """HWM14 with its own coefficients, read from a directory or from bytes.
+
+    :func:`pyhwm2014.evaluate` uses the coefficients of the Fortran
+    extension, which are shared by the whole process. A ``Model`` keeps its
+    coefficient arrays in the instance and evaluates them with
+    :mod:`pyhwm2014.numpy_backend`, so handles with different data coexist
+    and a handle can be shared between threads. Missing or malformed files
+    raise Python exceptions when the handle loads them.
+
+    Parameters
+    ----------
+    data_dir : str or Path, optional
+        Directory holding ``hwm123114.bin``, ``dwm07b104i.dat`` and
+        ``gd2qd.dat``. Default is :data:`pyhwm2014.HWMPATH`, whose
+        coefficients are mapped from the :func:`pyhwm2014.bundle.load_bundle`
+        cache.
+    data : mapping of str to bytes, optional
+        Contents of coefficient files keyed by file name, used instead of the
+        files in ``data_dir``.
+    preload : bool, optional
+        Load the coefficients now rather than on first evaluation, e.g. at
+        service start-up. Default is True.
+
+    Raises
+    ------
+    FileNotFoundError
+        If a coefficient file is missing (when loading).
+    ValueError
+        If ``data`` has a key other than the three file names.
+
+    Examples
+    --------
+    >>> model = Model()
+    >>> w = model.evaluate(93323, 42000.0, [100.0, 200.0, 300.0], -11.95, -76.77, ap=35)
+    >>> w.shape
+    (3, 2)
+    """
+
+    def __init__(
+        self,
+        data_dir: str | Path | None = None,
+        data: Mapping[str, bytes] | None = None,
+        preload: bool = True,
+    ) -> None:
+        self.data_dir = Path(HWMPATH if data_dir is None else data_dir)
+        self._data = dict(data or {})
+        unknown = set(self._data) - set(SOURCES.values())
+        if unknown:
+            raise ValueError(f"unknown coefficient files {sorted(unknown)}")
+        self._default = data_dir is None and not self._data
+        self._bundle: CoefficientBundle | None = None
+        self._lock = threading.Lock()
+        if preload:
+            self.load()
+
+    def load(self) -> None:
+        """Read the coefficients, if not done yet."""
+        if self._bundle is None:
+            with self._lock:
+                if self._bundle is None:
+                    self._bundle = self._read()
+
+    def _read(self) -> CoefficientBundle:
+        """Parse the coefficient files of the handle."""
+        if self._default:
+            return load_bundle()
+
+        def source(name: str) -> Path | bytes:
+            filename = SOURCES[name]
+            data = self._data.get(filename, self.data_dir / filename)
+            if isinstance(data, Path) and not data.is_file():
+                raise FileNotFoundError(f"HWM14 data file {data} not found")
+            return data
+
+        return CoefficientBundle(
+            qwm=QWMCoefficients(source("qwm")),
+            dwm=DWMCoefficients(source("dwm")),
+            gd2qd=GD2QDCoefficients(source("gd2qd")),
+        )
+
+    def _coefficients(self) -> CoefficientBundle:
+        """The loaded coefficients of the handle."""
+        self.load()
+        assert self._bundle is not None
+        return self._bundle
+
+    @property
+    def qwm(self) -> QWMCoefficients:
+        """Quiet-time model coefficients."""
+        return self._coefficients().qwm
+
+    @property
+    def dwm(self) -> DWMCoefficients:
+        """Disturbance wind coefficients."""
+        return self._coefficients().dwm
+
+    @property
+    def gd2qd(self) -> GD2QDCoefficients:
+        """Quasi-dipole coordinate coefficients."""
+        return self._coefficients().gd2qd
+
+    def evaluate(
+        self,
+        iyd: ArrayLike,
+        sec: ArrayLike,
+        alt: ArrayLike,
+        glat: ArrayLike,
+        glon: ArrayLike,
+        ap: ArrayLike = -1.0,
+        components: bool = False,
+        chunksize: int = 4096,
+        qdtable: Callable[..., tuple[np.ndarray, ...]] | None = None,
+    ) -> np.ndarray | tuple[np.ndarray, ...]:
+        """Evaluate HWM14 with the coefficients of this handle.
+
+        Parameters
+        ----------
+        iyd, sec, alt, glat, glon, ap : array_like
+            Model inputs, see :func:`pyhwm2014.evaluate`.
+        components : bool, optional
+            Return the ``(quiet, disturbance, total)`` winds. Default is False.
+        chunksize : int, optional
+            Number of points per basis matrix. Default is 4096.
+        qdtable : callable, optional
+            Quasi-dipole coordinate lookup, see :func:`numpy_backend.dwm07`.
+
+        Returns
+        -------
+        ndarray or tuple of ndarray
+            Same as :func:`pyhwm2014.evaluate`.
+        """
+        return numpy_backend.hwm14(
+            iyd,
+            sec,
+            alt,
+            glat,
+            glon,
+            ap,
+            components=components,
+            chunksize=chunksize,
+            qdtable=qdtable,
+            qwm=self.qwm,
+            dwm=self.dwm,
+            gd=self.gd2qd,
+        )
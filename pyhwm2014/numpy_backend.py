@@ -0,0 +1,984 @@
+"""Pure-NumPy implementation of HWM14.
+
+The Fortran ``hwmqt`` builds, point by point, a vector spherical harmonic
+basis ``bz`` from Legendre functions (``alfbasis``) and seasonal, stationary
+wave and tidal Fourier terms (``fs``, ``fm``, ``fl``), dots it with the
+coefficients ``mparm``/``tparm`` of the B-spline levels around the altitude
+and weights the levels with ``vertwght``. Here the basis of a whole chunk of
+points is built as an ``(N, nbf)`` matrix and projected onto the coefficients
+of every level with a single matrix product.
+
+The disturbance winds of ``dwm07`` are computed the same way: quasi-dipole
+coordinates (``gd2qd``), magnetic local time (``mltcalc``), the Kp spline
+(``kpspl3``) and latitude weight (``latwgt2``) are evaluated for all points
+at once, the coupled terms of ``termarr`` are gathered into an
+``(N, nterm)`` matrix and multiplied by ``coeff``.
+
+This module does not need the compiled extension.
+"""
+
+import functools
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+TWO_PI = 2.0 * np.pi
+DEG2RAD = TWO_PI / 360.0
+H = 60.0  # scale height (km) of the exponential weight above alttns
+
+
+def _read_bytes(filename: str | Path | bytes) -> bytes:
+    """Contents of a coefficient file, passing bytes through."""
+    return filename if isinstance(filename, bytes) else Path(filename).read_bytes()
+
+
+class QWMCoefficients:
+    """Quiet-time model coefficients read from ``hwm123114.bin``.
+
+    Parameters
+    ----------
+    filename : str, Path or bytes
+        Path of the coefficient file, or its contents.
+
+    Attributes
+    ----------
+    nbf : int
+        Number of basis functions per level.
+    maxs, maxm, maxl, maxn : int
+        Maximum seasonal, stationary wave and tidal orders and latitude degree.
+    p : int
+        B-spline order.
+    vnode : ndarray
+        Knots of the vertical B-splines (km).
+    order : ndarray
+        ``(nlevel, 8)`` spectral content of each level.
+    mparm, tparm : ndarray
+        ``(nbf, nlevel)`` coefficients of the zonal and meridional winds,
+        after applying the parity relationships.
+    e1, e2 : ndarray
+        Weights of the last two levels above the B-spline region.
+    alttns : float
+        Altitude (km) above which the winds decay exponentially.
+    """
+
+    def __init__(self, filename: str | Path | bytes) -> None:
+        raw = _read_bytes(filename)
+        offset = 0
+
+        def read(dtype: type, count: int) -> np.ndarray:
+            nonlocal offset
+            values: np.ndarray = np.frombuffer(raw, dtype=dtype, count=count, offset=offset)
+            offset += values.nbytes
+            return values
+
+        header = (int(v) for v in read(np.int32, 6))
+        self.nbf, self.maxs, self.maxm, self.maxl, self.maxn, ncomp = header
+        nlev, self.p = (int(v) for v in read(np.int32, 2))
+        nnode = nlev + self.p
+        self.vnode = read(np.float64, nnode + 1).copy()
+        self.vnode[3] = 0.0
+
+        nlevel = nlev - self.p
+        self.order = np.zeros((nlevel, 8), dtype=np.int32)
+        self.mparm = np.zeros((self.nbf, nlevel))
+        for i in range(nlevel):
+            self.order[i] = read(np.int32, ncomp)[:8]
+            read(np.int32, 1)  # nb
+            self.mparm[:, i] = read(np.float64, self.nbf)
+        self.e1 = read(np.float64, 5).copy()
+        self.e2 = read(np.float64, 5).copy()
+
+        self.tparm = np.zeros_like(self.mparm)
+        for i in range(nlevel):
+            _parity(self.order[i], self.mparm[:, i], self.tparm[:, i])
+
+        self.nnode = nnode
+        self.alttns = float(self.vnode[nlev - 2])
+
+
+def _parity(order: np.ndarray, mparm: np.ndarray, tparm: np.ndarray) -> None:
+    """Split the packed coefficients of one level into mparm and tparm."""
+    amaxs, amaxn, pmaxm, pmaxs, pmaxn, tmaxl, tmaxs, tmaxn = (int(v) for v in order)
+    c = 0
+    for _ in range(amaxn):
+        tparm[c + 1] = -mparm[c + 1]
+        mparm[c + 1] = 0.0
+        c += 2
+    for _ in range(amaxs * amaxn):
+        tparm[c + 2 : c + 4] = -mparm[c + 2 : c + 4]
+        mparm[c + 2 : c + 4] = 0.0
+        c += 4
+
+    def swap(c: int, width: int) -> None:
+        for k in range(0, width, 4):
+            tparm[c + k : c + k + 2] = mparm[c + k + 2 : c + k + 4]
+            tparm[c + k + 2 : c + k + 4] = -mparm[c + k : c + k + 2]
+
+    for maxm, maxs, maxn in ((pmaxm, pmaxs, pmaxn), (tmaxl, tmaxs, tmaxn)):
+        for m in range(1, maxm + 1):
+            nn = maxn - m + 1
+            swap(c, 4 * nn)
+            c += 4 * nn
+            swap(c, 8 * nn * maxs)
+            c += 8 * nn * maxs
+
+
+@functools.cache
+def load_qwm(filename: str | None = None) -> QWMCoefficients:
+    """Return the (cached) quiet-time coefficients.
+
+    Parameters
+    ----------
+    filename : str, optional
+        Path of the coefficient file. Default maps the coefficients of
+        ``hwm123114.bin`` in :data:`pyhwm2014.HWMPATH` from the
+        :func:`pyhwm2014.bundle.load_bundle` cache.
+    """
+    if filename is None:
+        from .bundle import load_bundle
+
+        return load_bundle().qwm
+    return QWMCoefficients(filename)
+
+
+@functools.cache
+def _alf_coefficients(nmax: int, mmax: int) -> tuple[np.ndarray, ...]:
+    """Static normalization coefficients of alfbasis (Fortran ``initalf``)."""
+    anm = np.zeros((nmax + 1, mmax + 1))
+    bnm = np.zeros((nmax + 1, mmax + 1))
+    dnm = np.zeros((nmax + 1, mmax + 1))
+    cm = np.zeros(mmax + 1)
+    en = np.zeros(nmax + 1)
+    for n in range(1, nmax + 1):
+        en[n] = np.sqrt(n * (n + 1.0))
+        anm[n, 0] = np.sqrt((2 * n - 1.0) * (2 * n + 1)) / n
+        bnm[n, 0] = np.sqrt((2 * n + 1.0) * (n - 1) * (n - 1) / (2 * n - 3)) / n
+    for m in range(1, mmax + 1):
+        cm[m] = np.sqrt((2 * m + 1.0) / (2 * m * m * (m + 1)))
+        for n in range(m + 1, nmax + 1):
+            anm[n, m] = np.sqrt(
+                (2 * n - 1.0) * (2 * n + 1) * (n - 1) / ((n - m) * (n + m) * (n + 1))
+            )
+            bnm[n, m] = np.sqrt(
+                (2 * n + 1.0)
+                * (n + m - 1)
+                * (n - m - 1)
+                * (n - 2)
+                * (n - 1)
+                / ((n - m) * (n + m) * (2 * n - 3) * n * (n + 1))
+            )
+            dnm[n, m] = np.sqrt(
+                (n - m) * (n + m) * (2 * n + 1.0) * (n - 1) / ((2 * n - 1) * (n + 1))
+            )
+    return anm, bnm, dnm, cm, en
+
+
+def alfbasis(theta: ArrayLike, nmax: int, mmax: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vector spherical harmonic basis functions at many colatitudes.
+
+    Vectorized port of the Fortran ``alf.alfbasis``.
+
+    Parameters
+    ----------
+    theta : array_like
+        Colatitudes in radians, shape ``(N,)``.
+    nmax, mmax : int
+        Maximum degree and order.
+
+    Returns
+    -------
+    P, V, W : ndarray
+        Arrays of shape ``(N, nmax + 1, mmax + 1)``.
+    """
+    anm, bnm, dnm, cm, en = _alf_coefficients(nmax, mmax)
+    theta = np.asarray(theta, dtype=np.float64)
+    x = np.cos(theta)
+    y = np.sin(theta)
+    P = np.zeros(theta.shape + (nmax + 1, mmax + 1))
+    V = np.zeros_like(P)
+    W = np.zeros_like(P)
+
+    P[:, 0, 0] = 0.70710678118654746
+    for m in range(1, mmax + 1):
+        W[:, m, m] = cm[m] * P[:, m - 1, m - 1]
+        P[:, m, m] = y * en[m] * W[:, m, m]
+        for n in range(m + 1, nmax + 1):
+            W[:, n, m] = anm[n, m] * x * W[:, n - 1, m] - bnm[n, m] * W[:, n - 2, m]
+            P[:, n, m] = y * en[n] * W[:, n, m]
+            V[:, n, m] = n * x * W[:, n, m] - dnm[n, m] * W[:, n - 1, m]
+        # V(n,m) above uses the unscaled W, V(m,m) the scaled one
+        W[:, m:, m] *= m
+        V[:, m, m] = x * W[:, m, m]
+    P[:, 1, 0] = anm[1, 0] * x * P[:, 0, 0]
+    V[:, 1, 0] = -P[:, 1, 1]
+    for n in range(2, nmax + 1):
+        P[:, n, 0] = anm[n, 0] * x * P[:, n - 1, 0] - bnm[n, 0] * P[:, n - 2, 0]
+        V[:, n, 0] = -P[:, n, 1]
+    return P, V, W
+
+
+def _basisfuns(span: np.ndarray, u: np.ndarray, knots: np.ndarray, p: int) -> np.ndarray:
+    """The p + 1 B-splines of order p that are nonzero on each knot span.
+
+    de Boor's triangular recurrence in array form, shape ``(N, p + 1)``;
+    column j holds B-spline ``span - p + j`` at u.
+    """
+    N = np.zeros((u.size, p + 1))
+    N[:, 0] = 1.0
+    left = np.empty((u.size, p + 1))
+    right = np.empty((u.size, p + 1))
+    for j in range(1, p + 1):
+        left[:, j] = u - knots[span + 1 - j]
+        right[:, j] = knots[span + j] - u
+        saved = np.zeros(u.size)
+        for r in range(j):
+            temp = N[:, r] / (right[:, r + 1] + left[:, j - r])
+            N[:, r] = saved + right[:, r + 1] * temp
+            saved = left[:, j - r] * temp
+        N[:, j] = saved
+    return N
+
+
+def _vertwght(alt: np.ndarray, qwm: QWMCoefficients) -> tuple[np.ndarray, np.ndarray]:
+    """Uncached :func:`vertwght` of float64 altitudes."""
+    p, vnode = qwm.p, qwm.vnode
+    nspan = qwm.nnode - p - 1
+
+    # findspan: binary search for the knot span of every altitude
+    span = np.clip(np.searchsorted(vnode, alt, side="right") - 1, p, nspan)
+    iz = np.minimum(span - p, 26)
+
+    # B-splines iz to iz + 4, zero outside the nonzero window of the span
+    local = _basisfuns(span, alt, vnode, p)
+    offset = iz[:, None] + np.arange(5) - (span - p)[:, None]
+    inside = (offset >= 0) & (offset <= p) & (alt < vnode[-1])[:, None]
+    basis = np.where(inside, np.take_along_axis(local, np.clip(offset, 0, p), axis=1), 0.0)
+    basis[(iz[:, None] + np.arange(5) == nspan) & (alt == vnode[-1])[:, None]] = 1.0
+
+    wght = basis[:, :4].copy()
+
+    # The top levels blend the B-splines into an exponential above alttns
+    top = iz == 26
+    if np.any(top):
+        a = alt[top]
+        decay = a > qwm.alttns
+        we = np.zeros((a.size, 5))
+        we[:, :3] = np.where(decay[:, None], 0.0, basis[top, 2:])
+        we[:, 3] = np.where(decay, np.exp(-(a - qwm.alttns) / H), 0.0)
+        we[:, 4] = np.where(decay, 1.0, 0.0)
+        # Summed in the order of the Fortran dot_product
+        wght[top, 2] = functools.reduce(np.add, (we[:, k] * qwm.e1[k] for k in range(5)))
+        wght[top, 3] = functools.reduce(np.add, (we[:, k] * qwm.e2[k] for k in range(5)))
+    return wght, iz
+
+
+@functools.lru_cache(maxsize=64)
+def _vertwght_cached(key: bytes, qwm: QWMCoefficients) -> tuple[np.ndarray, np.ndarray]:
+    """:func:`_vertwght` of the altitudes whose float64 bytes are ``key``."""
+    wght, iz = _vertwght(np.frombuffer(key, dtype=np.float64), qwm)
+    wght.flags.writeable = False
+    iz.flags.writeable = False
+    return wght, iz
+
+
+def vertwght(
+    alt: ArrayLike, qwm: QWMCoefficients | None = None, cache: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vertical weights of the four model levels around each altitude.
+
+    Vectorized port of the Fortran ``vertwght``: the knot spans of all
+    altitudes are found with one binary search over ``vnode`` and only the
+    B-splines that are nonzero on them are evaluated.
+
+    Parameters
+    ----------
+    alt : array_like
+        Altitudes in kilometers, shape ``(N,)``.
+    qwm : QWMCoefficients, optional
+        Model coefficients. Default is :func:`load_qwm`.
+    cache : bool, optional
+        Evaluate the distinct altitudes only and keep their weights in a
+        least-recently-used cache (64 entries) keyed by those altitudes, so
+        repeated calls on a fixed altitude grid, such as the chunks of a
+        map with constant ``altbins``, skip the recurrence. Default is False.
+
+    Returns
+    -------
+    wght : ndarray
+        ``(N, 4)`` weights of levels ``iz`` to ``iz + 3``.
+    iz : ndarray
+        ``(N,)`` index of the lowest level.
+    """
+    qwm = qwm or load_qwm()
+    alt = np.asarray(alt, dtype=np.float64).ravel()
+    if not cache:
+        return _vertwght(alt, qwm)
+
+    grid, inverse = np.unique(alt, return_inverse=True)
+    wght, iz = _vertwght_cached(grid.tobytes(), qwm)
+    return wght[inverse], iz[inverse]
+
+
+@functools.cache
+def _basis_recipe(order: tuple[int, ...], maxn: int, maxm: int, maxl: int, maxs: int) -> tuple:
+    """Describe every column of ``bz`` as ``sign * lat * fourier * season``.
+
+    The factors index the per-point tables built in :func:`hwmqt`:
+    ``lat`` = [sin(n theta) | gvbar | gwbar], ``fourier`` = [1 | cos(m lon) |
+    sin(m lon) | cos(l tau) | sin(l tau)] and ``season`` = [1 | cos(s d) |
+    sin(s d)], following the loops of the Fortran ``hwmqt``.
+    """
+    amaxs, amaxn, pmaxm, pmaxs, pmaxn, tmaxl, tmaxs, tmaxn = order
+    nalf = (maxn + 1) * (maxm + 1)
+
+    def sinn(n: int) -> int:
+        return n - 1
+
+    def gv(n: int, m: int) -> int:
+        return maxn + n * (maxm + 1) + m
+
+    def gw(n: int, m: int) -> int:
+        return maxn + nalf + n * (maxm + 1) + m
+
+    def cos_s(s: int) -> int:
+        return s
+
+    def sin_s(s: int) -> int:
+        return maxs + s
+
+    columns: list[tuple[float, int, int, int]] = []
+    for n in range(1, amaxn + 1):
+        columns += [(-1.0, sinn(n), 0, 0), (1.0, sinn(n), 0, 0)]
+    for s in range(1, amaxs + 1):
+        for n in range(1, amaxn + 1):
+            columns += [
+                (-1.0, sinn(n), 0, cos_s(s)),
+                (1.0, sinn(n), 0, sin_s(s)),
+                (1.0, sinn(n), 0, cos_s(s)),
+                (-1.0, sinn(n), 0, sin_s(s)),
+            ]
+
+    # stationary waves (fourier offset 0) and migrating tides (offset 2*maxm)
+    for maxm_, maxs_, maxn_, offset, mmax_ in (
+        (pmaxm, pmaxs, pmaxn, 0, maxm),
+        (tmaxl, tmaxs, tmaxn, 2 * maxm, maxl),
+    ):
+        for m in range(1, maxm_ + 1):
+            cos_m, sin_m = offset + m, offset + mmax_ + m
+            for n in range(m, maxn_ + 1):
+                columns += [
+                    (-1.0, gv(n, m), cos_m, 0),
+                    (1.0, gv(n, m), sin_m, 0),
+                    (-1.0, gw(n, m), sin_m, 0),
+                    (-1.0, gw(n, m), cos_m, 0),
+                ]
+            for s in range(1, maxs_ + 1):
+                for n in range(m, maxn_ + 1):
+                    columns += [
+                        (-1.0, gv(n, m), cos_m, cos_s(s)),
+                        (1.0, gv(n, m), sin_m, cos_s(s)),
+                        (-1.0, gw(n, m), sin_m, cos_s(s)),
+                        (-1.0, gw(n, m), cos_m, cos_s(s)),
+                        (-1.0, gv(n, m), cos_m, sin_s(s)),
+                        (1.0, gv(n, m), sin_m, sin_s(s)),
+                        (-1.0, gw(n, m), sin_m, sin_s(s)),
+                        (-1.0, gw(n, m), cos_m, sin_s(s)),
+                    ]
+
+    sign, lat, fourier, season = (np.array(v) for v in zip(*columns, strict=True))
+    return sign, lat.astype(np.intp), fourier.astype(np.intp), season.astype(np.intp)
+
+
+def _hwmqt_chunk(
+    qwm: QWMCoefficients,
+    doy: np.ndarray,
+    sec: np.ndarray,
+    alt: np.ndarray,
+    glat: np.ndarray,
+    glon: np.ndarray,
+    altcache: bool = False,
+    wind: str = "both",
+) -> np.ndarray:
+    """Quiet-time winds of one chunk of points, shape ``(N, 2)`` float64."""
+    n = doy.size
+    maxs, maxm, maxl, maxn = qwm.maxs, qwm.maxm, qwm.maxl, qwm.maxn
+
+    theta = (90.0 - glat) * DEG2RAD
+    _, gvbar, gwbar = alfbasis(theta, maxn, maxm)
+    lat = np.concatenate(
+        [
+            np.sin(np.arange(1, maxn + 1) * theta[:, None]),
+            gvbar.reshape(n, -1),
+            gwbar.reshape(n, -1),
+        ],
+        axis=1,
+    )
+
+    lon = glon * DEG2RAD
+    tau = np.fmod(sec / 3600.0 + glon / 15.0 + 48.0, 24.0) * TWO_PI / 24.0
+    mlon = np.arange(1, maxm + 1) * lon[:, None]
+    ltau = np.arange(1, maxl + 1) * tau[:, None]
+    fourier = np.concatenate(
+        [np.ones((n, 1)), np.cos(mlon), np.sin(mlon), np.cos(ltau), np.sin(ltau)], axis=1
+    )
+
+    sday = np.arange(1, maxs + 1) * (doy * TWO_PI / 365.25)[:, None]
+    season = np.concatenate([np.ones((n, 1)), np.cos(sday), np.sin(sday)], axis=1)
+
+    wght, iz = vertwght(alt, qwm, cache=altcache)
+    nlevel = qwm.mparm.shape[1]
+    proj = np.zeros((n, 2, nlevel))
+    # proj[:, 0] projects onto mparm (zonal), proj[:, 1] onto tparm
+    parms = [k for k, name in enumerate(("zonal", "meridional")) if wind in (name, "both")]
+
+    # Levels with the same spectral content share one basis matrix
+    signatures, groups = np.unique(qwm.order, axis=0, return_inverse=True)
+    for k, signature in enumerate(signatures):
+        levels = np.flatnonzero(groups.ravel() == k)
+        signature = tuple(int(v) for v in signature)
+        sign, ilat, ifou, isea = _basis_recipe(signature, maxn, maxm, maxl, maxs)
+        bz = sign * lat[:, ilat] * fourier[:, ifou] * season[:, isea]
+        c = sign.size
+        coeffs = np.concatenate([(qwm.mparm, qwm.tparm)[k][:c, levels] for k in parms], axis=1)
+        uv = bz @ coeffs
+        for j, k in enumerate(parms):
+            proj[:, k, levels] = uv[:, j * levels.size : (j + 1) * levels.size]
+
+    levels = iz[:, None] + np.arange(4)
+    rows = np.arange(n)[:, None]
+    u = np.sum(wght * proj[rows, 0, levels], axis=1)
+    v = np.sum(wght * proj[rows, 1, levels], axis=1)
+    return np.stack([v, u], axis=-1)
+
+
+def hwmqt(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    qwm: QWMCoefficients | None = None,
+    chunksize: int = 4096,
+    altcache: bool = False,
+    wind: str = "both",
+) -> np.ndarray:
+    """Evaluate the quiet-time model at many points with NumPy.
+
+    Matches the Fortran ``hwmqt`` to float32 precision. The inputs are
+    rounded to float32 first, as they are when passed to Fortran.
+
+    Parameters
+    ----------
+    iyd : array_like of int
+        Year and day as YYDDD (only the day of year is used).
+    sec : array_like of float
+        Universal time in seconds.
+    alt : array_like of float
+        Altitude in kilometers (must be non-negative).
+    glat, glon : array_like of float
+        Geodetic latitude and longitude in degrees.
+    qwm : QWMCoefficients, optional
+        Model coefficients. Default is :func:`load_qwm`.
+    chunksize : int, optional
+        Number of points per basis matrix (memory grows as
+        ``chunksize * nbf``). Default is 4096.
+    altcache : bool, optional
+        Cache the vertical weights of each chunk's altitudes, see
+        :func:`vertwght`. Worthwhile when many calls share a fixed altitude
+        grid. Default is False.
+    wind : {"both", "zonal", "meridional"}, optional
+        Compute only one wind component, like the ``component`` flags of the
+        Fortran model; the other one is returned as zero. Default is
+        ``"both"``.
+
+    Returns
+    -------
+    ndarray
+        float32 array of shape ``broadcast_shape + (2,)`` with the meridional
+        (``[..., 0]``) and zonal (``[..., 1]``) winds in m/s.
+    """
+    if wind not in ("both", "zonal", "meridional"):
+        raise ValueError(f"wind must be 'both', 'zonal' or 'meridional', got {wind!r}")
+    qwm = qwm or load_qwm()
+    arrays = np.broadcast_arrays(iyd, sec, alt, glat, glon)
+    shape = arrays[0].shape
+    # fmod keeps the sign of iyd like the Fortran mod
+    doy = np.fmod(arrays[0].ravel().astype(np.int64), 1000).astype(np.float64)
+    sec_, alt_, glat_, glon_ = (a.ravel().astype(np.float32).astype(np.float64) for a in arrays[1:])
+
+    w = np.empty((doy.size, 2), dtype=np.float32)
+    for i in range(0, doy.size, chunksize):
+        s = slice(i, i + chunksize)
+        w[s] = _hwmqt_chunk(qwm, doy[s], sec_[s], alt_[s], glat_[s], glon_[s], altcache, wind)
+    return w.reshape(shape + (2,))
+
+
+# ---------------------------------------------------------------------------
+# Disturbance winds (dwm07)
+# ---------------------------------------------------------------------------
+
+# dwm07 defines pi as a single precision literal, gd2qd in double precision
+DWM_DEG2RAD = float(np.float32(3.1415926535897932)) / 180.0
+GD2QD_DEG2RAD = np.pi / 180.0
+SINEPS = 0.39781868
+TALT = np.float32(125.0)  # center (km) of the dwm07 height profile
+
+# fmt: off
+APGRID = np.array(
+    [0, 2, 3, 4, 5, 6, 7, 9, 12, 15, 18, 22, 27, 32, 39, 48, 56, 67, 80, 94, 111, 132, 154, 179,
+     207, 236, 300, 400],
+    dtype=np.float32,
+)
+# fmt: on
+KPGRID = np.arange(28, dtype=np.float32) / np.float32(3.0)
+KPNODE = np.array([-10.0, -8.0, 0.0, 2.0, 5.0, 8.0, 18.0, 20.0], dtype=np.float32)
+LATWGT_COEFF = np.array(
+    [65.7633, -4.60256, -3.53915, -1.99971, -0.752193, 0.972388], dtype=np.float32
+)
+LATWGT_DEG2RAD = np.float32(float(np.float32(3.141592653590)) / 180.0)
+NOTERM = 999  # termarr entry of a factor absent from a coupled term
+
+
+def _read_records(filename: str | Path | bytes) -> list[bytes]:
+    """Split a Fortran sequential unformatted file into its records."""
+    raw = _read_bytes(filename)
+    records, offset = [], 0
+    while offset < len(raw):
+        size = int(np.frombuffer(raw, dtype=np.int32, count=1, offset=offset)[0])
+        records.append(raw[offset + 4 : offset + 4 + size])
+        offset += size + 8
+    return records
+
+
+class GD2QDCoefficients:
+    """Quasi-dipole coordinate coefficients read from ``gd2qd.dat``.
+
+    Parameters
+    ----------
+    filename : str, Path or bytes
+        Path of the coefficient file, or its contents.
+
+    Attributes
+    ----------
+    nmax, mmax, nterm : int
+        Degree, order and number of terms of the spherical harmonic expansion.
+    epoch, alt : float
+        Epoch and altitude (km) of the expansion.
+    coeff : ndarray
+        ``(nterm, 3)`` coefficients of the x, y and z coordinates.
+    normadj : ndarray
+        Adjustment of the gradient normalization, ``sqrt(n (n + 1))``.
+    """
+
+    def __init__(self, filename: str | Path | bytes) -> None:
+        header, coeff = _read_records(filename)
+        self.nmax, self.mmax, self.nterm = (int(v) for v in np.frombuffer(header, np.int32, 3))
+        self.epoch, self.alt = (float(v) for v in np.frombuffer(header, np.float32, 2, 12))
+        self.coeff = np.frombuffer(coeff, dtype=np.float64).reshape(3, self.nterm).T.copy()
+        n = np.arange(self.nmax + 1)
+        self.normadj = np.sqrt(n * (n + 1.0))
+
+
+class DWMCoefficients:
+    """Disturbance wind coefficients read from ``dwm07b104i.dat``.
+
+    Parameters
+    ----------
+    filename : str, Path or bytes
+        Path of the coefficient file, or its contents.
+
+    Attributes
+    ----------
+    nterm, nmax, mmax : int
+        Number of coupled terms, and maximum degree and order of the VSH.
+    termarr : ndarray
+        ``(3, nterm)`` VSH, Kp and latitude weight factors of each term
+        (999 where the factor is absent).
+    coeff : ndarray
+        float32 coefficients of the coupled terms.
+    twidth : numpy.float32
+        Transition width of the high-latitude mask and height profile.
+    """
+
+    def __init__(self, filename: str | Path | bytes) -> None:
+        header, termarr, coeff, twidth = _read_records(filename)
+        self.nterm, self.mmax, self.nmax = (int(v) for v in np.frombuffer(header, np.int32, 3))
+        self.termarr = np.frombuffer(termarr, dtype=np.int32).reshape(self.nterm, 3).T.copy()
+        self.coeff = np.frombuffer(coeff, dtype=np.float32).copy()
+        self.twidth = np.frombuffer(twidth, dtype=np.float32)[0]
+
+
+@functools.cache
+def load_gd2qd(filename: str | None = None) -> GD2QDCoefficients:
+    """Return the (cached) quasi-dipole coefficients of ``gd2qd.dat``.
+
+    Like :func:`load_qwm`, the default coefficients come from the bundle.
+    """
+    if filename is None:
+        from .bundle import load_bundle
+
+        return load_bundle().gd2qd
+    return GD2QDCoefficients(filename)
+
+
+@functools.cache
+def load_dwm(filename: str | None = None) -> DWMCoefficients:
+    """Return the (cached) disturbance wind coefficients of ``dwm07b104i.dat``.
+
+    Like :func:`load_qwm`, the default coefficients come from the bundle.
+    """
+    if filename is None:
+        from .bundle import load_bundle
+
+        return load_bundle().dwm
+    return DWMCoefficients(filename)
+
+
+def _harmonics(A: np.ndarray, phi: np.ndarray, gradphi: bool = False) -> np.ndarray:
+    """Spherical harmonic terms in the order of ``gd2qd``, shape ``(N, nterm)``.
+
+    Columns are ``A(n, 0)`` for n = 0..nmax followed by ``A(n, m) cos(m phi)``,
+    ``A(n, m) sin(m phi)`` pairs for m = 1..mmax, n = m..nmax. With
+    ``gradphi`` the pairs are ``-A sin``, ``A cos`` and the m = 0 terms are 0.
+    """
+    n = phi.size
+    mmax = A.shape[2] - 1
+    columns = [np.zeros_like(A[:, :, 0]) if gradphi else A[:, :, 0]]
+    for m in range(1, mmax + 1):
+        cosmphi = np.cos(m * phi)[:, None]
+        sinmphi = np.sin(m * phi)[:, None]
+        if gradphi:
+            pair = (-A[:, m:, m] * sinmphi, A[:, m:, m] * cosmphi)
+        else:
+            pair = (A[:, m:, m] * cosmphi, A[:, m:, m] * sinmphi)
+        columns.append(np.stack(pair, axis=2).reshape(n, -1))
+    return np.concatenate(columns, axis=1)
+
+
+def gd2qd(
+    glat: ArrayLike, glon: ArrayLike, gd: GD2QDCoefficients | None = None
+) -> tuple[np.ndarray, ...]:
+    """Convert geodetic to quasi-dipole coordinates.
+
+    Vectorized port of the Fortran ``gd2qd``.
+
+    Parameters
+    ----------
+    glat, glon : array_like
+        1-D geodetic latitudes and longitudes in degrees.
+    gd : GD2QDCoefficients, optional
+        Expansion coefficients. Default is :func:`load_gd2qd`.
+
+    Returns
+    -------
+    qlat, qlon, f1e, f1n, f2e, f2n : ndarray
+        float32 quasi-dipole latitude and longitude (degrees) and the
+        components of the base vectors f1 and f2.
+    """
+    gd = gd or load_gd2qd()
+    glat = np.asarray(glat, dtype=np.float32).astype(np.float64)
+    phi = np.asarray(glon, dtype=np.float32).astype(np.float64) * GD2QD_DEG2RAD
+
+    P, V, W = alfbasis((90.0 - glat) * GD2QD_DEG2RAD, gd.nmax, gd.mmax)
+    normadj = gd.normadj[:, None]
+    x, y, z = (_harmonics(P, phi) @ gd.coeff).T
+    xgt, ygt, zgt = (_harmonics(V * normadj, phi) @ gd.coeff).T
+    xgp, ygp, zgp = (_harmonics(W * normadj, phi, gradphi=True) @ gd.coeff).T
+
+    qlonrad = np.arctan2(y, x)
+    cosqlon = np.cos(qlonrad)
+    sinqlon = np.sin(qlonrad)
+    cosqlat = x * cosqlon + y * sinqlon
+
+    return tuple(
+        v.astype(np.float32)
+        for v in (
+            np.arctan2(z, cosqlat) / GD2QD_DEG2RAD,
+            qlonrad / GD2QD_DEG2RAD,
+            -zgt * cosqlat + (xgt * cosqlon + ygt * sinqlon) * z,
+            -zgp * cosqlat + (xgp * cosqlon + ygp * sinqlon) * z,
+            ygt * cosqlon - xgt * sinqlon,
+            ygp * cosqlon - xgp * sinqlon,
+        )
+    )
+
+
+def mltcalc(
+    qlat: ArrayLike,
+    qlon: ArrayLike,
+    day: ArrayLike,
+    ut: ArrayLike,
+    gd: GD2QDCoefficients | None = None,
+) -> np.ndarray:
+    """Quasi-dipole magnetic local time (hours), low precision.
+
+    Vectorized port of the Fortran ``mltcalc``.
+
+    Parameters
+    ----------
+    qlat, qlon : array_like
+        Quasi-dipole latitude and longitude in degrees (``qlat`` is unused).
+    day : array_like
+        Day of year.
+    ut : array_like
+        Universal time in hours.
+    gd : GD2QDCoefficients, optional
+        Expansion coefficients. Default is :func:`load_gd2qd`.
+
+    Returns
+    -------
+    ndarray
+        float32 magnetic local time.
+    """
+    gd = gd or load_gd2qd()
+    qlon, day, ut = (np.asarray(a, dtype=np.float32) for a in (qlon, day, ut))
+    day64 = day.astype(np.float64)
+    ut64 = ut.astype(np.float64)
+
+    # geographic coordinates of the anti-sunward direction
+    asunglat = np.sin((day64 + ut64 / 24.0 - 80.0) * GD2QD_DEG2RAD) * SINEPS
+    asunglat = -np.arcsin(asunglat) / GD2QD_DEG2RAD
+    asunglon = -(ut64 * 15.0)
+
+    P, _, _ = alfbasis((90.0 - asunglat) * GD2QD_DEG2RAD, gd.nmax, gd.mmax)
+    x, y = (_harmonics(P, asunglon * GD2QD_DEG2RAD) @ gd.coeff[:, :2]).T
+    asunqlon = (np.arctan2(y, x) / GD2QD_DEG2RAD).astype(np.float32)
+    mlt: np.ndarray = (qlon - asunqlon) / np.float32(15.0)
+    return mlt
+
+
+def ap2kp(ap: ArrayLike) -> np.ndarray:
+    """Convert ap to Kp by linear interpolation of the standard table."""
+    ap = np.clip(np.asarray(ap, dtype=np.float32), 0.0, 400.0).astype(np.float32)
+    i = np.maximum(np.searchsorted(APGRID, ap, side="left"), 1)
+    lo = i - 1
+    kp = KPGRID[lo] + (ap - APGRID[lo]) / (np.float32(3.0) * (APGRID[i] - APGRID[lo]))
+    kp = np.where(ap == APGRID[i], KPGRID[i], kp)
+    return kp.astype(np.float32)
+
+
+def kpspl3(kp: ArrayLike) -> np.ndarray:
+    """Cubic B-spline terms of Kp, shape ``(N, 3)`` float32."""
+    x = np.clip(np.asarray(kp, dtype=np.float32), 0.0, 8.0).astype(np.float32)[:, None]
+    node = KPNODE
+    spl = ((node[:-1] <= x) & (x < node[1:])).astype(np.float32)
+    for j in (2, 3):
+        for i in range(8 - j):
+            left = spl[:, i] * (x[:, 0] - node[i]) / (node[i + j - 1] - node[i])
+            right = spl[:, i + 1] * (node[i + j] - x[:, 0]) / (node[i + j] - node[i + 1])
+            spl[:, i] = left + right
+    return np.stack([spl[:, 0] + spl[:, 1], spl[:, 2], spl[:, 3] + spl[:, 4]], axis=1)
+
+
+def latwgt2(mlat: ArrayLike, mlt: ArrayLike, kp: ArrayLike, twidth: float) -> np.ndarray:
+    """High-latitude weight of the disturbance winds, float32."""
+    mlat, mlt, kp = (np.asarray(a, dtype=np.float32) for a in (mlat, mlt, kp))
+    c = LATWGT_COEFF
+    mltrad = mlt * np.float32(15.0) * LATWGT_DEG2RAD
+    sinmlt = np.sin(mltrad)
+    cosmlt = np.cos(mltrad)
+    kp = np.clip(kp, 0.0, 8.0).astype(np.float32)
+    tlat = c[0] + c[1] * cosmlt + c[2] * sinmlt + kp * (c[3] + c[4] * cosmlt + c[5] * sinmlt)
+    weight: np.ndarray = np.float32(1.0) / (1 + np.exp(-(np.abs(mlat) - tlat) / np.float32(twidth)))
+    return weight
+
+
+def dwm07b(
+    mlt: ArrayLike, mlat: ArrayLike, kp: ArrayLike, dwm: DWMCoefficients | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Disturbance winds in quasi-dipole coordinates.
+
+    Vectorized port of the Fortran ``dwm07b``: the coupled terms of all
+    points form an ``(N, nterm)`` matrix that is multiplied by ``coeff``.
+
+    Parameters
+    ----------
+    mlt : array_like
+        Magnetic local time in hours.
+    mlat : array_like
+        Quasi-dipole latitude in degrees.
+    kp : array_like
+        3-hour Kp index.
+    dwm : DWMCoefficients, optional
+        Model coefficients. Default is :func:`load_dwm`.
+
+    Returns
+    -------
+    mmpwind, mzpwind : ndarray
+        float32 meridional (+north) and zonal (+east) winds in m/s.
+    """
+    dwm = dwm or load_dwm()
+    mlt, mlat, kp = (np.asarray(a, dtype=np.float32) for a in (mlt, mlat, kp))
+    nmax, mmax = dwm.nmax, dwm.mmax
+
+    # vector spherical harmonic terms in latitude and MLT
+    _, V, W = alfbasis((90.0 - mlat.astype(np.float64)) * DWM_DEG2RAD, nmax, mmax)
+    phi = mlt.astype(np.float64) * DWM_DEG2RAD * 15.0
+    cos_m = [np.cos(m * phi) for m in range(mmax + 1)]
+    sin_m = [np.sin(m * phi) for m in range(mmax + 1)]
+    vsh0, vsh1 = [], []
+    for n in range(1, nmax + 1):
+        a = -(V[:, n, 0] * cos_m[0]).astype(np.float32)
+        b = (W[:, n, 0] * cos_m[0]).astype(np.float32)
+        vsh0 += [a, b]
+        vsh1 += [-b, a]
+        for m in range(1, min(mmax, n) + 1):
+            t0 = -(V[:, n, m] * cos_m[m]).astype(np.float32)
+            t1 = (V[:, n, m] * sin_m[m]).astype(np.float32)
+            t2 = (W[:, n, m] * sin_m[m]).astype(np.float32)
+            t3 = (W[:, n, m] * cos_m[m]).astype(np.float32)
+            vsh0 += [t0, t1, t2, t3]
+            vsh1 += [-t2, -t3, t0, t1]
+
+    # Absent factors index a trailing column of ones
+    ones = np.ones_like(mlt)
+    vsh = np.stack([np.stack(vsh0 + [ones], axis=1), np.stack(vsh1 + [ones], axis=1)], axis=1)
+    kpterms = np.concatenate([kpspl3(kp), ones[:, None]], axis=1)
+    ivsh, ikp, ilat = dwm.termarr
+    ivsh = np.where(ivsh == NOTERM, vsh.shape[2] - 1, ivsh)
+    ikp = np.where(ikp == NOTERM, kpterms.shape[1] - 1, ikp)
+    latwgt = np.where(ilat == NOTERM, np.float32(1.0), latwgt2(mlat, mlt, kp, dwm.twidth)[:, None])
+
+    termval = vsh[:, :, ivsh] * kpterms[:, None, ikp] * latwgt[:, None, :]
+    mmpwind, mzpwind = np.moveaxis(termval @ dwm.coeff, 1, 0)
+    return mmpwind, mzpwind
+
+
+def dwm07(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    ap: ArrayLike,
+    dwm: DWMCoefficients | None = None,
+    chunksize: int = 4096,
+    qdtable: Callable[..., tuple[np.ndarray, ...]] | None = None,
+    gd: GD2QDCoefficients | None = None,
+) -> np.ndarray:
+    """Evaluate the disturbance winds at many points with NumPy.
+
+    Matches the Fortran ``dwm07`` to float32 precision.
+
+    Parameters
+    ----------
+    iyd : array_like of int
+        Year and day as YYDDD (only the day of year is used).
+    sec : array_like of float
+        Universal time in seconds.
+    alt : array_like of float
+        Altitude in kilometers.
+    glat, glon : array_like of float
+        Geodetic latitude and longitude in degrees.
+    ap : array_like of float
+        Current 3-hour ap index.
+    dwm : DWMCoefficients, optional
+        Model coefficients. Default is :func:`load_dwm`.
+    chunksize : int, optional
+        Number of points per coupled-term matrix. Default is 4096.
+    qdtable : callable, optional
+        Replacement for :func:`gd2qd`, e.g. a
+        :class:`pyhwm2014.qdtable.GD2QDTable` to interpolate the
+        quasi-dipole coordinates instead of summing their expansion. Default
+        is the exact :func:`gd2qd`.
+    gd : GD2QDCoefficients, optional
+        Quasi-dipole coefficients of :func:`gd2qd` and :func:`mltcalc`.
+        Default is :func:`load_gd2qd`.
+
+    Returns
+    -------
+    ndarray
+        float32 array of shape ``broadcast_shape + (2,)`` with the meridional
+        (``[..., 0]``) and zonal (``[..., 1]``) disturbance winds in m/s.
+    """
+    dwm = dwm or load_dwm()
+    gd = gd or load_gd2qd()
+    qdtable = qdtable or functools.partial(gd2qd, gd=gd)
+    arrays = np.broadcast_arrays(iyd, sec, alt, glat, glon, ap)
+    shape = arrays[0].shape
+    day = np.fmod(arrays[0].ravel().astype(np.int64), 1000).astype(np.float32)
+    sec_, alt_, glat_, glon_, ap_ = (a.ravel().astype(np.float32) for a in arrays[1:])
+
+    dw = np.empty((day.size, 2), dtype=np.float32)
+    for i in range(0, day.size, chunksize):
+        s = slice(i, i + chunksize)
+        kp = ap2kp(ap_[s])
+        mlat, mlon, f1e, f1n, f2e, f2n = qdtable(glat_[s], glon_[s])
+        mlt = mltcalc(mlat, mlon, day[s], sec_[s] / np.float32(3600.0), gd)
+        mmpwind, mzpwind = dwm07b(mlt, mlat, kp, dwm)
+
+        # convert to geographic directions and apply the height profile
+        profile = 1 + np.exp(-(alt_[s] - TALT) / dwm.twidth)
+        dw[s, 0] = (f2n * mmpwind + f1n * mzpwind) / profile
+        dw[s, 1] = (f2e * mmpwind + f1e * mzpwind) / profile
+    return dw.reshape(shape + (2,))
+
+
+def hwm14(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    ap: ArrayLike = -1.0,
+    components: bool = False,
+    chunksize: int = 4096,
+    qdtable: Callable[..., tuple[np.ndarray, ...]] | None = None,
+    altcache: bool = False,
+    qwm: QWMCoefficients | None = None,
+    dwm: DWMCoefficients | None = None,
+    gd: GD2QDCoefficients | None = None,
+) -> np.ndarray | tuple[np.ndarray, ...]:
+    """Evaluate HWM14 (quiet plus disturbance winds) with NumPy.
+
+    The disturbance winds are only computed, and added, where ``ap >= 0``.
+
+    Parameters
+    ----------
+    iyd, sec, alt, glat, glon, ap : array_like
+        Model inputs, see :func:`pyhwm2014.evaluate`.
+    components : bool, optional
+        Return the ``(quiet, disturbance, total)`` winds. Default is False.
+    chunksize : int, optional
+        Number of points per basis matrix. Default is 4096.
+    qdtable : callable, optional
+        Quasi-dipole coordinate lookup passed to :func:`dwm07`.
+    altcache : bool, optional
+        Cache the vertical weights, see :func:`hwmqt`. Default is False.
+    qwm, dwm, gd : optional
+        Coefficients of :func:`hwmqt` and :func:`dwm07`. Default is the
+        :func:`load_qwm`, :func:`load_dwm` and :func:`load_gd2qd` ones.
+
+    Returns
+    -------
+    ndarray or tuple of ndarray
+        Same as :func:`pyhwm2014.evaluate`.
+    """
+    arrays = np.broadcast_arrays(iyd, sec, alt, glat, glon, ap)
+    shape = arrays[0].shape
+    iyd_, sec_, alt_, glat_, glon_ = (a.ravel() for a in arrays[:5])
+    ap_ = arrays[5].ravel().astype(np.float32)
+
+    quiet = hwmqt(iyd_, sec_, alt_, glat_, glon_, qwm, chunksize=chunksize, altcache=altcache)
+    disturbance = np.zeros_like(quiet)
+    active = ap_ >= 0
+    if np.any(active):
+        disturbance[active] = dwm07(
+            iyd_[active],
+            sec_[active],
+            alt_[active],
+            glat_[active],
+            glon_[active],
+            ap_[active],
+            dwm=dwm,
+            chunksize=chunksize,
+            qdtable=qdtable,
+            gd=gd,
+        )
+    total = np.where(active[:, None], quiet + disturbance, quiet)
+
+    if components:
+        return tuple(w.reshape(shape + (2,)) for w in (quiet, disturbance, total))
+    return total.reshape(shape + (2,))
@@ -0,0 +1,284 @@
+"""Multi-process evaluation of HWM14 with shared-memory inputs and outputs."""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from types import TracebackType
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .batch import evaluate as _evaluate
+from .batch import init, set_num_threads
+
+# Forking a process that has started OpenMP or other threads can deadlock
+# the child, so workers are started from a clean server process instead.
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# ``(name, shape, dtype)`` of a shared memory block
+_Block = tuple[str, tuple[int, ...], str]
+
+# Shared memory blocks of the call a worker last served, and their arrays
+_blocks: dict[str, shared_memory.SharedMemory] = {}
+_shared: dict[str, np.ndarray] = {}
+
+# Pools used by evaluate without an explicit pool, one per worker count
+_pools: dict[int, "Pool"] = {}
+_pools_lock = threading.Lock()
+
+
+def _init_worker() -> None:
+    """Load the coefficients, once per worker process."""
+    init()
+    # The pool provides the parallelism; avoid nesting OpenMP threads.
+    set_num_threads(1)
+
+
+def _attach(iyd: _Block, inputs: _Block, out: _Block) -> None:
+    """Map the shared arrays of a call, unless they are already mapped.
+
+    A worker serves the chunks of one call after the other, so it keeps the
+    blocks of the last call it saw and only swaps them when a task of
+    another call arrives.
+    """
+    names = [iyd[0], inputs[0], out[0]]
+    if list(_blocks) == names:
+        return
+    # The arrays must go before their blocks can be closed.
+    _shared.clear()
+    for block in _blocks.values():
+        block.close()
+    _blocks.clear()
+    for key, (name, shape, dtype) in zip(("iyd", "inputs", "out"), (iyd, inputs, out), strict=True):
+        block = shared_memory.SharedMemory(name=name, track=False)
+        _blocks[name] = block
+        _shared[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _evaluate_chunk(blocks: tuple[_Block, ...], start: int, stop: int, components: bool) -> None:
+    """Evaluate points ``start:stop`` and write them into the shared output."""
+    _attach(*blocks)
+    iyd = _shared["iyd"][start:stop]
+    sec, alt, glat, glon, f107a, f107, ap = _shared["inputs"][:, start:stop]
+    result = _evaluate(iyd, sec, alt, glat, glon, f107a, f107, ap, components=components)
+    winds = result if components else (result,)
+    for k, w in enumerate(winds):
+        _shared["out"][k, start:stop] = w
+
+
+def _create(shape: tuple[int, ...], dtype: type) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Create a shared memory block holding an array of the given shape."""
+    nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+    block = shared_memory.SharedMemory(create=True, size=nbytes)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+class Pool:
+    """Worker processes that evaluate HWM14, kept alive between calls.
+
+    Each worker loads the coefficient files once, when it starts, and then
+    serves any number of :meth:`evaluate` calls, so repeated calls (e.g.
+    the batches of :func:`pyhwm2014.stream`) pay the start-up only once.
+    Use the pool as a context manager or call :meth:`close` to stop the
+    workers.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of worker processes. Default is ``os.cpu_count()``.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> with Pool(2) as pool:
+    ...     for day in range(1, 366, 30):
+    ...         w = pool.evaluate(23000 + day, 43200.0, 300.0, np.arange(-90.0, 91.0), 0.0)
+    """
+
+    def __init__(self, workers: int | None = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(_START_METHOD),
+            initializer=_init_worker,
+        )
+
+    def __enter__(self) -> "Pool":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        """Whether :meth:`close` was called."""
+        return self._executor is None
+
+    def close(self) -> None:
+        """Stop the worker processes; the pool cannot be used afterwards."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def evaluate(
+        self,
+        iyd: ArrayLike,
+        sec: ArrayLike,
+        alt: ArrayLike,
+        glat: ArrayLike,
+        glon: ArrayLike,
+        f107a: ArrayLike = -1.0,
+        f107: ArrayLike = -1.0,
+        ap: ArrayLike = -1.0,
+        components: bool = False,
+        chunksize: int | None = None,
+    ) -> np.ndarray | tuple[np.ndarray, ...]:
+        """Evaluate HWM14 at many points on the workers of this pool.
+
+        The broadcast inputs are copied once into shared memory and split
+        into contiguous chunks. The workers write their winds straight into
+        a shared output array, so only the names of the blocks and the chunk
+        bounds are pickled.
+
+        Parameters
+        ----------
+        iyd, sec, alt, glat, glon, f107a, f107, ap : array_like
+            Model inputs, see :func:`pyhwm2014.evaluate`.
+        components : bool, optional
+            Also return the quiet-time and disturbance winds. Default is
+            False.
+        chunksize : int, optional
+            Number of points per task. Default splits the points into four
+            chunks per worker.
+
+        Returns
+        -------
+        ndarray or tuple of ndarray
+            Same as :func:`pyhwm2014.evaluate`.
+
+        Raises
+        ------
+        RuntimeError
+            If the pool is closed.
+        """
+        if self._executor is None:
+            raise RuntimeError("the pool is closed")
+        arrays = np.broadcast_arrays(iyd, sec, alt, glat, glon, f107a, f107, ap)
+        shape = arrays[0].shape
+        n = arrays[0].size
+        nout = 3 if components else 1
+
+        if chunksize is None:
+            chunksize = -(-n // (4 * self.workers))
+        chunksize = max(int(chunksize), 1)
+
+        layout = (((n,), np.int32), ((7, n), np.float32), ((nout, n, 2), np.float32))
+        blocks, views = [], []
+        try:
+            for shape_, dtype in layout:
+                block, view = _create(shape_, dtype)
+                blocks.append(block)
+                views.append(view)
+            views[0][:] = arrays[0].ravel()
+            for k, a in enumerate(arrays[1:]):
+                views[1][k] = a.ravel()
+
+            names = tuple(
+                (b.name, v.shape, v.dtype.str) for b, v in zip(blocks, views, strict=True)
+            )
+            futures = [
+                self._executor.submit(
+                    _evaluate_chunk, names, i0, min(i0 + chunksize, n), components
+                )
+                for i0 in range(0, n, chunksize)
+            ]
+            for future in futures:
+                future.result()
+
+            result = tuple(w.reshape(shape + (2,)).copy() for w in views[2])
+        finally:
+            # The views must go before the blocks can be closed. Workers keep
+            # their mapping until a task of another call arrives.
+            views.clear()
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        return result if components else result[0]
+
+
+def _default_pool(workers: int | None) -> Pool:
+    """Return the shared pool with ``workers`` processes, starting it once."""
+    workers = workers or os.cpu_count() or 1
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None or pool.closed:
+            pool = _pools[workers] = Pool(workers)
+        return pool
+
+
+def close() -> None:
+    """Stop the pools started by :func:`evaluate`.
+
+    They are stopped at interpreter exit otherwise; the next call to
+    :func:`evaluate` starts a new pool.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close)
+
+
+def evaluate(
+    iyd: ArrayLike,
+    sec: ArrayLike,
+    alt: ArrayLike,
+    glat: ArrayLike,
+    glon: ArrayLike,
+    f107a: ArrayLike = -1.0,
+    f107: ArrayLike = -1.0,
+    ap: ArrayLike = -1.0,
+    components: bool = False,
+    workers: int | None = None,
+    chunksize: int | None = None,
+) -> np.ndarray | tuple[np.ndarray, ...]:
+    """Evaluate HWM14 at many points on a pool of worker processes.
+
+    The points are evaluated with :meth:`Pool.evaluate` on a pool that is
+    started by the first call with a given number of workers and reused by
+    later ones, so the workers load the coefficient files once per process
+    lifetime. :func:`close` stops it; use a :class:`Pool` to control the
+    lifetime of the workers instead.
+
+    Parameters
+    ----------
+    iyd, sec, alt, glat, glon, f107a, f107, ap : array_like
+        Model inputs, see :func:`pyhwm2014.evaluate`.
+    components : bool, optional
+        Also return the quiet-time and disturbance winds. Default is False.
+    workers : int, optional
+        Number of worker processes. Default is ``os.cpu_count()``.
+    chunksize : int, optional
+        Number of points per task. Default splits the points into four
+        chunks per worker.
+
+    Returns
+    -------
+    ndarray or tuple of ndarray
+        Same as :func:`pyhwm2014.evaluate`.
+    """
+    return _default_pool(workers).evaluate(
+        iyd, sec, alt, glat, glon, f107a, f107, ap, components=components, chunksize=chunksize
+    )
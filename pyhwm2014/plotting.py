@@ -38,9 +38,9 @@ class HWM14Plot:
     
     Attributes
     ----------
-    Uwind : list[float]
+    Uwind : ndarray
         Zonal wind component.
-    Vwind : list[float]
+    Vwind : ndarray
         Meridional wind component.
     """
 
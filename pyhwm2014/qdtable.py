@@ -0,0 +1,204 @@
+"""Precomputed quasi-dipole coordinate table with bicubic interpolation.
+
+``gd2qd`` sums a full spherical harmonic expansion for every new latitude and
+longitude. :class:`GD2QDTable` tabulates its outputs once on a regular
+geographic grid and looks them up with Catmull-Rom bicubic interpolation, so
+the coordinate step of the disturbance model costs the same for every point.
+The table is stored as a ``.npy`` file in a cache directory and memory-mapped
+on later loads.
+
+The quasi-dipole longitude is tabulated as its cosine and sine, which are
+smooth across the +-180 degree branch cut. The error grows towards the
+quasi-dipole poles, where the coordinates are singular. At the default
+0.5 degree spacing, measured against :func:`numpy_backend.gd2qd` on random
+points, it is below
+
+============  ========  ========  =========
+``|qlat|``    qlat      qlon      f1, f2
+============  ========  ========  =========
+< 80 deg      5e-5 deg  5e-4 deg  1e-5
+< 85 deg      2e-4 deg  5e-3 deg  1e-4
+< 88 deg      1e-3 deg  0.05 deg  1e-3
+============  ========  ========  =========
+
+and it scales with the cube of the spacing.
+"""
+
+import functools
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .data import HWMPATH, coefficient_hash
+from .numpy_backend import GD2QDCoefficients, gd2qd
+
+# Tabulated fields, in table order
+FIELDS: tuple[str, ...] = ("qlat", "cosqlon", "sinqlon", "f1e", "f1n", "f2e", "f2n")
+
+
+def cache_dir() -> Path:
+    """Return the directory of cached tables.
+
+    ``$PYHWM2014_CACHE`` if set, otherwise ``pyhwm2014`` in
+    ``$XDG_CACHE_HOME`` (default ``~/.cache``).
+    """
+    if "PYHWM2014_CACHE" in os.environ:
+        return Path(os.environ["PYHWM2014_CACHE"])
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "pyhwm2014"
+
+
+def _catmull_rom(t: np.ndarray) -> np.ndarray:
+    """Weights of the four neighbours at fractional position t, shape ``(N, 4)``."""
+    return np.stack(
+        [
+            ((-0.5 * t + 1.0) * t - 0.5) * t,
+            (1.5 * t - 2.5) * t * t + 1.0,
+            ((-1.5 * t + 2.0) * t + 0.5) * t,
+            (0.5 * t - 0.5) * t * t,
+        ],
+        axis=1,
+    )
+
+
+class GD2QDTable:
+    """Quasi-dipole coordinates tabulated on a geographic grid.
+
+    The grid spans latitudes -90 to 90 and longitudes -180 to 180 degrees
+    with spacing ``resolution``, plus one row and column of padding on every
+    side for the bicubic stencil.
+
+    Parameters
+    ----------
+    values : ndarray
+        ``(7, 180 / resolution + 3, 360 / resolution + 3)`` tabulated
+        :data:`FIELDS`, possibly a memory map.
+    resolution : float
+        Grid spacing in degrees.
+
+    Examples
+    --------
+    >>> table = GD2QDTable.build(resolution=2.0)
+    >>> qlat, qlon, f1e, f1n, f2e, f2n = table([-11.95], [-76.77])
+    """
+
+    def __init__(self, values: np.ndarray, resolution: float) -> None:
+        self.values = values
+        self.resolution = float(resolution)
+
+    @staticmethod
+    def grid(resolution: float) -> tuple[np.ndarray, np.ndarray]:
+        """Latitudes and longitudes of the padded grid for a spacing."""
+        nlat = int(round(180.0 / resolution))
+        nlon = int(round(360.0 / resolution))
+        glat = -90.0 + resolution * np.arange(-1, nlat + 2)
+        glon = -180.0 + resolution * np.arange(-1, nlon + 2)
+        return glat, glon
+
+    @classmethod
+    def build(cls, resolution: float = 0.5, gd: GD2QDCoefficients | None = None) -> "GD2QDTable":
+        """Tabulate ``gd2qd`` from the expansion coefficients.
+
+        Parameters
+        ----------
+        resolution : float, optional
+            Grid spacing in degrees; must divide 180. Default is 0.5.
+        gd : GD2QDCoefficients, optional
+            Expansion coefficients. Default is :func:`numpy_backend.load_gd2qd`.
+        """
+        if abs(180.0 / resolution - round(180.0 / resolution)) > 1e-9:
+            raise ValueError(f"resolution must divide 180 degrees, got {resolution}")
+        glat, glon = cls.grid(resolution)
+        values = np.empty((len(FIELDS), glat.size, glon.size))
+        # The expansion is smooth in colatitude, so rows beyond the poles are
+        # evaluated directly rather than mirrored.
+        for i, lat in enumerate(glat):
+            qlat, qlon, f1e, f1n, f2e, f2n = gd2qd(np.full(glon.size, lat), glon, gd)
+            qlon = np.radians(qlon.astype(np.float64))
+            values[:, i] = (qlat, np.cos(qlon), np.sin(qlon), f1e, f1n, f2e, f2n)
+        return cls(values, resolution)
+
+    def __call__(self, glat: ArrayLike, glon: ArrayLike) -> tuple[np.ndarray, ...]:
+        """Interpolate the quasi-dipole coordinates at many points.
+
+        Parameters
+        ----------
+        glat, glon : array_like
+            1-D geodetic latitudes and longitudes in degrees.
+
+        Returns
+        -------
+        qlat, qlon, f1e, f1n, f2e, f2n : ndarray
+            float32 outputs in the form of :func:`numpy_backend.gd2qd`.
+        """
+        glat = np.clip(np.asarray(glat, dtype=np.float32).astype(np.float64), -90.0, 90.0)
+        glon = np.asarray(glon, dtype=np.float32).astype(np.float64)
+        glon = np.mod(glon + 180.0, 360.0) - 180.0
+
+        nlat = self.values.shape[1] - 3
+        nlon = self.values.shape[2] - 3
+        y = (glat + 90.0) / self.resolution
+        x = (glon + 180.0) / self.resolution
+        i = np.clip(np.floor(y).astype(np.intp), 0, nlat - 1)
+        j = np.clip(np.floor(x).astype(np.intp), 0, nlon - 1)
+        wlat = _catmull_rom(y - i)
+        wlon = _catmull_rom(x - j)
+
+        # Padded row/column k + 1 holds grid node k, so the stencil of cell
+        # (i, j) is padded rows i..i+3 and columns j..j+3.
+        stencil = np.arange(4)
+        rows = (i[:, None] + stencil)[:, :, None]
+        cols = (j[:, None] + stencil)[:, None, :]
+        fields = np.einsum("fnab,na,nb->fn", self.values[:, rows, cols], wlat, wlon)
+
+        qlat, cosqlon, sinqlon, f1e, f1n, f2e, f2n = fields
+        qlon = np.degrees(np.arctan2(sinqlon, cosqlon))
+        return tuple(v.astype(np.float32) for v in (qlat, qlon, f1e, f1n, f2e, f2n))
+
+
+def load_table(
+    resolution: float = 0.5, directory: str | None = None, data_dir: str | Path | None = None
+) -> GD2QDTable:
+    """Return the quasi-dipole table, building and caching it on first use.
+
+    The table is saved as ``gd2qd-<resolution>-<hash>.npy`` in
+    :func:`cache_dir` (or ``directory``), keyed by a hash of ``gd2qd.dat``,
+    and memory-mapped read-only on later loads. If the directory is not
+    writable the table is only kept in memory.
+
+    Parameters
+    ----------
+    resolution : float, optional
+        Grid spacing in degrees. Default is 0.5.
+    directory : str, optional
+        Cache directory. Default is :func:`cache_dir`.
+    data_dir : str or Path, optional
+        Directory holding ``gd2qd.dat``. Default is :data:`pyhwm2014.HWMPATH`.
+    """
+    source = Path(HWMPATH if data_dir is None else data_dir) / "gd2qd.dat"
+    return _load_table(resolution, directory, source, coefficient_hash(source))
+
+
+@functools.cache
+def _load_table(resolution: float, directory: str | None, source: Path, digest: str) -> GD2QDTable:
+    """Load the table of ``source``, a file with the given digest."""
+    path = Path(directory) if directory else cache_dir()
+    path = path / f"gd2qd-{resolution:g}-{digest}.npy"
+    if path.exists():
+        return GD2QDTable(np.load(path, mmap_mode="r"), resolution)
+
+    table = GD2QDTable.build(resolution, GD2QDCoefficients(source))
+    # Write under a name private to this thread so that concurrent loads
+    # never see a partial file.
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            np.save(f, table.values)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        return table
+    return GD2QDTable(np.load(path, mmap_mode="r"), resolution)
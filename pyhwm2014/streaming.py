@@ -0,0 +1,225 @@
+"""Evaluation of unbounded streams of points in bounded memory."""
+
+import functools
+import queue
+import threading
+from collections.abc import Callable, Generator, Iterable, Iterator
+from typing import Any
+
+import numpy as np
+
+from .batch import evaluate, time_to_iyd
+
+# Columns read from record batches, with the names accepted for each; iyd and
+# sec may instead come from a datetime64 "time" column.
+COLUMNS: dict[str, tuple[str, ...]] = {
+    "iyd": ("iyd",),
+    "sec": ("sec",),
+    "alt": ("alt",),
+    "glat": ("glat", "lat"),
+    "glon": ("glon", "lon"),
+    "f107a": ("f107a",),
+    "f107": ("f107",),
+    "ap": ("ap",),
+}
+
+# Value of the optional columns when a chunk does not have them
+_DEFAULTS: dict[str, float] = {"f107a": -1.0, "f107": -1.0, "ap": -1.0}
+
+# End-of-stream marker of the read-ahead queue
+_DONE = object()
+
+
+def _column(chunk: Any, names: tuple[str, ...]) -> np.ndarray | None:
+    """Column of a record batch under any of ``names``, None if it has none."""
+    for name in names:
+        try:
+            return np.asarray(chunk[name])
+        except (KeyError, ValueError, IndexError):
+            continue
+    return None
+
+
+def _inputs(chunk: Any) -> tuple[np.ndarray, ...]:
+    """The eight model inputs of a chunk as 1-D arrays of equal length."""
+    if isinstance(chunk, tuple | list):
+        arrays = tuple(chunk)
+        if not 5 <= len(arrays) <= 6:
+            raise ValueError(f"chunk tuples hold 5 or 6 arrays, got {len(arrays)}")
+        iyd, sec, alt, glat, glon = arrays[:5]
+        ap = arrays[5] if len(arrays) == 6 else -1.0
+        arrays = (iyd, sec, alt, glat, glon, -1.0, -1.0, ap)
+    else:
+        columns = {key: _column(chunk, names) for key, names in COLUMNS.items()}
+        if columns["iyd"] is None and columns["sec"] is None:
+            time = _column(chunk, ("time",))
+            if time is not None:
+                columns["iyd"], columns["sec"] = time_to_iyd(time)
+        missing = [key for key, a in columns.items() if a is None and key not in _DEFAULTS]
+        if missing:
+            raise KeyError(f"chunk has no column {missing[0]!r}")
+        arrays = tuple(_DEFAULTS[key] if a is None else a for key, a in columns.items())
+    return tuple(np.ravel(a) for a in np.broadcast_arrays(*arrays))
+
+
+def _read_ahead(chunks: Iterable, depth: int) -> Generator:
+    """Iterate over ``chunks``, reading up to ``depth`` of them in advance.
+
+    The chunks are pulled on a daemon thread, so reading the next chunks
+    overlaps with the evaluation of the current one. Errors of the source
+    are raised in the consumer, and closing the iterator stops the thread.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def read() -> None:
+        try:
+            for chunk in chunks:
+                if not put((chunk, None)):
+                    return
+        except BaseException as error:
+            put((_DONE, error))
+            return
+        put((_DONE, None))
+
+    thread = threading.Thread(target=read, name="pyhwm2014-readahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk, error = buffer.get()
+            if error is not None:
+                raise error
+            if chunk is _DONE:
+                return
+            yield chunk
+    finally:
+        stop.set()
+
+
+def stream(
+    chunks: Iterable,
+    batch_size: int = 65536,
+    readahead: int = 0,
+    components: bool = False,
+    backend: str = "fortran",
+    workers: int | None = None,
+) -> Iterator:
+    """Evaluate HWM14 over a stream of point chunks, one result per chunk.
+
+    Consecutive chunks are gathered until they hold ``batch_size`` points and
+    evaluated with one :func:`pyhwm2014.evaluate` call, and larger chunks are
+    evaluated ``batch_size`` points at a time, so the memory in use stays
+    bounded by the chunks in flight whatever the length of the stream. The
+    results come out in order, each with the length of its input chunk.
+
+    Parameters
+    ----------
+    chunks : iterable
+        Chunks of points. Each is either an ``(iyd, sec, alt, glat, glon[,
+        ap])`` tuple of arrays or a record batch (dict of arrays, NumPy
+        structured array, ``pandas.DataFrame``, ``pyarrow.RecordBatch``, ...)
+        with columns ``iyd`` and ``sec`` or a datetime64 ``time``, ``alt``,
+        ``glat`` (or ``lat``), ``glon`` (or ``lon``) and optionally ``ap``,
+        ``f107a`` and ``f107``. Scalars broadcast within a chunk.
+    batch_size : int, optional
+        Number of points per evaluation. Default is 65536.
+    readahead : int, optional
+        Number of chunks read ahead on a worker thread, so that reading the
+        input overlaps with the evaluation (which releases the GIL). Default
+        is 0, which reads each chunk when needed.
+    components : bool, optional
+        Yield ``(quiet, disturbance, total)`` tuples. Default is False.
+    backend : {"fortran", "numpy"}, optional
+        Implementation, see :func:`pyhwm2014.evaluate`. Default is
+        ``"fortran"``.
+    workers : int, optional
+        Evaluate the batches on a :class:`pyhwm2014.parallel.Pool` of this
+        many processes (Fortran only), started once for the whole stream.
+        Default is None, which evaluates in this process.
+
+    Yields
+    ------
+    ndarray or tuple of ndarray
+        float32 winds of shape ``(n, 2)`` for a chunk of ``n`` points, with
+        the meridional wind in ``[:, 0]`` and the zonal wind in ``[:, 1]``.
+        A chunk smaller than ``batch_size`` is yielded once the batch it is
+        part of is full or the stream ends.
+
+    Raises
+    ------
+    KeyError
+        If a record batch misses a required column.
+    ValueError
+        If a tuple chunk does not hold 5 or 6 arrays, or ``batch_size`` is
+        not positive.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> def track(n):
+    ...     for start in range(0, n, 1000):
+    ...         sec = np.arange(start, min(start + 1000, n), dtype=float)
+    ...         yield {"iyd": 23150, "sec": sec, "alt": 400.0,
+    ...                "lat": np.sin(sec / 900.0) * 51.6, "lon": sec * 0.06 % 360 - 180}
+    >>> sum(len(w) for w in stream(track(10_000), readahead=2))
+    10000
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    pool = None
+    kernel: Callable[..., Any]
+    if workers is None:
+        kernel = functools.partial(evaluate, backend=backend)
+    else:
+        from .parallel import Pool
+
+        pool = Pool(workers)
+        kernel = pool.evaluate
+    # Read-ahead also moves the conversion of the chunks off this thread.
+    source: Iterator = map(_inputs, chunks)
+    reader = _read_ahead(source, readahead) if readahead > 0 else None
+    if reader is not None:
+        source = reader
+
+    def run(inputs: list[tuple[np.ndarray, ...]]) -> Iterator:
+        """Evaluate gathered chunks and yield their results in order."""
+        arrays = (
+            inputs[0] if len(inputs) == 1 else tuple(map(np.concatenate, zip(*inputs, strict=True)))
+        )
+        n = arrays[0].size
+        out = np.empty((3 if components else 1, n, 2), dtype=np.float32)
+        for start in range(0, n, batch_size):
+            part = slice(start, start + batch_size)
+            iyd, sec, alt, glat, glon, f107a, f107, ap = (a[part] for a in arrays)
+            out[:, part] = kernel(iyd, sec, alt, glat, glon, f107a, f107, ap, components=components)
+        start = 0
+        for chunk in inputs:
+            part = slice(start, start + chunk[0].size)
+            start = part.stop
+            yield tuple(out[:, part]) if components else out[0, part]
+
+    try:
+        pending: list[tuple[np.ndarray, ...]] = []
+        size = 0
+        for inputs in source:
+            pending.append(inputs)
+            size += inputs[0].size
+            if size >= batch_size:
+                yield from run(pending)
+                pending, size = [], 0
+        if pending:
+            yield from run(pending)
+    finally:
+        if reader is not None:
+            reader.close()
+        if pool is not None:
+            pool.close()
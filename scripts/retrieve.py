@@ -8,11 +8,26 @@ meridional wind values for specific parameters.
 Usage:
     python retrieve.py --year 2023 --day 150 --time 12.0 --lat 40.0 --lon -105.0 --alt 300.0
     python retrieve.py --year 2023 --day 150 --time 12.0 --lat 40.0 --lon -105.0 --alt-range 100 400 50
+    python retrieve.py --input points.csv --output winds.npy --workers 4
 """
 
 import argparse
+import itertools
 import sys
 from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Input columns read by --input: iyd and sec, or time; alt; glat or lat; glon
+# or lon; optionally ap, f107a and f107 (see pyhwm2014.stream)
+INPUT_COLUMNS = ('iyd', 'sec', 'time', 'alt', 'glat', 'lat', 'glon', 'lon', 'ap', 'f107a', 'f107')
+
+# Fields of the rows written by --output, in order
+OUTPUT_DTYPE = np.dtype([('meridional', '<f4'), ('zonal', '<f4')])
+
+# Size of the NPY header written by NpyWriter, so it can be rewritten in place
+NPY_HEADER_SIZE = 128
 
 
 def parse_arguments():
@@ -33,11 +48,25 @@ Examples:
   
   # Latitude profile
   %(prog)s --year 2023 --day 150 --time 12.0 --lon -105.0 --alt 300.0 --lat-range -90 90 30
+
+  # File of points (CSV, NPY or Parquet with iyd/sec or time, alt, lat, lon, ap columns)
+  %(prog)s --input points.parquet --output winds.npy --workers 4
+  %(prog)s --input points.csv --json > winds.ndjson
         """
     )
 
+    # Batch file options
+    parser.add_argument('--input', type=str,
+                       help='File of points (.csv, .npy or .parquet) to evaluate in chunks')
+    parser.add_argument('--output', type=str,
+                       help='Output file for --input (.npy or .csv; default: CSV on stdout)')
+    parser.add_argument('--chunk-size', type=int, default=100_000,
+                       help='Rows read per chunk with --input (default: 100000)')
+    parser.add_argument('--workers', type=int,
+                       help='Worker processes for --input (default: evaluate in this process)')
+
     # Date/time options
-    date_group = parser.add_mutually_exclusive_group(required=True)
+    date_group = parser.add_mutually_exclusive_group()
     date_group.add_argument('--datetime', type=str,
                            help='Date and time in format "YYYY-MM-DD HH:MM:SS"')
     date_group.add_argument('--year', type=int,
@@ -55,7 +84,7 @@ Examples:
                        help='Geographic longitude in degrees (-180 to 180)')
 
     # Altitude options
-    alt_group = parser.add_mutually_exclusive_group(required=True)
+    alt_group = parser.add_mutually_exclusive_group()
     alt_group.add_argument('--alt', '--altitude', type=float, dest='altitude',
                           help='Altitude in kilometers')
     alt_group.add_argument('--alt-range', nargs=3, type=float, metavar=('MIN', 'MAX', 'STEP'),
@@ -80,6 +109,16 @@ Examples:
     args = parser.parse_args()
 
     # Validate arguments
+    if args.input:
+        if args.json and args.output and Path(args.output).suffix.lower() == '.npy':
+            parser.error('--json writes NDJSON, not a .npy --output')
+        return args
+    if args.output:
+        parser.error('--output requires --input')
+    if not (args.datetime or args.year):
+        parser.error('one of the arguments --datetime --year is required')
+    if args.altitude is None and not args.alt_range:
+        parser.error('one of the arguments --alt/--altitude --alt-range is required')
     if args.year and not args.day:
         parser.error('--day is required when using --year')
     if args.year and not args.time:
@@ -124,8 +163,8 @@ def retrieve_single_point(year, day, time, lat, lon, alt, ap, verbose=False):
     )
 
     return {
-        'zonal': hwm14.Uwind[0],
-        'meridional': hwm14.Vwind[0],
+        'zonal': float(hwm14.Uwind[0]),
+        'meridional': float(hwm14.Vwind[0]),
         'altitude': alt,
         'latitude': lat,
         'longitude': lon
@@ -222,6 +261,122 @@ def retrieve_longitude_profile(year, day, time, lat, alt, lon_range, ap, verbose
     return results
 
 
+def read_csv_chunks(path, chunk_size):
+    """Yield the model columns of a CSV file with a header row, chunk_size rows at a time."""
+    with open(path, newline='') as f:
+        names = [name.strip() for name in f.readline().split(',')]
+        columns = [(k, name) for k, name in enumerate(names) if name in INPUT_COLUMNS]
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                return
+            lines = [line for line in lines if line.strip()]
+            if not lines:
+                continue
+            table = np.loadtxt(lines, delimiter=',', dtype=str, ndmin=2)
+            yield {
+                name: table[:, k].astype('datetime64[ns]' if name == 'time' else float)
+                for k, name in columns
+            }
+
+
+def read_chunks(path, chunk_size):
+    """Yield record batches of the points in a CSV, NPY or Parquet file."""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        yield from read_csv_chunks(path, chunk_size)
+    elif suffix == '.npy':
+        data = np.load(path, mmap_mode='r')
+        if data.dtype.names is None:
+            raise ValueError(f'{path} must hold a structured array with named columns')
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+    elif suffix in ('.parquet', '.pq'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('reading Parquet files requires pyarrow') from None
+        parquet = pq.ParquetFile(path)
+        columns = [name for name in parquet.schema_arrow.names if name in INPUT_COLUMNS]
+        yield from parquet.iter_batches(batch_size=chunk_size, columns=columns)
+    else:
+        raise ValueError(f'unsupported input format {suffix!r} (use .csv, .npy or .parquet)')
+
+
+def npy_header(n):
+    """NPY 1.0 header of n output rows, padded to NPY_HEADER_SIZE bytes."""
+    header = repr({
+        'descr': np.lib.format.dtype_to_descr(OUTPUT_DTYPE),
+        'fortran_order': False,
+        'shape': (n,),
+    })
+    magic = np.lib.format.magic(1, 0)
+    size = NPY_HEADER_SIZE - len(magic) - 2
+    return magic + size.to_bytes(2, 'little') + header.ljust(size - 1).encode('latin1') + b'\n'
+
+
+class NpyWriter:
+    """Append rows to an NPY file whose length is only known at the end."""
+
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.rows = 0
+        self.file.write(npy_header(0))
+
+    def write(self, w):
+        rows = np.empty(len(w), dtype=OUTPUT_DTYPE)
+        rows['meridional'], rows['zonal'] = w[:, 0], w[:, 1]
+        self.file.write(rows.tobytes())
+        self.rows += len(w)
+
+    def close(self):
+        self.file.seek(0)
+        self.file.write(npy_header(self.rows))
+        self.file.close()
+
+
+class TextWriter:
+    """Write rows as CSV or, with ndjson, as one JSON object per line."""
+
+    def __init__(self, path=None, ndjson=False):
+        self.file = open(path, 'w') if path else sys.stdout
+        self.rows = 0
+        if ndjson:
+            self.fmt = '{"meridional": %.7g, "zonal": %.7g}'
+        else:
+            self.fmt = '%.7g,%.7g'
+            self.file.write('meridional,zonal\n')
+
+    def write(self, w):
+        np.savetxt(self.file, w, fmt=self.fmt)
+        self.rows += len(w)
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+def retrieve_file(args):
+    """Evaluate the points of args.input chunk by chunk and write their winds."""
+    from pyhwm2014 import stream
+
+    if not Path(args.input).is_file():
+        raise FileNotFoundError(f'input file {args.input} not found')
+    if args.output and Path(args.output).suffix.lower() == '.npy':
+        writer = NpyWriter(args.output)
+    else:
+        writer = TextWriter(args.output, ndjson=args.json)
+
+    chunks = read_chunks(args.input, args.chunk_size)
+    try:
+        for w in stream(chunks, batch_size=args.chunk_size, readahead=2, workers=args.workers):
+            writer.write(w)
+    finally:
+        writer.close()
+    if args.verbose:
+        print(f'{writer.rows} points written to {args.output or "stdout"}', file=sys.stderr)
+
+
 def print_results(results, args):
     """Print results in human-readable or JSON format."""
     if args.json:
@@ -267,6 +422,17 @@ def main():
     """Main function."""
     args = parse_arguments()
 
+    if args.input:
+        try:
+            retrieve_file(args)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            if args.verbose:
+                import traceback
+                traceback.print_exc()
+            sys.exit(1)
+        return
+
     # Parse date/time
     if args.datetime:
         year, day, time = parse_datetime_string(args.datetime)
@@ -50,37 +50,18 @@ module hwm
     integer(4)           :: nmaxgeo = 0        ! maximum of nmaxhwm, nmaxqd
     integer(4)           :: mmaxgeo = 0        ! maximum of omaxhwm, nmaxqd
 
-    real(8),allocatable  :: gpbar(:,:),gvbar(:,:),gwbar(:,:) ! alfs for geo coordinates
-    real(8),allocatable  :: spbar(:,:),svbar(:,:),swbar(:,:) ! alfs MLT calculation
-
-    real(8)              :: glatalf = -1.d32
+    integer(4)           :: nthreads = 0       ! threads of the batch kernels, 0 = OpenMP default
+    integer(4),parameter :: minblock = 64      ! minimum points per thread in the batch kernels
+    integer(4)           :: alfcachesize = 128 ! colatitudes kept by each alfbasis cache
+    logical              :: hwmprofile = .false. ! count cache refreshes and time the stages
 
     logical              :: hwminit = .true.
 
-end module hwm
-
-subroutine hwm14(iyd,sec,alt,glat,glon,stl,f107a,f107,ap,w)
-
-    use hwm
-    implicit none
-    integer(4),intent(in)   :: iyd
-    real(4),intent(in)      :: sec,alt,glat,glon,stl,f107a,f107
-    real(4),intent(in)      :: ap(2)
-    real(4),intent(out)     :: w(2)
-    real(4)                 :: dw(2)
-
-    if (hwminit) call inithwm()
-
-    call hwmqt(iyd,sec,alt,glat,glon,stl,f107a,f107,ap,w)
+    character(256)       :: datadir = ''       ! directory of the data files, '' = search
+    logical              :: hwmstop = .true.   ! stop if a data file is missing
+    integer(4)           :: hwmstatus = 0      ! 1 if inithwm did not find a data file
 
-    if (ap(2) .ge. 0.0) then
-        call dwm07(iyd,sec,alt,glat,glon,ap,dw)
-        w = w + dw
-    endif
-
-    return
-
-end subroutine hwm14
+end module hwm
 
 ! ################################################################################
 ! Portable utility to compute vector spherical harmonical harmonic basis functions
@@ -191,6 +172,603 @@ contains
 
 end module alf
 
+! ################################################################################
+! Per-call scratch state (basis caches) of the model. The coefficients in the
+! qwm, dwm and gd2qdc modules are read-only once loaded, so any number of
+! workspaces can evaluate the model concurrently. Arrays are allocated on first
+! use by the routines that own them.
+! ################################################################################
+
+module hwmws
+
+    implicit none
+
+    ! Cache of alfbasis(nmax,mmax,theta) keyed by theta: 4-way set
+    ! associative, with least recently used replacement within a set
+
+    integer(4), parameter    :: alfways = 4
+
+    ! Profiling counters (see hwm14_get_stats). Each workspace counts while
+    ! hwmprofile is set and mergestats adds its counts to the process totals.
+
+    integer(4), parameter    :: sqtcall = 1      ! hwmqt points
+    integer(4), parameter    :: sqtrefresh = 2   ! refresh(1:5) set by the inputs, 2..6
+    integer(4), parameter    :: sqtlevel = 7     ! level projections
+    integer(4), parameter    :: sqtbz = 8        ! bz rebuilds
+    integer(4), parameter    :: svertwght = 9    ! vertwght calls
+    integer(4), parameter    :: sdwcall = 10     ! dwm07 points
+    integer(4), parameter    :: sdwkp = 11       ! ap2kp conversions
+    integer(4), parameter    :: sdwgd2qd = 12    ! gd2qd recomputations
+    integer(4), parameter    :: sdwmlt = 13      ! mltcalc recomputations
+    integer(4), parameter    :: sdwbcall = 14    ! dwm07b calls
+    integer(4), parameter    :: sdwbvsh = 15     ! vshterms rebuilds
+    integer(4), parameter    :: sdwbmlt = 16     ! mltterms rebuilds
+    integer(4), parameter    :: sdwbkp = 17      ! kpterms rebuilds
+    integer(4), parameter    :: salf = 18        ! hits and misses of qtalf, qdalf, dwmalf
+    integer(4), parameter    :: nstatcount = 23
+
+    ! Stage timers, inclusive (dwm07 contains gd2qd, mltcalc and dwm07b)
+
+    integer(4), parameter    :: tqt = 1, tdw = 2, tgd2qd = 3, tmlt = 4, tdwb = 5
+    integer(4), parameter    :: nstatstage = 5
+
+    integer(8), save         :: statcount(nstatcount) = 0
+    integer(8), save         :: statticks(nstatstage) = 0
+
+    type alfcache
+        integer(4)           :: nmax = -1, mmax = -1
+        integer(4)           :: size = 0           ! requested capacity
+        integer(4)           :: nsets = 0
+        integer(4)           :: last = 0           ! slot of the latest lookup
+        integer(8)           :: clock = 0
+        integer(8)           :: hits = 0, misses = 0
+        real(8),allocatable  :: theta(:)
+        integer(8),allocatable :: used(:)          ! 0 = empty slot
+        real(8),allocatable  :: p(:,:,:),v(:,:,:),w(:,:,:)
+    end type alfcache
+
+    type hwmworkspace
+
+        ! hwmqt: inputs of the previous call and the quasi-static terms
+
+        real(8)              :: previous(1:5) = -1.0d32
+        integer(4)           :: priornb = 0
+        integer(4)           :: cseason = 0
+        integer(4)           :: cwave = 0
+        integer(4)           :: ctide = 0
+        integer(4)           :: lev = 0
+        real(8),allocatable  :: fs(:,:),fm(:,:),fl(:,:)
+        real(8),allocatable  :: bz(:)
+        real(8),allocatable  :: zwght(:)
+
+        ! alfs of recent colatitudes, one cache per expansion: hwmqt (geographic),
+        ! gd2qd and mltcalc (geographic and anti-sunward, QD coefficients) and
+        ! dwm07b (magnetic)
+
+        type(alfcache)       :: qtalf, qdalf, dwmalf
+
+        ! profiling counters and clock ticks per stage
+
+        integer(8)           :: counts(nstatcount) = 0
+        integer(8)           :: ticks(nstatstage) = 0
+
+        ! gd2qd spherical harmonic functions and gradients
+
+        real(8),allocatable  :: sh(:),shgradtheta(:),shgradphi(:)
+
+        ! dwm07: inputs of the previous call and the derived coordinates
+
+        real(4)              :: day = 0.0, ut = 0.0, kp = 0.0
+        real(4)              :: mlat = 0.0, mlon = 0.0, mlt = 0.0
+        real(4)              :: f1e = 0.0, f1n = 0.0, f2e = 0.0, f2n = 0.0
+        real(4)              :: glatlast = 1.0e16, glonlast = 1.0e16
+        real(4)              :: daylast = 1.0e16, utlast = 1.0e16, aplast = 1.0e16
+
+        ! dwm07b: VSH, MLT and Kp terms
+
+        real(8),allocatable  :: mltterms(:,:)
+        real(4),allocatable  :: vshterms(:,:)
+        real(4),allocatable  :: termval(:,:)
+        real(4)              :: kpterms(0:2) = 0.0
+        real(4)              :: mltlast = 1.e16, mlatlast = 1.e16, kplast = 1.e16
+
+    end type hwmworkspace
+
+    ! Workspace of the single-point entry points (hwm14, hwmqt, dwm07, gd2qd, ...)
+
+    type(hwmworkspace), save :: hwmdefaultws
+
+contains
+
+    ! -------------------------------------------------------------
+    ! Slot of the cache holding the alfs at colatitude theta. On a
+    ! miss they are computed into the least recently used slot of
+    ! the set of theta. The slot stays valid until the next lookup.
+    ! -------------------------------------------------------------
+
+    integer(4) function alfslot(cache,nmax,mmax,theta) result(k)
+
+        use hwm, only:alfcachesize,hwmprofile
+        use alf, only:alfbasis
+        implicit none
+
+        type(alfcache), intent(inout) :: cache
+        integer(4), intent(in)        :: nmax, mmax
+        real(8), intent(in)           :: theta
+
+        integer(4)                    :: i, base, nslot
+        integer(8)                    :: h
+
+        if ((cache%size .ne. max(alfcachesize,1)) .or. &
+            (cache%nmax .ne. nmax) .or. (cache%mmax .ne. mmax)) then
+            if (allocated(cache%theta)) deallocate(cache%theta,cache%used,cache%p,cache%v,cache%w)
+            cache%size = max(alfcachesize,1)
+            cache%nsets = (cache%size + alfways - 1) / alfways
+            cache%nmax = nmax
+            cache%mmax = mmax
+            cache%last = 0
+            nslot = cache%nsets * alfways
+            allocate(cache%theta(nslot),cache%used(nslot))
+            allocate(cache%p(0:nmax,0:mmax,nslot))
+            allocate(cache%v(0:nmax,0:mmax,nslot))
+            allocate(cache%w(0:nmax,0:mmax,nslot))
+            cache%theta = 0
+            cache%used = 0
+            cache%p = 0
+            cache%v = 0
+            cache%w = 0
+        endif
+
+        cache%clock = cache%clock + 1
+
+        ! consecutive calls usually repeat the latest colatitude
+
+        k = cache%last
+        if (k .gt. 0) then
+            if (cache%theta(k) .eq. theta) then
+                if (hwmprofile) cache%hits = cache%hits + 1
+                cache%used(k) = cache%clock
+                return
+            endif
+        endif
+
+        ! fold the bits of theta into a set index
+
+        h = transfer(theta,h)
+        h = ieor(h,ishft(h,-32))
+        h = ieor(h,ishft(h,-16))
+        base = int(modulo(h,int(cache%nsets,8)),4) * alfways
+
+        do i = base + 1, base + alfways
+            if ((cache%used(i) .gt. 0) .and. (cache%theta(i) .eq. theta)) then
+                if (hwmprofile) cache%hits = cache%hits + 1
+                cache%used(i) = cache%clock
+                cache%last = i
+                k = i
+                return
+            endif
+        enddo
+
+        if (hwmprofile) cache%misses = cache%misses + 1
+        k = base + minloc(cache%used(base+1:base+alfways),1)
+        call alfbasis(nmax,mmax,theta,cache%p(:,:,k),cache%v(:,:,k),cache%w(:,:,k))
+        cache%theta(k) = theta
+        cache%used(k) = cache%clock
+        cache%last = k
+
+        return
+
+    end function alfslot
+
+    ! -------------------------------------------------------------
+    ! Drop all cached state, e.g. after the coefficients are reloaded
+    ! -------------------------------------------------------------
+
+    subroutine resetws(ws)
+
+        implicit none
+
+        type(hwmworkspace), intent(inout) :: ws
+
+        ws = hwmworkspace()
+
+        return
+
+    end subroutine resetws
+
+    ! -------------------------------------------------------------
+    ! Add the profiling counters of ws to the process totals and
+    ! clear them
+    ! -------------------------------------------------------------
+
+    subroutine mergestats(ws)
+
+        implicit none
+
+        type(hwmworkspace), intent(inout) :: ws
+
+        ws%counts(salf:salf+5) = (/ws%qtalf%hits, ws%qtalf%misses, &
+            ws%qdalf%hits, ws%qdalf%misses, ws%dwmalf%hits, ws%dwmalf%misses/)
+
+        !$omp critical (hwmstats)
+        statcount = statcount + ws%counts
+        statticks = statticks + ws%ticks
+        !$omp end critical (hwmstats)
+
+        ws%counts = 0
+        ws%ticks = 0
+        ws%qtalf%hits = 0
+        ws%qtalf%misses = 0
+        ws%qdalf%hits = 0
+        ws%qdalf%misses = 0
+        ws%dwmalf%hits = 0
+        ws%dwmalf%misses = 0
+
+        return
+
+    end subroutine mergestats
+
+    ! -------------------------------------------------------------
+    ! Clock ticks of the stage timers
+    ! -------------------------------------------------------------
+
+    integer(8) function stattick() result(t)
+
+        implicit none
+
+        call system_clock(t)
+
+        return
+
+    end function stattick
+
+end module hwmws
+
+subroutine hwm14(iyd,sec,alt,glat,glon,stl,f107a,f107,ap,w)
+
+    use hwm
+    use hwmws
+    implicit none
+    integer(4),intent(in)   :: iyd
+    real(4),intent(in)      :: sec,alt,glat,glon,stl,f107a,f107
+    real(4),intent(in)      :: ap(2)
+    real(4),intent(out)     :: w(2)
+
+    if (hwminit) call inithwm()
+
+    call hwm14_ws(hwmdefaultws,iyd,sec,alt,glat,glon,stl,f107a,f107,ap,w)
+
+    return
+
+end subroutine hwm14
+
+! ------------------------------------------------------------
+! hwm14 evaluated with the caches of the workspace ws
+! ------------------------------------------------------------
+
+subroutine hwm14_ws(ws,iyd,sec,alt,glat,glon,stl,f107a,f107,ap,w)
+
+    use hwmws
+    implicit none
+    type(hwmworkspace),intent(inout) :: ws
+    integer(4),intent(in)   :: iyd
+    real(4),intent(in)      :: sec,alt,glat,glon,stl,f107a,f107
+    real(4),intent(in)      :: ap(2)
+    real(4),intent(out)     :: w(2)
+    real(4)                 :: dw(2)
+
+    call hwmqt_ws(ws,iyd,sec,alt,glat,glon,stl,f107a,f107,ap,w)
+
+    if (ap(2) .ge. 0.0) then
+        call dwm07_ws(ws,iyd,sec,alt,glat,glon,ap,dw)
+        w = w + dw
+    endif
+
+    return
+
+end subroutine hwm14_ws
+
+! ------------------------------------------------------------
+! Batch version of hwm14, loops over n points inside Fortran
+!        ap(i) = current 3hr ap index of point i (ap < 0 for quiet time)
+!        w(1,i) = meridional wind, w(2,i) = zonal wind
+! The points are split into contiguous blocks that are evaluated in
+! parallel when compiled with OpenMP. Each block uses its own workspace,
+! so concurrent calls are safe once inithwm has run.
+! ------------------------------------------------------------
+
+subroutine hwm14_batch(n,iyd,sec,alt,glat,glon,f107a,f107,ap,w)
+
+    use hwm
+    implicit none
+    integer(4),intent(in)   :: n
+    integer(4),intent(in)   :: iyd(n)
+    real(4),intent(in)      :: sec(n),alt(n),glat(n),glon(n),f107a(n),f107(n)
+    real(4),intent(in)      :: ap(n)
+    real(4),intent(out)     :: w(2,n)
+    integer(4)              :: nt,nblk,blk,i0,i1
+
+    if (hwminit) call inithwm()
+
+    call hwm14_get_num_threads(nt)
+    nblk = max(1,min(nt,n/minblock))
+
+    !$omp parallel do num_threads(nt) schedule(static) private(i0,i1) if(nblk .gt. 1)
+    do blk = 1,nblk
+        i0 = int(int(blk-1,8)*n/nblk) + 1
+        i1 = int(int(blk,8)*n/nblk)
+        call hwm14_block(i1-i0+1,iyd(i0:i1),sec(i0:i1),alt(i0:i1),glat(i0:i1), &
+            glon(i0:i1),f107a(i0:i1),f107(i0:i1),ap(i0:i1),w(:,i0:i1))
+    enddo
+    !$omp end parallel do
+
+    return
+
+end subroutine hwm14_batch
+
+subroutine hwm14_block(n,iyd,sec,alt,glat,glon,f107a,f107,ap,w)
+
+    use hwmws
+    implicit none
+    integer(4),intent(in)   :: n
+    integer(4),intent(in)   :: iyd(n)
+    real(4),intent(in)      :: sec(n),alt(n),glat(n),glon(n),f107a(n),f107(n)
+    real(4),intent(in)      :: ap(n)
+    real(4),intent(out)     :: w(2,n)
+    real(4)                 :: apin(2)
+    integer(4)              :: i
+    type(hwmworkspace)      :: ws
+
+    apin(1) = -1.0
+    do i = 1,n
+        apin(2) = ap(i)
+        call hwm14_ws(ws,iyd(i),sec(i),alt(i),glat(i),glon(i),-1.0,f107a(i),f107(i),apin,w(:,i))
+    enddo
+
+    call mergestats(ws)
+
+    return
+
+end subroutine hwm14_block
+
+! ------------------------------------------------------------
+! Batch version returning the quiet time, disturbance and total
+! winds from a single pass (the total is formed as wqt + wdt)
+! ------------------------------------------------------------
+
+subroutine hwm14_batch_components(n,iyd,sec,alt,glat,glon,f107a,f107,ap,wqt,wdt,w)
+
+    use hwm
+    implicit none
+    integer(4),intent(in)   :: n
+    integer(4),intent(in)   :: iyd(n)
+    real(4),intent(in)      :: sec(n),alt(n),glat(n),glon(n),f107a(n),f107(n)
+    real(4),intent(in)      :: ap(n)
+    real(4),intent(out)     :: wqt(2,n),wdt(2,n),w(2,n)
+    integer(4)              :: nt,nblk,blk,i0,i1
+
+    if (hwminit) call inithwm()
+
+    call hwm14_get_num_threads(nt)
+    nblk = max(1,min(nt,n/minblock))
+
+    !$omp parallel do num_threads(nt) schedule(static) private(i0,i1) if(nblk .gt. 1)
+    do blk = 1,nblk
+        i0 = int(int(blk-1,8)*n/nblk) + 1
+        i1 = int(int(blk,8)*n/nblk)
+        call hwm14_block_components(i1-i0+1,iyd(i0:i1),sec(i0:i1),alt(i0:i1),glat(i0:i1), &
+            glon(i0:i1),f107a(i0:i1),f107(i0:i1),ap(i0:i1),wqt(:,i0:i1),wdt(:,i0:i1),w(:,i0:i1))
+    enddo
+    !$omp end parallel do
+
+    return
+
+end subroutine hwm14_batch_components
+
+subroutine hwm14_block_components(n,iyd,sec,alt,glat,glon,f107a,f107,ap,wqt,wdt,w)
+
+    use hwmws
+    implicit none
+    integer(4),intent(in)   :: n
+    integer(4),intent(in)   :: iyd(n)
+    real(4),intent(in)      :: sec(n),alt(n),glat(n),glon(n),f107a(n),f107(n)
+    real(4),intent(in)      :: ap(n)
+    real(4),intent(out)     :: wqt(2,n),wdt(2,n),w(2,n)
+    real(4)                 :: apin(2)
+    integer(4)              :: i
+    type(hwmworkspace)      :: ws
+
+    apin(1) = -1.0
+    do i = 1,n
+        apin(2) = ap(i)
+        call hwmqt_ws(ws,iyd(i),sec(i),alt(i),glat(i),glon(i),-1.0,f107a(i),f107(i),apin,wqt(:,i))
+        if (ap(i) .ge. 0.0) then
+            call dwm07_ws(ws,iyd(i),sec(i),alt(i),glat(i),glon(i),apin,wdt(:,i))
+        else
+            wdt(:,i) = 0.0
+        endif
+        w(:,i) = wqt(:,i) + wdt(:,i)
+    enddo
+
+    call mergestats(ws)
+
+    return
+
+end subroutine hwm14_block_components
+
+! ------------------------------------------------------------
+! Height profile of hwm14 at one location and time: the quiet
+! time winds come from hwmqt_profile_ws, which shares the
+! horizontal basis between the altitudes alt(1:n). Returns the
+! quiet time, disturbance and total (wqt + wdt) winds.
+! ------------------------------------------------------------
+
+subroutine hwm14_profile(n,iyd,sec,alt,glat,glon,f107a,f107,ap,wqt,wdt,w)
+
+    use hwm
+    use hwmws
+    implicit none
+    integer(4),intent(in)   :: n
+    integer(4),intent(in)   :: iyd
+    real(4),intent(in)      :: sec,glat,glon,f107a,f107,ap
+    real(4),intent(in)      :: alt(n)
+    real(4),intent(out)     :: wqt(2,n),wdt(2,n),w(2,n)
+    real(4)                 :: apin(2)
+    integer(4)              :: i
+    type(hwmworkspace)      :: ws
+
+    if (hwminit) call inithwm()
+
+    call hwmqt_profile_ws(ws,iyd,sec,glat,glon,n,alt,wqt)
+
+    apin(1) = -1.0
+    apin(2) = ap
+    do i = 1,n
+        if (ap .ge. 0.0) then
+            call dwm07_ws(ws,iyd,sec,alt(i),glat,glon,apin,wdt(:,i))
+        else
+            wdt(:,i) = 0.0
+        endif
+        w(:,i) = wqt(:,i) + wdt(:,i)
+    enddo
+
+    call mergestats(ws)
+
+    return
+
+end subroutine hwm14_profile
+
+! ------------------------------------------------------------
+! Number of threads used by the batch kernels; nt <= 0 restores
+! the OpenMP default (OMP_NUM_THREADS). Always 1 without OpenMP.
+! ------------------------------------------------------------
+
+subroutine hwm14_set_num_threads(nt)
+
+    use hwm,only:nthreads
+    implicit none
+    integer(4),intent(in)   :: nt
+
+    nthreads = max(nt,0)
+
+    return
+
+end subroutine hwm14_set_num_threads
+
+subroutine hwm14_get_num_threads(nt)
+
+    use hwm,only:nthreads
+    !$ use omp_lib,only:omp_get_max_threads
+    implicit none
+    integer(4),intent(out)  :: nt
+
+    nt = 1
+    !$ nt = omp_get_max_threads()
+    !$ if (nthreads .gt. 0) nt = nthreads
+
+    return
+
+end subroutine hwm14_get_num_threads
+
+! ------------------------------------------------------------
+! Capacity (number of colatitudes) of each alfbasis cache of a
+! workspace, rounded up to a multiple of 4; values below 1 are
+! treated as 1.
+! ------------------------------------------------------------
+
+subroutine hwm14_set_alf_cache_size(n)
+
+    use hwm,only:alfcachesize
+    implicit none
+    integer(4),intent(in)   :: n
+
+    alfcachesize = max(n,1)
+
+    return
+
+end subroutine hwm14_set_alf_cache_size
+
+subroutine hwm14_get_alf_cache_size(n)
+
+    use hwm,only:alfcachesize
+    implicit none
+    integer(4),intent(out)  :: n
+
+    n = alfcachesize
+
+    return
+
+end subroutine hwm14_get_alf_cache_size
+
+! ------------------------------------------------------------
+! Profiling counters (see module hwmws for their order) and
+! seconds per stage accumulated while hwmprofile is set, summed
+! over all workspaces; the single-point entry points are merged
+! on request.
+! ------------------------------------------------------------
+
+subroutine hwm14_get_stats(counts,seconds)
+
+    use hwmws
+    implicit none
+    integer(8),intent(out)  :: counts(nstatcount)
+    real(8),intent(out)     :: seconds(nstatstage)
+    integer(8)              :: rate
+
+    call mergestats(hwmdefaultws)
+    call system_clock(count_rate=rate)
+    counts = statcount
+    seconds = dble(statticks) / dble(rate)
+
+    return
+
+end subroutine hwm14_get_stats
+
+subroutine hwm14_reset_stats()
+
+    use hwmws
+    implicit none
+
+    call mergestats(hwmdefaultws)
+    !$omp critical (hwmstats)
+    statcount = 0
+    statticks = 0
+    !$omp end critical (hwmstats)
+
+    return
+
+end subroutine hwm14_reset_stats
+
+! ------------------------------------------------------------
+! Load the coefficients from the directory path ('' searches the
+! working directory, $HWMPATH and ../Meta as before). Instead of
+! stopping, status = 1 reports a missing data file; the previous
+! directory is then restored and reloaded on next use.
+! ------------------------------------------------------------
+
+subroutine hwm14_init(path,status)
+
+    use hwm
+    implicit none
+    character(*),intent(in)  :: path
+    integer(4),intent(out)   :: status
+    character(256)           :: previous
+
+    previous = datadir
+    datadir = path
+    hwmstop = .false.
+    call inithwm()
+    hwmstop = .true.
+    status = hwmstatus
+    if (status .ne. 0) then
+        datadir = previous
+        hwminit = .true.
+    endif
+
+    return
+
+end subroutine hwm14_init
+
 !####################################################################################
 ! Model Modules
 !####################################################################################
@@ -221,19 +799,6 @@ module qwm
     real(8),allocatable        :: mparm(:,:)       ! Model Parameters
     real(8),allocatable        :: tparm(:,:)       ! Model Parameters
 
-    real(8)                    :: previous(1:5) = -1.0d32
-    integer(4)                 :: priornb = 0
-
-    real(8),allocatable        :: fs(:,:),fm(:,:),fl(:,:)
-    real(8),allocatable        :: bz(:),bm(:)
-
-    real(8),allocatable        :: zwght(:)
-    integer(4)                 :: lev
-
-    integer(4)                 :: cseason = 0
-    integer(4)                 :: cwave = 0
-    integer(4)                 :: ctide = 0
-
     logical                    :: content(5) = .true.          ! Season/Waves/Tides
     logical                    :: component(0:1) = .true.      ! Compute zonal/meridional
 
@@ -255,12 +820,6 @@ module dwm
 
     integer(4),allocatable     :: termarr(:,:)      ! 3 x nterm index of coupled terms
     real(4),allocatable        :: coeff(:)          ! Model coefficients
-    real(4),allocatable        :: vshterms(:,:)     ! VSH basis values
-    real(4),allocatable        :: termval(:,:)      ! Term values to which coefficients are applied
-    real(8),allocatable        :: dpbar(:,:)        ! Associated lengendre fns
-    real(8),allocatable        :: dvbar(:,:)
-    real(8),allocatable        :: dwbar(:,:)
-    real(8),allocatable        :: mltterms(:,:)     ! MLT Fourier terms
     real(4)                    :: twidth            ! Transition width of high-lat mask
 
     real(8), parameter         :: pi=3.1415926535897932
@@ -271,18 +830,93 @@ module dwm
 
 end module dwm
 
+! Quasi-Dipole coordinate conversion coefficients, see gd2qd
+
+module gd2qdc
+
+    implicit none
+
+    integer(4)               :: nterm, nmax, mmax  !Spherical harmonic expansion parameters
+
+    real(8), allocatable     :: coeff(:,:)         !Coefficients for spherical harmonic expansion
+    real(8), allocatable     :: xcoeff(:)          !Coefficients for x coordinate
+    real(8), allocatable     :: ycoeff(:)          !Coefficients for y coordinate
+    real(8), allocatable     :: zcoeff(:)          !Coefficients for z coordinate
+    real(8), allocatable     :: normadj(:)         !Adjustment to VSH normalization factor
+    real(4)                  :: epoch, alt
+
+    real(8), parameter       :: pi = 3.1415926535897932d0
+    real(8), parameter       :: dtor = pi/180.0d0
+    real(8), parameter       :: sineps = 0.39781868d0
+
+    logical                  :: gd2qdinit = .true.
+
+contains
+
+    subroutine initgd2qd()
+
+        use hwm
+        implicit none
+
+        character(128), parameter   :: datafile='gd2qd.dat'
+        integer(4)                  :: iterm, n
+        integer(4)                  :: j
+
+        call findandopen(datafile,23)
+        if (hwmstatus .ne. 0) return
+        read(23) nmax, mmax, nterm, epoch, alt
+        if (allocated(coeff)) then
+            deallocate(coeff,xcoeff,ycoeff,zcoeff,normadj)
+        endif
+        allocate( coeff(0:nterm-1, 0:2) )
+        read(23) coeff
+        close(23)
+
+        allocate( xcoeff(0:nterm-1) )
+        allocate( ycoeff(0:nterm-1) )
+        allocate( zcoeff(0:nterm-1) )
+        allocate( normadj(0:nmax) )
+
+        do iterm = 0, nterm-1
+            xcoeff(iterm) = coeff(iterm,0)
+            ycoeff(iterm) = coeff(iterm,1)
+            zcoeff(iterm) = coeff(iterm,2)
+        enddo
+
+        do n = 0, nmax
+            normadj(n) = dsqrt(dble(n*(n+1)))
+        end do
+
+        nmaxqdc = nmax
+        mmaxqdc = mmax
+
+        gd2qdinit = .false.
+
+        return
+
+    end subroutine initgd2qd
+
+end module gd2qdc
+
 subroutine inithwm()
 
     use hwm
+    use hwmws
     use qwm
     use dwm
+    use gd2qdc,only:initgd2qd
     use alf,only:initalf
     implicit none
 
     integer(4)           :: nmax0, mmax0
 
+    hwmstatus = 0
     call initqwm(qwmdefault)
+    if (hwmstatus .ne. 0) return
     call initdwm(nmaxdwm, mmaxdwm)
+    if (hwmstatus .ne. 0) return
+    call initgd2qd()
+    if (hwmstatus .ne. 0) return
 
     nmaxgeo = max(nmaxhwm, nmaxqdc)
     mmaxgeo = max(omaxhwm, mmaxqdc)
@@ -292,23 +926,9 @@ subroutine inithwm()
 
     call initalf(nmax0,mmax0)
 
-    ! shared for QWM and DWM, no need to compute twice
+    ! the caches of the default workspace refer to the previous coefficients
 
-    if (allocated(gpbar)) deallocate(gpbar,gvbar,gwbar)
-    allocate(gpbar(0:nmaxgeo,0:mmaxgeo))
-    allocate(gvbar(0:nmaxgeo,0:mmaxgeo))
-    allocate(gwbar(0:nmaxgeo,0:mmaxgeo))
-    gpbar = 0
-    gvbar = 0
-    gwbar = 0
-
-    if (allocated(spbar)) deallocate(spbar,svbar,swbar)
-    allocate(spbar(0:nmaxgeo,0:mmaxgeo))
-    allocate(svbar(0:nmaxgeo,0:mmaxgeo))
-    allocate(swbar(0:nmaxgeo,0:mmaxgeo))
-    spbar = 0
-    svbar = 0
-    swbar = 0
+    call resetws(hwmdefaultws)
 
     hwminit = .false.
 
@@ -327,19 +947,17 @@ end subroutine inithwm
 subroutine initqwm(filename)
 
     use qwm
-    use hwm,only:omaxhwm,nmaxhwm
+    use hwm,only:omaxhwm,nmaxhwm,hwmstatus
     implicit none
 
     character(128),intent(in)      :: filename
     integer(4)                     :: i,j
     integer(4)                     :: ncomp
 
-    if (allocated(vnode)) then
-        deallocate(order,nb,vnode,mparm,tparm)
-        deallocate(fs,fm,fl,zwght,bz,bm)
-    endif
+    if (allocated(vnode)) deallocate(order,nb,vnode,mparm,tparm)
 
     call findandopen(filename,23)
+    if (hwmstatus .ne. 0) return
     read(23) nbf,maxs,maxm,maxl,maxn,ncomp
     read(23) nlev,p
     nnode = nlev + p
@@ -369,22 +987,14 @@ subroutine initqwm(filename)
     altsym = vnode(nlev-1)
     altiso = vnode(nlev)
 
-    ! Allocate the global store of quasi-static parameters
+    ! Maximum orders of the quasi-static parameters (stored per workspace)
 
     maxo = max(maxs,maxm,maxl)
     omaxhwm = maxo
     nmaxhwm = maxn
 
-    allocate(fs(0:maxs,2),fm(0:maxm,2),fl(0:maxl,2))
-    allocate(bz(nbf),bm(nbf))
-    allocate(zwght(0:p))
-
-    bz = 0.0d0
-    bm = 0.0d0
+    ! change the initalization flag
 
-    ! change the initalization flag and reset some other things
-
-    previous(1:5) = -1.0d32
     qwminit = .false.
     qwmdefault = filename
 
@@ -483,278 +1093,476 @@ contains
             enddo
         enddo
 
-        return
+        return
+
+    end subroutine parity
+
+end subroutine initqwm
+
+! ------------------------------------------------------------
+! The quiet time only HWM function call
+! ------------------------------------------------------------
+
+subroutine hwmqt(IYD,SEC,ALT,GLAT,GLON,STL,F107A,F107,AP,W)
+
+    use hwm,only:hwminit
+    use hwmws
+    implicit none
+
+    integer,intent(in)      :: IYD
+    real(4),intent(in)      :: SEC,ALT,GLAT,GLON,STL,F107A,F107
+    real(4),intent(in)      :: AP(2)
+    real(4),intent(out)     :: W(2)
+
+    if (hwminit) call inithwm()
+
+    call hwmqt_ws(hwmdefaultws,IYD,SEC,ALT,GLAT,GLON,STL,F107A,F107,AP,W)
+
+    return
+
+end subroutine hwmqt
+
+! ------------------------------------------------------------
+! hwmqt evaluated with the caches of the workspace ws
+! ------------------------------------------------------------
+
+subroutine hwmqt_ws(ws,IYD,SEC,ALT,GLAT,GLON,STL,F107A,F107,AP,W)
+
+    use hwm,only:hwmprofile
+    use hwmws
+    use qwm
+    implicit none
+
+    type(hwmworkspace),intent(inout) :: ws
+
+    integer,intent(in)      :: IYD
+    real(4),intent(in)      :: SEC,ALT,GLAT,GLON,STL,F107A,F107
+    real(4),intent(in)      :: AP(2)
+    real(4),intent(out)     :: W(2)
+
+    ! Local variables
+
+    real(8)                 :: input
+    real(8)                 :: u,v,ub,vb
+    real(8)                 :: theta
+    integer(4)              :: b,d
+    logical                 :: refresh(5)
+    logical                 :: profile
+    integer(8)              :: t0
+
+    profile = hwmprofile
+    if (profile) t0 = stattick()
+
+    ! ====================================================================
+    ! Update VSH model terms based on any change in the input parameters
+    ! ====================================================================
+
+    call hwmqt_terms(ws,IYD,SEC,GLAT,GLON,theta,refresh)
+
+    ! Altitude
+
+    input = dble(alt)
+    if (input .ne. ws%previous(5)) then
+        call vertwght(input,ws%zwght,ws%lev)
+        ws%previous(5) = input
+        if (profile) ws%counts(svertwght) = ws%counts(svertwght) + 1
+    endif
+
+    ! ====================================================================
+    ! Calculate the wind components
+    ! ====================================================================
+
+    u = 0.0d0
+    v = 0.0d0
+
+    do b = 0,p
+
+        if (ws%zwght(b) .eq. 0.d0) cycle
+
+        d = b + ws%lev
+        call hwmqt_level(ws,d,theta,refresh,ub,vb)
+        if (component(0)) u = u + ws%zwght(b)*ub
+        if (component(1)) v = v + ws%zwght(b)*vb
+
+    enddo
+
+    w(1) = sngl(v)
+    w(2) = sngl(u)
+
+    if (profile) ws%ticks(tqt) = ws%ticks(tqt) + stattick() - t0
 
-    end subroutine parity
+    return
 
-end subroutine initqwm
+end subroutine hwmqt_ws
 
 ! ------------------------------------------------------------
-! The quiet time only HWM function call
+! hwmqt over the n altitudes alt(1:n) of one location and time.
+! The horizontal terms and the basis vector bz are computed once
+! per nb/order signature, the projections bz.mparm(:,d) and
+! bz.tparm(:,d) once per level, and every altitude is then the
+! B-spline weighted sum of the projections of its levels.
 ! ------------------------------------------------------------
 
-subroutine hwmqt(IYD,SEC,ALT,GLAT,GLON,STL,F107A,F107,AP,W)
+subroutine hwmqt_profile_ws(ws,IYD,SEC,GLAT,GLON,n,alt,w)
 
-    use hwm
+    use hwm,only:hwmprofile
+    use hwmws
     use qwm
-    use alf,only:alfbasis
     implicit none
 
+    type(hwmworkspace),intent(inout) :: ws
+
     integer,intent(in)      :: IYD
-    real(4),intent(in)      :: SEC,ALT,GLAT,GLON,STL,F107A,F107
-    real(4),intent(in)      :: AP(2)
-    real(4),intent(out)     :: W(2)
+    real(4),intent(in)      :: SEC,GLAT,GLON
+    integer(4),intent(in)   :: n
+    real(4),intent(in)      :: alt(n)
+    real(4),intent(out)     :: w(2,n)
 
     ! Local variables
 
-    real(8)                 :: input(5)
     real(8)                 :: u,v
+    real(8)                 :: theta
+    real(8)                 :: zwght(0:p)
+    real(8)                 :: ulev(0:nlev),vlev(0:nlev)
+    logical                 :: done(0:nlev)
+    logical                 :: refresh(5)
+    integer(4)              :: i,b,d,lev,lastd
+    logical                 :: profile
+    integer(8)              :: t0
 
-    real(8)                 :: cs,ss,cm,sm,cl,sl
-    real(8)                 :: cmcs,smcs,cmss,smss
-    real(8)                 :: clcs,slcs,clss,slss
-    real(8)                 :: AA,BB,CC,DD
-    real(8)                 :: vb,wb
-    real(8)                 :: theta,sc
+    profile = hwmprofile
+    if (profile) t0 = stattick()
 
-    integer(4)              :: b,c,d,m,n,s,l
+    call hwmqt_terms(ws,IYD,SEC,GLAT,GLON,theta,refresh)
 
-    integer(4)              :: amaxs,amaxn
-    integer(4)              :: pmaxm,pmaxs,pmaxn
-    integer(4)              :: tmaxl,tmaxs,tmaxn
+    done = .false.
+    lastd = -1
 
-    logical                 :: refresh(5)
+    do i = 1,n
+
+        call vertwght(dble(alt(i)),zwght,lev)
+
+        u = 0.0d0
+        v = 0.0d0
+
+        do b = 0,p
+
+            if (zwght(b) .eq. 0.d0) cycle
+
+            d = b + lev
+            if (.not. done(d)) then
+                ! bz only depends on the level through nb and order
+                if (lastd .ge. 0) then
+                    if (all(order(:,d) .eq. order(:,lastd))) then
+                        refresh(1:5) = .false.
+                    else
+                        refresh(1:5) = .true.
+                    endif
+                endif
+                call hwmqt_level(ws,d,theta,refresh,ulev(d),vlev(d))
+                done(d) = .true.
+                lastd = d
+            endif
+            if (component(0)) u = u + zwght(b)*ulev(d)
+            if (component(1)) v = v + zwght(b)*vlev(d)
+
+        enddo
+
+        w(1,i) = sngl(v)
+        w(2,i) = sngl(u)
+
+    enddo
+
+    if (profile) then
+        ws%counts(svertwght) = ws%counts(svertwght) + n
+        ws%ticks(tqt) = ws%ticks(tqt) + stattick() - t0
+    endif
+
+    return
+
+end subroutine hwmqt_profile_ws
+
+! ------------------------------------------------------------
+! Horizontal terms of hwmqt: seasonal (fs), tidal (fl) and
+! stationary wave (fm) harmonics and the alfs of the latitude,
+! refreshed in the workspace as the inputs change. Returns the
+! colatitude (radians) and the parts of bz to rebuild.
+! ------------------------------------------------------------
+
+subroutine hwmqt_terms(ws,IYD,SEC,GLAT,GLON,theta,refresh)
+
+    use hwm,only:hwmprofile
+    use hwmws
+    use qwm
+    implicit none
+
+    type(hwmworkspace),intent(inout) :: ws
+
+    integer,intent(in)      :: IYD
+    real(4),intent(in)      :: SEC,GLAT,GLON
+    real(8),intent(out)     :: theta
+    logical,intent(out)     :: refresh(5)
+
+    ! Local variables
+
+    real(8)                 :: input(4)
+    real(8)                 :: AA,BB,CC
+    integer(4)              :: k,m,s,l
 
     real(8),parameter       :: twoPi = 2.0d0*3.1415926535897932384626433832795d0
     real(8),parameter       :: deg2rad = twoPi/360.0d0
 
-    ! ====================================================================
-    ! Update VSH model terms based on any change in the input parameters
-    ! ====================================================================
-
     if (qwminit) call initqwm(qwmdefault)
 
+    if (.not. allocated(ws%bz)) then
+        allocate(ws%fs(0:maxs,2),ws%fm(0:maxm,2),ws%fl(0:maxl,2))
+        allocate(ws%bz(nbf),ws%zwght(0:p))
+        ws%bz = 0.0d0
+    endif
+
     input(1) = dble(mod(IYD,1000))
     input(2) = dble(sec)
     input(3) = dble(glon)
     input(4) = dble(glat)
-    input(5) = dble(alt)
 
     refresh(1:5) = .false.
 
     ! Seasonal variations
-    if (input(1) .ne. previous(1)) then
+    if (input(1) .ne. ws%previous(1)) then
         AA = input(1)*twoPi/365.25d0
         do s = 0,MAXS
             BB = dble(s)*AA
-            fs(s,1) = dcos(BB)
-            fs(s,2) = dsin(BB)
+            ws%fs(s,1) = dcos(BB)
+            ws%fs(s,2) = dsin(BB)
         enddo
         refresh(1:5) = .true.
-        previous(1) = input(1)
+        ws%previous(1) = input(1)
     endif
 
     ! Hourly time changes, tidal variations
 
-    if (input(2) .ne. previous(2) .or. input(3) .ne. previous(3)) then
+    if (input(2) .ne. ws%previous(2) .or. input(3) .ne. ws%previous(3)) then
         AA = mod(input(2)/3600.d0 + input(3)/15.d0 + 48.d0,24.d0)
         BB = AA*twoPi/24.d0
         do l = 0,MAXL
             CC = dble(l)*BB
-            fl(l,1) = dcos(CC)
-            fl(l,2) = dsin(CC)
+            ws%fl(l,1) = dcos(CC)
+            ws%fl(l,2) = dsin(CC)
         enddo
         refresh(3) = .true.   ! tides
-        previous(2) = input(2)
+        ws%previous(2) = input(2)
     endif
 
     ! Longitudinal variations, stationary planetary waves
 
-    if (input(3) .ne. previous(3)) then
+    if (input(3) .ne. ws%previous(3)) then
         AA = input(3)*deg2rad
         do m = 0,MAXM
             BB = dble(m)*AA
-            fm(m,1) = dcos(BB)
-            fm(m,2) = dsin(BB)
+            ws%fm(m,1) = dcos(BB)
+            ws%fm(m,2) = dsin(BB)
         enddo
         refresh(2) = .true.   ! stationary planetary waves
-        previous(3) = input(3)
+        ws%previous(3) = input(3)
     endif
 
     ! Latitude
 
     theta = (90.0d0 - input(4))*deg2rad
-    if (input(4) .ne. glatalf) then
-        AA = (90.0d0 - input(4))*deg2rad        ! theta = colatitude in radians
-        call alfbasis(maxn,maxm,AA,gpbar,gvbar,gwbar)
+    if (input(4) .ne. ws%previous(4)) then
+        k = alfslot(ws%qtalf,maxn,maxm,theta)
         refresh(1:4) = .true.
-        glatalf = input(4)
-        previous(4) = input(4)
+        ws%previous(4) = input(4)
     endif
 
-    ! Altitude
-
-    if (input(5) .ne. previous(5)) then
-        call vertwght(input(5),zwght,lev)
-        previous(5) = input(5)
+    if (hwmprofile) then
+        ws%counts(sqtcall) = ws%counts(sqtcall) + 1
+        ws%counts(sqtrefresh:sqtrefresh+4) = ws%counts(sqtrefresh:sqtrefresh+4) + merge(1,0,refresh)
     endif
 
-    ! ====================================================================
-    ! Calculate the VSH functions
-    ! ====================================================================
+    return
+
+end subroutine hwmqt_terms
+
+! ------------------------------------------------------------
+! Projections u = bz.mparm(:,d) and v = bz.tparm(:,d) of level d.
+! bz is rebuilt where refresh (see hwmqt_terms) is set or the
+! level has a different number of basis functions than the last.
+! ------------------------------------------------------------
+
+subroutine hwmqt_level(ws,d,theta,refresh,u,v)
+
+    use hwm,only:hwmprofile
+    use hwmws
+    use qwm
+    implicit none
+
+    type(hwmworkspace),intent(inout) :: ws
+
+    integer(4),intent(in)   :: d
+    real(8),intent(in)      :: theta
+    logical,intent(inout)   :: refresh(5)
+    real(8),intent(out)     :: u,v
+
+    ! Local variables
+
+    real(8)                 :: cs,ss,cm,sm,cl,sl
+    real(8)                 :: vb,wb
+    real(8)                 :: sc
+
+    integer(4)              :: c,k,m,n,s,l
+
+    integer(4)              :: amaxs,amaxn
+    integer(4)              :: pmaxm,pmaxs,pmaxn
+    integer(4)              :: tmaxl,tmaxs,tmaxn
 
     u = 0.0d0
     v = 0.0d0
+    k = ws%qtalf%last
 
-    do b = 0,p
+    if (ws%priornb .ne. nb(d)) refresh(1:5) = .true. ! recalculate basis functions
+    ws%priornb = nb(d)
 
-        if (zwght(b) .eq. 0.d0) cycle
+    if (hwmprofile) then
+        ws%counts(sqtlevel) = ws%counts(sqtlevel) + 1
+        if (any(refresh)) ws%counts(sqtbz) = ws%counts(sqtbz) + 1
+    endif
 
-        d = b + lev
+    if (.not. any(refresh)) then
+        c = nb(d)
+        if (component(0)) u = dot_product(ws%bz(1:c),mparm(1:c,d))
+        if (component(1)) v = dot_product(ws%bz(1:c),tparm(1:c,d))
+        return
+    endif
 
-        if (priornb .ne. nb(d)) refresh(1:5) = .true. ! recalculate basis functions
-        priornb = nb(d)
+    amaxs = order(1,d)
+    amaxn = order(2,d)
+    pmaxm = order(3,d)
+    pmaxs = order(4,d)
+    pmaxn = order(5,d)
+    tmaxl = order(6,d)
+    tmaxs = order(7,d)
+    tmaxn = order(8,d)
 
-        if (.not. any(refresh)) then
-            c = nb(d)
-            if (component(0)) u = u + zwght(b)*dot_product(bz(1:c),mparm(1:c,d))
-            if (component(1)) v = v + zwght(b)*dot_product(bz(1:c),tparm(1:c,d))
-            cycle
-        endif
+    c = 1
 
-        amaxs = order(1,d)
-        amaxn = order(2,d)
-        pmaxm = order(3,d)
-        pmaxs = order(4,d)
-        pmaxn = order(5,d)
-        tmaxl = order(6,d)
-        tmaxs = order(7,d)
-        tmaxn = order(8,d)
+    ! ------------- Seasonal - Zonal average (m = 0) ----------------
 
-        c = 1
+    if (refresh(1) .and. content(1)) then
+        do n = 1,amaxn               ! s = 0
+            ws%bz(c) = -dsin(n*theta)   !
+            ws%bz(c+1) = dsin(n*theta)
+            c = c + 2
+        enddo
+        do s = 1,amaxs                   ! Seasonal variations
+            cs = ws%fs(s,1)
+            ss = ws%fs(s,2)
+            do n = 1,amaxn
+                sc = dsin(n*theta)
+                ws%bz(c) = -sc*cs   ! Cr     A
+                ws%bz(c+1) = sc*ss  ! Ci     B
+                ws%bz(c+2) = sc*cs
+                ws%bz(c+3) = -sc*ss
+                c = c + 4
+            enddo
+        enddo
+        ws%cseason = c
+    else
+        c = ws%cseason
+    endif
 
-        ! ------------- Seasonal - Zonal average (m = 0) ----------------
+    ! ---------------- Stationary planetary waves --------------------
 
-        if (refresh(1) .and. content(1)) then
-            do n = 1,amaxn               ! s = 0
-                bz(c) = -dsin(n*theta)   !
-                bz(c+1) = dsin(n*theta)
-                c = c + 2
+    if (refresh(2) .and. content(2)) then
+        do m = 1,pmaxm
+            cm = ws%fm(m,1)*wavefactor(m)
+            sm = ws%fm(m,2)*wavefactor(m)
+            do n = m,pmaxn           ! s = 0
+                vb = ws%qtalf%v(n,m,k)
+                wb = ws%qtalf%w(n,m,k)
+                ws%bz(c) =   -vb*cm    ! Cr * (cm) * -vb   A
+                ws%bz(c+1) =  vb*sm    ! Ci * (sm) *  vb   B
+                ws%bz(c+2) = -wb*sm	! Br * (sm) * -wb   C
+                ws%bz(c+3) = -wb*cm	! Bi * (cm) * -wb   D
+                c = c + 4
             enddo
-            do s = 1,amaxs                   ! Seasonal variations
-                cs = fs(s,1)
-                ss = fs(s,2)
-                do n = 1,amaxn
-                    sc = dsin(n*theta)
-                    bz(c) = -sc*cs   ! Cr     A
-                    bz(c+1) = sc*ss  ! Ci     B
-                    bz(c+2) = sc*cs
-                    bz(c+3) = -sc*ss
-                    c = c + 4
+            do s = 1,pmaxs
+                cs = ws%fs(s,1)
+                ss = ws%fs(s,2)
+                do n = m,pmaxn
+                    vb = ws%qtalf%v(n,m,k)
+                    wb = ws%qtalf%w(n,m,k)
+                    ws%bz(c) =   -vb*cm*cs	! Crc * (cmcs) * -vb   A
+                    ws%bz(c+1) =  vb*sm*cs ! Cic * (smcs) *  vb   B
+                    ws%bz(c+2) = -wb*sm*cs	! Brc * (smcs) * -wb   C
+                    ws%bz(c+3) = -wb*cm*cs	! Bic * (cmcs) * -wb   D
+                    ws%bz(c+4) = -vb*cm*ss	! Crs * (cmss) * -vb   E
+                    ws%bz(c+5) =  vb*sm*ss ! Cis * (smss) *  vb   F
+                    ws%bz(c+6) = -wb*sm*ss	! Brs * (smss) * -wb   G
+                    ws%bz(c+7) = -wb*cm*ss	! Bis * (cmss) * -wb   H
+                    c = c + 8
                 enddo
             enddo
-            cseason = c
-        else
-            c = cseason
-        endif
+            ws%cwave = c
+        enddo
+    else
+        c = ws%cwave
+    endif
 
-        ! ---------------- Stationary planetary waves --------------------
-
-        if (refresh(2) .and. content(2)) then
-            do m = 1,pmaxm
-                cm = fm(m,1)*wavefactor(m)
-                sm = fm(m,2)*wavefactor(m)
-                do n = m,pmaxn           ! s = 0
-                    vb = gvbar(n,m)
-                    wb = gwbar(n,m)
-                    bz(c) =   -vb*cm    ! Cr * (cm) * -vb   A
-                    bz(c+1) =  vb*sm    ! Ci * (sm) *  vb   B
-                    bz(c+2) = -wb*sm	! Br * (sm) * -wb   C
-                    bz(c+3) = -wb*cm	! Bi * (cm) * -wb   D
-                    c = c + 4
-                enddo
-                do s = 1,pmaxs
-                    cs = fs(s,1)
-                    ss = fs(s,2)
-                    do n = m,pmaxn
-                        vb = gvbar(n,m)
-                        wb = gwbar(n,m)
-                        bz(c) =   -vb*cm*cs	! Crc * (cmcs) * -vb   A
-                        bz(c+1) =  vb*sm*cs ! Cic * (smcs) *  vb   B
-                        bz(c+2) = -wb*sm*cs	! Brc * (smcs) * -wb   C
-                        bz(c+3) = -wb*cm*cs	! Bic * (cmcs) * -wb   D
-                        bz(c+4) = -vb*cm*ss	! Crs * (cmss) * -vb   E
-                        bz(c+5) =  vb*sm*ss ! Cis * (smss) *  vb   F
-                        bz(c+6) = -wb*sm*ss	! Brs * (smss) * -wb   G
-                        bz(c+7) = -wb*cm*ss	! Bis * (cmss) * -wb   H
-                        c = c + 8
-                    enddo
-                enddo
-                cwave = c
-            enddo
-        else
-            c = cwave
-        endif
+    ! ---------------- Migrating Solar Tides ---------------------
 
-        ! ---------------- Migrating Solar Tides ---------------------
-
-        if (refresh(3) .and. content(3)) then
-            do l = 1,tmaxl
-                cl = fl(l,1)*tidefactor(l)
-                sl = fl(l,2)*tidefactor(l)
-                do n = l,tmaxn           ! s = 0
-                    vb = gvbar(n,l)
-                    wb = gwbar(n,l)
-                    bz(c) =   -vb*cl    ! Cr * (cl) * -vb
-                    bz(c+1) =  vb*sl    ! Ci * (sl) *  vb
-                    bz(c+2) = -wb*sl	! Br * (sl) * -wb
-                    bz(c+3) = -wb*cl	! Bi * (cl) * -wb
-                    c = c + 4
-                enddo
-                do s = 1,tmaxs
-                    cs = fs(s,1)
-                    ss = fs(s,2)
-                    do n = l,tmaxn
-                        vb = gvbar(n,l)
-                        wb = gwbar(n,l)
-                        bz(c) =   -vb*cl*cs	! Crc * (clcs) * -vb
-                        bz(c+1) =  vb*sl*cs ! Cic * (slcs) *  vb
-                        bz(c+2) = -wb*sl*cs	! Brc * (slcs) * -wb
-                        bz(c+3) = -wb*cl*cs	! Bic * (clcs) * -wb
-                        bz(c+4) = -vb*cl*ss	! Crs * (clss) * -vb
-                        bz(c+5) =  vb*sl*ss ! Cis * (slss) *  vb
-                        bz(c+6) = -wb*sl*ss	! Brs * (slss) * -wb
-                        bz(c+7) = -wb*cl*ss	! Bis * (clss) * -wb
-                        c = c + 8
-                    enddo
+    if (refresh(3) .and. content(3)) then
+        do l = 1,tmaxl
+            cl = ws%fl(l,1)*tidefactor(l)
+            sl = ws%fl(l,2)*tidefactor(l)
+            do n = l,tmaxn           ! s = 0
+                vb = ws%qtalf%v(n,l,k)
+                wb = ws%qtalf%w(n,l,k)
+                ws%bz(c) =   -vb*cl    ! Cr * (cl) * -vb
+                ws%bz(c+1) =  vb*sl    ! Ci * (sl) *  vb
+                ws%bz(c+2) = -wb*sl	! Br * (sl) * -wb
+                ws%bz(c+3) = -wb*cl	! Bi * (cl) * -wb
+                c = c + 4
+            enddo
+            do s = 1,tmaxs
+                cs = ws%fs(s,1)
+                ss = ws%fs(s,2)
+                do n = l,tmaxn
+                    vb = ws%qtalf%v(n,l,k)
+                    wb = ws%qtalf%w(n,l,k)
+                    ws%bz(c) =   -vb*cl*cs	! Crc * (clcs) * -vb
+                    ws%bz(c+1) =  vb*sl*cs ! Cic * (slcs) *  vb
+                    ws%bz(c+2) = -wb*sl*cs	! Brc * (slcs) * -wb
+                    ws%bz(c+3) = -wb*cl*cs	! Bic * (clcs) * -wb
+                    ws%bz(c+4) = -vb*cl*ss	! Crs * (clss) * -vb
+                    ws%bz(c+5) =  vb*sl*ss ! Cis * (slss) *  vb
+                    ws%bz(c+6) = -wb*sl*ss	! Brs * (slss) * -wb
+                    ws%bz(c+7) = -wb*cl*ss	! Bis * (clss) * -wb
+                    c = c + 8
                 enddo
-                ctide = c
             enddo
-        else
-            c = ctide
-        endif
-
-        ! ---------------- Non-Migrating Solar Tides ------------------
-
-        ! TBD
+            ws%ctide = c
+        enddo
+    else
+        c = ws%ctide
+    endif
 
-        c = c - 1
+    ! ---------------- Non-Migrating Solar Tides ------------------
 
-        ! ====================================================================
-        ! Calculate the wind components
-        ! ====================================================================
+    ! TBD
 
-        if (component(0)) u = u + zwght(b)*dot_product(bz(1:c),mparm(1:c,d))
-        if (component(1)) v = v + zwght(b)*dot_product(bz(1:c),tparm(1:c,d))
+    c = c - 1
 
-    enddo
+    ! ====================================================================
+    ! Calculate the wind components
+    ! ====================================================================
 
-    w(1) = sngl(v)
-    w(2) = sngl(u)
+    if (component(0)) u = dot_product(ws%bz(1:c),mparm(1:c,d))
+    if (component(1)) v = dot_product(ws%bz(1:c),tparm(1:c,d))
 
     return
 
-end subroutine hwmqt
+end subroutine hwmqt_level
 
 
 subroutine vertwght(alt,wght,iz)
@@ -915,6 +1723,7 @@ subroutine initdwm(nmaxout,mmaxout)
     integer(4),intent(out)     :: nmaxout, mmaxout
 
     call findandopen(dwmdefault,23)
+    if (hwmstatus .ne. 0) return
     if (allocated(termarr)) deallocate(termarr,coeff)
     read(23) nterm, mmax, nmax
     allocate(termarr(0:2, 0:nterm-1))
@@ -924,15 +1733,7 @@ subroutine initdwm(nmaxout,mmaxout)
     read(23) twidth
     close(23)
 
-    if (allocated(termval)) deallocate(termval,dpbar,dvbar,dwbar,mltterms,vshterms)
     nvshterm = ( ((nmax+1)*(nmax+2) - (nmax-mmax)*(nmax-mmax+1))/2 - 1 ) * 4 - 2*nmax
-    allocate(termval(0:1, 0:nterm-1))
-    allocate(dpbar(0:nmax,0:mmax),dvbar(0:nmax,0:mmax),dwbar(0:nmax,0:mmax))
-    allocate(mltterms(0:mmax,0:1))
-    allocate(vshterms(0:1, 0:nvshterm-1))
-    dpbar = 0
-    dvbar = 0
-    dwbar = 0
 
     nmaxout = nmax
     mmaxout = mmax
@@ -945,69 +1746,128 @@ end subroutine initdwm
 
 subroutine dwm07(IYD,SEC,ALT,GLAT,GLON,AP,DW)
 
-    use hwm
+    use hwm,only:hwminit
+    use hwmws
+    implicit none
+
+    INTEGER,intent(in)      :: IYD
+    REAL(4),intent(in)      :: SEC,ALT,GLAT,GLON
+    REAL(4),intent(in)      :: AP(2)
+    REAL(4),intent(out)     :: DW(2)
+
+    if (hwminit) call inithwm()
+
+    call dwm07_ws(hwmdefaultws,IYD,SEC,ALT,GLAT,GLON,AP,DW)
+
+    return
+
+end subroutine dwm07
+
+subroutine dwm07_ws(ws,IYD,SEC,ALT,GLAT,GLON,AP,DW)
+
+    use hwm,only:hwmprofile
+    use hwmws
     use dwm
     implicit none
 
+    type(hwmworkspace),intent(inout) :: ws
     INTEGER,intent(in)      :: IYD
     REAL(4),intent(in)      :: SEC,ALT,GLAT,GLON
     REAL(4),intent(in)      :: AP(2)
     REAL(4),intent(out)     :: DW(2)
 
-    real(4), save           :: day, ut, mlat, mlon, mlt, kp
     real(4)                 :: mmpwind, mzpwind
-    real(4), save           :: f1e, f1n, f2e, f2n
-    real(4), save           :: glatlast=1.0e16, glonlast=1.0e16
-    real(4), save           :: daylast=1.0e16, utlast=1.0e16, aplast=1.0e16
     real(4), parameter      :: talt=125.0 !, twidth=5.0
 
-    real(4), external       :: ap2kp, mltcalc
+    real(4), external       :: ap2kp, mltcalc_ws
+
+    logical                 :: profile
+    integer(8)              :: t0, t1
+
+    profile = hwmprofile
+    if (profile) then
+      t0 = stattick()
+      ws%counts(sdwcall) = ws%counts(sdwcall) + 1
+    endif
 
     !CONVERT AP TO KP
-    if (ap(2) .ne. aplast) then
-      kp = ap2kp(ap(2))
+    if (ap(2) .ne. ws%aplast) then
+      ws%kp = ap2kp(ap(2))
+      if (profile) ws%counts(sdwkp) = ws%counts(sdwkp) + 1
     endif
 
     !CONVERT GEO LAT/LON TO QD LAT/LON
-    if ((glat .ne. glatlast) .or. (glon .ne. glonlast)) then
-      call gd2qd(glat,glon,mlat,mlon,f1e,f1n,f2e,f2n)
+    if ((glat .ne. ws%glatlast) .or. (glon .ne. ws%glonlast)) then
+      if (profile) t1 = stattick()
+      call gd2qd_ws(ws,glat,glon,ws%mlat,ws%mlon,ws%f1e,ws%f1n,ws%f2e,ws%f2n)
+      if (profile) then
+        ws%counts(sdwgd2qd) = ws%counts(sdwgd2qd) + 1
+        ws%ticks(tgd2qd) = ws%ticks(tgd2qd) + stattick() - t1
+      endif
     endif
 
     !COMPUTE QD MAGNETIC LOCAL TIME (LOW-PRECISION)
-    day = real(mod(iyd,1000))
-    ut = sec / 3600.0
-    if ((day .ne. daylast) .or. (ut .ne. utlast) .or. &
-        (glat .ne. glatlast) .or. (glon .ne. glonlast)) then
-      mlt = mltcalc(mlat,mlon,day,ut)
+    ws%day = real(mod(iyd,1000))
+    ws%ut = sec / 3600.0
+    if ((ws%day .ne. ws%daylast) .or. (ws%ut .ne. ws%utlast) .or. &
+        (glat .ne. ws%glatlast) .or. (glon .ne. ws%glonlast)) then
+      if (profile) t1 = stattick()
+      ws%mlt = mltcalc_ws(ws,ws%mlat,ws%mlon,ws%day,ws%ut)
+      if (profile) then
+        ws%counts(sdwmlt) = ws%counts(sdwmlt) + 1
+        ws%ticks(tmlt) = ws%ticks(tmlt) + stattick() - t1
+      endif
     endif
 
     !RETRIEVE DWM WINDS
-    call dwm07b(mlt, mlat, kp, mmpwind, mzpwind)
+    if (profile) t1 = stattick()
+    call dwm07b_ws(ws, ws%mlt, ws%mlat, ws%kp, mmpwind, mzpwind)
+    if (profile) ws%ticks(tdwb) = ws%ticks(tdwb) + stattick() - t1
 
     !CONVERT TO GEOGRAPHIC COORDINATES
-    dw(1) = f2n*mmpwind + f1n*mzpwind
-    dw(2) = f2e*mmpwind + f1e*mzpwind
+    dw(1) = ws%f2n*mmpwind + ws%f1n*mzpwind
+    dw(2) = ws%f2e*mmpwind + ws%f1e*mzpwind
 
     !APPLY HEIGHT PROFILE
     dw = dw / (1 + exp(-(alt - talt)/twidth))
 
-    glatlast = glat
-    glonlast = glon
-    daylast = day
-    utlast = ut
-    aplast = ap(2)
+    ws%glatlast = glat
+    ws%glonlast = glon
+    ws%daylast = ws%day
+    ws%utlast = ws%ut
+    ws%aplast = ap(2)
+
+    if (profile) ws%ticks(tdw) = ws%ticks(tdw) + stattick() - t0
 
     return
 
-end subroutine dwm07
+end subroutine dwm07_ws
 
 subroutine dwm07b(mlt, mlat, kp, mmpwind, mzpwind)
 
+    use hwm,only:hwminit
+    use hwmws
+    implicit none
+
+    real(4),intent(in)        :: mlt, mlat, kp
+    real(4),intent(out)       :: mmpwind, mzpwind
+
+    if (hwminit) call inithwm()
+
+    call dwm07b_ws(hwmdefaultws, mlt, mlat, kp, mmpwind, mzpwind)
+
+    return
+
+end subroutine dwm07b
+
+subroutine dwm07b_ws(ws, mlt, mlat, kp, mmpwind, mzpwind)
+
     use hwm
+    use hwmws
     use dwm
-    use alf,only:alfbasis
     implicit none
 
+    type(hwmworkspace),intent(inout) :: ws
     real(4),intent(in)        :: mlt       !Magnetic local time (hours)
     real(4),intent(in)        :: mlat      !Magnetic latitude (degrees)
     real(4),intent(in)        :: kp        !3-hour Kp
@@ -1016,11 +1876,9 @@ subroutine dwm07b(mlt, mlat, kp, mmpwind, mzpwind)
     real(4),intent(out)       :: mzpwind   !Zon. disturbance wind (+east, QD coordinates)
 
     ! Local variables
-    integer(4)                :: iterm, ivshterm, n, m
+    integer(4)                :: iterm, ivshterm, k, n, m
     real(4)                   :: termvaltemp(0:1)
-    real(4),save              :: kpterms(0:2)
     real(4)                   :: latwgtterm
-    real(4),save              :: mltlast=1.e16, mlatlast=1.e16, kplast=1.e16
     real(8)                   :: theta, phi, mphi
 
     real(4),external          :: latwgt2
@@ -1028,49 +1886,64 @@ subroutine dwm07b(mlt, mlat, kp, mmpwind, mzpwind)
     !LOAD MODEL PARAMETERS IF NECESSARY
     if (dwminit) call initdwm(nmaxdwm, mmaxdwm)
 
+    if (.not. allocated(ws%termval)) then
+        allocate(ws%termval(0:1, 0:nterm-1))
+        allocate(ws%mltterms(0:mmax,0:1))
+        allocate(ws%vshterms(0:1, 0:nvshterm-1))
+    endif
+
     !COMPUTE LATITUDE PART OF VSH TERMS
-    if (mlat .ne. mlatlast) then
+    if (mlat .ne. ws%mlatlast) then
         theta = (90.d0 - dble(mlat))*dtor
-        call alfbasis(nmax,mmax,theta,dpbar,dvbar,dwbar)
+        k = alfslot(ws%dwmalf,nmax,mmax,theta)
+    endif
+    k = ws%dwmalf%last
+
+    if (hwmprofile) then
+        ws%counts(sdwbcall) = ws%counts(sdwbcall) + 1
+        if (mlt .ne. ws%mltlast) ws%counts(sdwbmlt) = ws%counts(sdwbmlt) + 1
+        if ((mlat .ne. ws%mlatlast) .or. (mlt .ne. ws%mltlast)) &
+            ws%counts(sdwbvsh) = ws%counts(sdwbvsh) + 1
+        if (kp .ne. ws%kplast) ws%counts(sdwbkp) = ws%counts(sdwbkp) + 1
     endif
 
     !COMPUTE MLT PART OF VSH TERMS
-    if (mlt .ne. mltlast) then
+    if (mlt .ne. ws%mltlast) then
         phi = dble(mlt)*dtor*15.d0
         do m = 0, mmax
             mphi = dble(m)*phi
-            mltterms(m,0) = dcos(mphi)
-            mltterms(m,1) = dsin(mphi)
+            ws%mltterms(m,0) = dcos(mphi)
+            ws%mltterms(m,1) = dsin(mphi)
         enddo
     endif
 
     !COMPUTE VSH TERMS
-    if ((mlat .ne. mlatlast) .or. (mlt .ne. mltlast)) then
+    if ((mlat .ne. ws%mlatlast) .or. (mlt .ne. ws%mltlast)) then
         ivshterm = 0
         do n = 1, nmax
-            vshterms(0,ivshterm)   = -sngl(dvbar(n,0)*mltterms(0,0))
-            vshterms(0,ivshterm+1) =  sngl(dwbar(n,0)*mltterms(0,0))
-            vshterms(1,ivshterm)   = -vshterms(0,ivshterm+1)
-            vshterms(1,ivshterm+1) =  vshterms(0,ivshterm)
+            ws%vshterms(0,ivshterm)   = -sngl(ws%dwmalf%v(n,0,k)*ws%mltterms(0,0))
+            ws%vshterms(0,ivshterm+1) =  sngl(ws%dwmalf%w(n,0,k)*ws%mltterms(0,0))
+            ws%vshterms(1,ivshterm)   = -ws%vshterms(0,ivshterm+1)
+            ws%vshterms(1,ivshterm+1) =  ws%vshterms(0,ivshterm)
             ivshterm = ivshterm + 2
             do m = 1, mmax
                 if (m .gt. n) cycle
-                vshterms(0,ivshterm)   = -sngl(dvbar(n,m)*mltterms(m,0))
-                vshterms(0,ivshterm+1) =  sngl(dvbar(n,m)*mltterms(m,1))
-                vshterms(0,ivshterm+2) =  sngl(dwbar(n,m)*mltterms(m,1))
-                vshterms(0,ivshterm+3) =  sngl(dwbar(n,m)*mltterms(m,0))
-                vshterms(1,ivshterm)   = -vshterms(0,ivshterm+2)
-                vshterms(1,ivshterm+1) = -vshterms(0,ivshterm+3)
-                vshterms(1,ivshterm+2) =  vshterms(0,ivshterm)
-                vshterms(1,ivshterm+3) =  vshterms(0,ivshterm+1)
+                ws%vshterms(0,ivshterm)   = -sngl(ws%dwmalf%v(n,m,k)*ws%mltterms(m,0))
+                ws%vshterms(0,ivshterm+1) =  sngl(ws%dwmalf%v(n,m,k)*ws%mltterms(m,1))
+                ws%vshterms(0,ivshterm+2) =  sngl(ws%dwmalf%w(n,m,k)*ws%mltterms(m,1))
+                ws%vshterms(0,ivshterm+3) =  sngl(ws%dwmalf%w(n,m,k)*ws%mltterms(m,0))
+                ws%vshterms(1,ivshterm)   = -ws%vshterms(0,ivshterm+2)
+                ws%vshterms(1,ivshterm+1) = -ws%vshterms(0,ivshterm+3)
+                ws%vshterms(1,ivshterm+2) =  ws%vshterms(0,ivshterm)
+                ws%vshterms(1,ivshterm+3) =  ws%vshterms(0,ivshterm+1)
                 ivshterm = ivshterm + 4
             enddo
         enddo
     endif
 
     !COMPUTE KP TERMS
-    if (kp .ne. kplast) then
-        call kpspl3(kp, kpterms)
+    if (kp .ne. ws%kplast) then
+        call kpspl3(kp, ws%kpterms)
     endif
 
     !COMPUTE LATITUDINAL WEIGHTING TERM
@@ -1079,23 +1952,23 @@ subroutine dwm07b(mlt, mlat, kp, mmpwind, mzpwind)
     !GENERATE COUPLED TERMS
     do iterm = 0, nterm-1
         termvaltemp = (/1.0, 1.0/)
-        if (termarr(0,iterm) .ne. 999) termvaltemp = termvaltemp * vshterms(0:1,termarr(0,iterm))
-        if (termarr(1,iterm) .ne. 999) termvaltemp = termvaltemp * kpterms(termarr(1,iterm))
+        if (termarr(0,iterm) .ne. 999) termvaltemp = termvaltemp * ws%vshterms(0:1,termarr(0,iterm))
+        if (termarr(1,iterm) .ne. 999) termvaltemp = termvaltemp * ws%kpterms(termarr(1,iterm))
         if (termarr(2,iterm) .ne. 999) termvaltemp = termvaltemp * latwgtterm
-        termval(0:1,iterm) = termvaltemp(0:1)
+        ws%termval(0:1,iterm) = termvaltemp(0:1)
     enddo
 
     !APPLY COEFFICIENTS
-    mmpwind = dot_product(coeff, termval(0,0:nterm-1))
-    mzpwind = dot_product(coeff, termval(1,0:nterm-1))
+    mmpwind = dot_product(coeff, ws%termval(0,0:nterm-1))
+    mzpwind = dot_product(coeff, ws%termval(1,0:nterm-1))
 
-    mlatlast = mlat
-    mltlast = mlt
-    kplast = kp
+    ws%mlatlast = mlat
+    ws%mltlast = mlt
+    ws%kplast = kp
 
     return
 
-end subroutine dwm07b
+end subroutine dwm07b_ws
 
 !=================================================================================
 !                           Convert Ap to Kp
@@ -1136,93 +2009,42 @@ end function ap2kp
 !
 !  Converts geodetic coordinates to Quasi-Dipole coordinates (Richmond, J. Geomag.
 !  Geoelec., 1995, p. 191), using a spherical harmonic representation.
+!  The coefficients are in module gd2qdc, loaded by inithwm.
 !
 ! ########################################################################
 
-module gd2qdc
+subroutine gd2qd(glatin,glon,qlat,qlon,f1e,f1n,f2e,f2n)
 
+    use hwm,only:hwminit
+    use hwmws
     implicit none
 
-    integer(4)               :: nterm, nmax, mmax  !Spherical harmonic expansion parameters
-
-    real(8), allocatable     :: coeff(:,:)         !Coefficients for spherical harmonic expansion
-    real(8), allocatable     :: xcoeff(:)          !Coefficients for x coordinate
-    real(8), allocatable     :: ycoeff(:)          !Coefficients for y coordinate
-    real(8), allocatable     :: zcoeff(:)          !Coefficients for z coordinate
-    real(8), allocatable     :: sh(:)              !Array to hold spherical harmonic fuctions
-    real(8), allocatable     :: shgradtheta(:)     !Array to hold spherical harmonic gradients
-    real(8), allocatable     :: shgradphi(:)       !Array to hold spherical harmonic gradients
-    real(8), allocatable     :: normadj(:)         !Adjustment to VSH normalization factor
-    real(4)                  :: epoch, alt
-
-    real(8), parameter       :: pi = 3.1415926535897932d0
-    real(8), parameter       :: dtor = pi/180.0d0
-    real(8), parameter       :: sineps = 0.39781868d0
-
-    logical                  :: gd2qdinit = .true.
-
-contains
-
-    subroutine initgd2qd()
-
-        use hwm
-        implicit none
-
-        character(128), parameter   :: datafile='gd2qd.dat'
-        integer(4)                  :: iterm, n
-        integer(4)                  :: j
-
-        call findandopen(datafile,23)
-        read(23) nmax, mmax, nterm, epoch, alt
-        if (allocated(coeff)) then
-            deallocate(coeff,xcoeff,ycoeff,zcoeff,sh,shgradtheta,shgradphi,normadj)
-        endif
-        allocate( coeff(0:nterm-1, 0:2) )
-        read(23) coeff
-        close(23)
-
-        allocate( xcoeff(0:nterm-1) )
-        allocate( ycoeff(0:nterm-1) )
-        allocate( zcoeff(0:nterm-1) )
-        allocate( sh(0:nterm-1) )
-        allocate( shgradtheta(0:nterm-1) )
-        allocate( shgradphi(0:nterm-1) )
-        allocate( normadj(0:nmax) )
-
-        do iterm = 0, nterm-1
-            xcoeff(iterm) = coeff(iterm,0)
-            ycoeff(iterm) = coeff(iterm,1)
-            zcoeff(iterm) = coeff(iterm,2)
-        enddo
-
-        do n = 0, nmax
-            normadj(n) = dsqrt(dble(n*(n+1)))
-        end do
-
-        nmaxqdc = nmax
-        mmaxqdc = mmax
+    real(4), intent(in)         :: glatin, glon
+    real(4), intent(out)        :: qlat, qlon
+    real(4), intent(out)        :: f1e, f1n, f2e, f2n
 
-        gd2qdinit = .false.
+    if (hwminit) call inithwm()
 
-        return
+    call gd2qd_ws(hwmdefaultws,glatin,glon,qlat,qlon,f1e,f1n,f2e,f2n)
 
-    end subroutine initgd2qd
+    return
 
-end module gd2qdc
+end subroutine gd2qd
 
-subroutine gd2qd(glatin,glon,qlat,qlon,f1e,f1n,f2e,f2n)
+subroutine gd2qd_ws(ws,glatin,glon,qlat,qlon,f1e,f1n,f2e,f2n)
 
-    use hwm
+    use hwmws
     use gd2qdc
-    use alf
 
     implicit none
 
+    type(hwmworkspace), intent(inout) :: ws
+
     real(4), intent(in)         :: glatin, glon
     real(4), intent(out)        :: qlat, qlon
     real(4), intent(out)        :: f1e, f1n, f2e, f2n
 
-    integer(4)               :: n, m, i
+    integer(4)               :: n, m, i, k
     real(8)                  :: glat, theta, phi
     real(8)                  :: mphi, cosmphi, sinmphi
     real(8)                  :: x, y, z
@@ -1231,21 +2053,21 @@ subroutine gd2qd(glatin,glon,qlat,qlon,f1e,f1n,f2e,f2n)
     real(8)                  :: xgradphi, ygradphi, zgradphi
     real(8)                  :: qlonrad
 
-   if (gd2qdinit) call initgd2qd()
+    if (gd2qdinit) call initgd2qd()
+    if (.not. allocated(ws%sh)) then
+        allocate(ws%sh(0:nterm-1),ws%shgradtheta(0:nterm-1),ws%shgradphi(0:nterm-1))
+    endif
 
     glat = dble(glatin)
-    if (glat .ne. glatalf) then
-      theta = (90.d0 - glat) * dtor
-      call alfbasis(nmax,mmax,theta,gpbar,gvbar,gwbar)
-      glatalf = glat
-    endif
+    theta = (90.d0 - glat) * dtor
+    k = alfslot(ws%qdalf,nmax,mmax,theta)
     phi = dble(glon) * dtor
 
     i = 0
     do n = 0, nmax
-      sh(i) = gpbar(n,0)
-      shgradtheta(i) =  gvbar(n,0) * normadj(n)
-      shgradphi(i) = 0
+      ws%sh(i) = ws%qdalf%p(n,0,k)
+      ws%shgradtheta(i) =  ws%qdalf%v(n,0,k) * normadj(n)
+      ws%shgradphi(i) = 0
       i = i + 1
     enddo
     do m = 1, mmax
@@ -1253,19 +2075,19 @@ subroutine gd2qd(glatin,glon,qlat,qlon,f1e,f1n,f2e,f2n)
       cosmphi = dcos(mphi)
       sinmphi = dsin(mphi)
       do n = m, nmax
-        sh(i)   = gpbar(n,m) * cosmphi
-        sh(i+1) = gpbar(n,m) * sinmphi
-        shgradtheta(i)   =  gvbar(n,m) * normadj(n) * cosmphi
-        shgradtheta(i+1) =  gvbar(n,m) * normadj(n) * sinmphi
-        shgradphi(i)     = -gwbar(n,m) * normadj(n) * sinmphi
-        shgradphi(i+1)   =  gwbar(n,m) * normadj(n) * cosmphi
+        ws%sh(i)   = ws%qdalf%p(n,m,k) * cosmphi
+        ws%sh(i+1) = ws%qdalf%p(n,m,k) * sinmphi
+        ws%shgradtheta(i)   =  ws%qdalf%v(n,m,k) * normadj(n) * cosmphi
+        ws%shgradtheta(i+1) =  ws%qdalf%v(n,m,k) * normadj(n) * sinmphi
+        ws%shgradphi(i)     = -ws%qdalf%w(n,m,k) * normadj(n) * sinmphi
+        ws%shgradphi(i+1)   =  ws%qdalf%w(n,m,k) * normadj(n) * cosmphi
         i = i + 2
       enddo
     enddo
 
-    x = dot_product(sh, xcoeff)
-    y = dot_product(sh, ycoeff)
-    z = dot_product(sh, zcoeff)
+    x = dot_product(ws%sh, xcoeff)
+    y = dot_product(ws%sh, ycoeff)
+    z = dot_product(ws%sh, zcoeff)
 
     qlonrad = datan2(y,x)
     cosqlon = dcos(qlonrad)
@@ -1275,13 +2097,13 @@ subroutine gd2qd(glatin,glon,qlat,qlon,f1e,f1n,f2e,f2n)
     qlat = sngl(datan2(z,cosqlat) / dtor)
     qlon = sngl(qlonrad / dtor)
 
-    xgradtheta = dot_product(shgradtheta, xcoeff)
-    ygradtheta = dot_product(shgradtheta, ycoeff)
-    zgradtheta = dot_product(shgradtheta, zcoeff)
+    xgradtheta = dot_product(ws%shgradtheta, xcoeff)
+    ygradtheta = dot_product(ws%shgradtheta, ycoeff)
+    zgradtheta = dot_product(ws%shgradtheta, zcoeff)
 
-    xgradphi = dot_product(shgradphi, xcoeff)
-    ygradphi = dot_product(shgradphi, ycoeff)
-    zgradphi = dot_product(shgradphi, zcoeff)
+    xgradphi = dot_product(ws%shgradphi, xcoeff)
+    ygradphi = dot_product(ws%shgradphi, ycoeff)
+    zgradphi = dot_product(ws%shgradphi, zcoeff)
 
     f1e = sngl(-zgradtheta*cosqlat + (xgradtheta*cosqlon + ygradtheta*sinqlon)*z )
     f1n = sngl(-zgradphi*cosqlat   + (xgradphi*cosqlon   + ygradphi*sinqlon)*z )
@@ -1290,7 +2112,7 @@ subroutine gd2qd(glatin,glon,qlat,qlon,f1e,f1n,f2e,f2n)
 
     return
 
-end subroutine gd2qd
+end subroutine gd2qd_ws
 
 !==================================================================================
 !                  (Function) Calculate Magnetic Local Time
@@ -1298,16 +2120,34 @@ end subroutine gd2qd
 
 function mltcalc(qlat,qlon,day,ut)
 
-    use hwm
+    use hwm,only:hwminit
+    use hwmws
+    implicit none
+
+    real(4), intent(in)      :: qlat, qlon, day, ut
+    real(4)                  :: mltcalc
+    real(4), external        :: mltcalc_ws
+
+    if (hwminit) call inithwm()
+
+    mltcalc = mltcalc_ws(hwmdefaultws,qlat,qlon,day,ut)
+
+    return
+
+end function mltcalc
+
+function mltcalc_ws(ws,qlat,qlon,day,ut)
+
+    use hwmws
     use gd2qdc
-    use alf
 
     implicit none
 
+    type(hwmworkspace), intent(inout) :: ws
     real(4), intent(in)      :: qlat, qlon, day, ut
-    real(4)                  :: mltcalc
+    real(4)                  :: mltcalc_ws
 
-    integer(4)               :: n, m, i
+    integer(4)               :: n, m, i, k
     real(8)                  :: asunglat, asunglon, asunqlon
     real(8)                  :: glat, theta, phi
     real(8)                  :: mphi, cosmphi, sinmphi
@@ -1315,7 +2155,10 @@ function mltcalc(qlat,qlon,day,ut)
     real(8)                  :: cosqlat, cosqlon, sinqlon
     real(8)                  :: qlonrad
 
-    if (gd2qdinit) call initgd2qd()
+     if (gd2qdinit) call initgd2qd()
+    if (.not. allocated(ws%sh)) then
+        allocate(ws%sh(0:nterm-1),ws%shgradtheta(0:nterm-1),ws%shgradphi(0:nterm-1))
+    endif
 
     !COMPUTE GEOGRAPHIC COORDINATES OF ANTI-SUNWARD DIRECTION (LOW PRECISION)
     asunglat = -asin(sin((dble(day)+dble(ut)/24.0d0-80.0d0)*dtor) * sineps) / dtor
@@ -1323,11 +2166,11 @@ function mltcalc(qlat,qlon,day,ut)
 
     !COMPUTE MAGNETIC COORDINATES OF ANTI-SUNWARD DIRECTION
     theta = (90.d0 - asunglat) * dtor
-    call alfbasis(nmax,mmax,theta,spbar,svbar,swbar)
+    k = alfslot(ws%qdalf,nmax,mmax,theta)
     phi = asunglon * dtor
     i = 0
     do n = 0, nmax
-      sh(i) = spbar(n,0)
+      ws%sh(i) = ws%qdalf%p(n,0,k)
       i = i + 1
     enddo
     do m = 1, mmax
@@ -1335,21 +2178,21 @@ function mltcalc(qlat,qlon,day,ut)
       cosmphi = dcos(mphi)
       sinmphi = dsin(mphi)
       do n = m, nmax
-        sh(i)   = spbar(n,m) * cosmphi
-        sh(i+1) = spbar(n,m) * sinmphi
+        ws%sh(i)   = ws%qdalf%p(n,m,k) * cosmphi
+        ws%sh(i+1) = ws%qdalf%p(n,m,k) * sinmphi
         i = i + 2
       enddo
     enddo
-    x = dot_product(sh, xcoeff)
-    y = dot_product(sh, ycoeff)
+    x = dot_product(ws%sh, xcoeff)
+    y = dot_product(ws%sh, ycoeff)
     asunqlon = sngl(datan2(y,x) / dtor)
 
     !COMPUTE MLT
-    mltcalc = (qlon - asunqlon) / 15.0
+    mltcalc_ws = (qlon - asunqlon) / 15.0
 
     return
 
-end function mltcalc
+end function mltcalc_ws
 
 !================================================================================
 !                           Cubic Spline interpolation of Kp
@@ -1425,6 +2268,7 @@ end function latwgt2
 
 subroutine findandopen(datafile,unitid)
 
+    use hwm,only:datadir,hwmstop,hwmstatus
     implicit none
 
     character(128)      :: datafile
@@ -1434,7 +2278,14 @@ subroutine findandopen(datafile,unitid)
     integer             :: i
 
     i = index(datafile,'bin')
-    if (i .eq. 0) then
+    if (len_trim(datadir) .gt. 0) then
+        ! explicit data directory, no search
+        inquire(file=trim(datadir)//'/'//trim(datafile),exist=havefile)
+        if (havefile .and. i .eq. 0) open(unit=unitid, &
+            file=trim(datadir)//'/'//trim(datafile),status='old',form='unformatted')
+        if (havefile .and. i .ne. 0) open(unit=unitid, &
+            file=trim(datadir)//'/'//trim(datafile),status='old',access='stream')
+    elseif (i .eq. 0) then
         inquire(file=trim(datafile),exist=havefile)
         if (havefile) open(unit=unitid,file=trim(datafile),status='old',form='unformatted')
         if (.not. havefile) then
@@ -1466,9 +2317,11 @@ subroutine findandopen(datafile,unitid)
 
     if (havefile) then
         return
-    else
+    elseif (hwmstop) then
         print *,"Can not find file ",trim(datafile)
         stop
+    else
+        hwmstatus = 1
     endif
 
 end subroutine findandopen
@@ -3,6 +3,20 @@
 import pytest
 
 
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory):
+    """Point the coefficient and table cache at a temporary directory.
+
+    ``Model()`` and ``numpy_backend.load_*()`` write their bundle to
+    :func:`pyhwm2014.qdtable.cache_dir`, which would otherwise be the
+    user's ``~/.cache/pyhwm2014``.
+    """
+    path = tmp_path_factory.mktemp("cache")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("PYHWM2014_CACHE", str(path))
+        yield path
+
+
 @pytest.fixture
 def hwm14_simple_height_profile():
     """Fixture providing a simple height profile HWM14 calculation."""
@@ -0,0 +1,366 @@
+"""Unit tests for the vectorized batch evaluation API."""
+
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from pyhwm2014 import (
+    HWM14,
+    canonicalize,
+    evaluate,
+    get_alf_cache_size,
+    get_num_threads,
+    height_profile,
+    init,
+    set_alf_cache_size,
+    set_num_threads,
+    set_profiling,
+    stats,
+    time_series,
+    time_to_iyd,
+    unique_points,
+)
+from pyhwm2014 import hwm14
+from pyhwm2014.batch import cache_hits, schedule
+
+
+class TestEvaluate:
+    """Test pyhwm2014.evaluate against the per-point Fortran interface."""
+
+    def test_matches_height_profile(self) -> None:
+        """Test that a batch height profile reproduces HWM14 option 1."""
+        h = HWM14(
+            altlim=[90, 200],
+            altstp=1,
+            ap=[-1, 35],
+            day=323,
+            option=1,
+            ut=11.66667,
+            verbose=False,
+            year=1993,
+        )
+        w = evaluate(93323, 11.66667 * 3600.0, h.altbins, -11.95, -76.77, ap=35)
+        assert w.shape == (111, 2)
+        np.testing.assert_array_equal(w[:, 1], np.asarray(h.Uwind, dtype=np.float32))
+        np.testing.assert_array_equal(w[:, 0], np.asarray(h.Vwind, dtype=np.float32))
+        assert pytest.approx(w[92, 1], rel=1e-3) == -16.502953
+
+    def test_matches_single_point_calls(self) -> None:
+        """Test random points against individual hwm14.hwm14 calls."""
+        rng = np.random.default_rng(14)
+        n = 50
+        iyd = 93000 + rng.integers(1, 366, n)
+        sec = rng.uniform(0.0, 86400.0, n)
+        alt = rng.uniform(0.0, 500.0, n)
+        glat = rng.uniform(-90.0, 90.0, n)
+        glon = rng.uniform(-180.0, 180.0, n)
+        ap = rng.choice([-1.0, 4.0, 35.0, 200.0], n)
+
+        w = evaluate(iyd, sec, alt, glat, glon, ap=ap)
+
+        expected = np.array(
+            [
+                hwm14.hwm14(iyd[i], sec[i], alt[i], glat[i], glon[i], -1, -1, -1, [-1, ap[i]])
+                for i in range(n)
+            ]
+        )
+        np.testing.assert_array_equal(w, expected)
+
+    def test_broadcast_shape(self) -> None:
+        """Test that inputs broadcast and the wind axis is appended last."""
+        alt = np.arange(100.0, 300.0, 50.0)[:, None]
+        glat = np.linspace(-30.0, 30.0, 3)[None, :]
+        w = evaluate(93323, 43200.0, alt, glat, -76.77)
+        assert w.shape == (4, 3, 2)
+        assert w.dtype == np.float32
+
+    def test_empty_input(self) -> None:
+        """Test that empty inputs return an empty result."""
+        w = evaluate(93323, 43200.0, np.array([]), 0.0, 0.0)
+        assert w.shape == (0, 2)
+
+    def test_components_sum_to_total(self) -> None:
+        """Test the single-pass quiet/disturbance/total decomposition."""
+        alt = np.arange(80.0, 400.0, 10.0)
+        wqt, wdt, w = evaluate(93323, 42000.0, alt, -11.95, -76.77, ap=35, components=True)
+        assert wqt.shape == wdt.shape == w.shape == (alt.size, 2)
+        np.testing.assert_array_equal(w, wqt + wdt)
+        np.testing.assert_array_equal(w, evaluate(93323, 42000.0, alt, -11.95, -76.77, ap=35))
+
+        quiet = evaluate(93323, 42000.0, alt, -11.95, -76.77, ap=-1)
+        np.testing.assert_array_equal(wqt, quiet)
+
+    def test_components_quiet_time(self) -> None:
+        """Test that the disturbance component vanishes for ap < 0."""
+        wqt, wdt, w = evaluate(93323, 42000.0, 300.0, 0.0, 0.0, ap=-1, components=True)
+        np.testing.assert_array_equal(wdt, 0.0)
+        np.testing.assert_array_equal(w, wqt)
+
+    def test_sorted_matches_unsorted(self) -> None:
+        """Test that scheduled evaluation scatters results back in input order."""
+        rng = np.random.default_rng(5)
+        n = 200
+        iyd = 93000 + rng.choice([80, 172, 323], n)
+        sec = rng.choice([0.0, 21600.0, 43200.0], n)
+        alt = rng.uniform(80.0, 400.0, n)
+        glat = rng.choice([-45.0, 0.0, 45.0], n)
+        glon = rng.choice([-76.77, 0.0], n)
+        ap = rng.choice([-1.0, 35.0], n)
+
+        w = evaluate(iyd, sec, alt, glat, glon, ap=ap)
+        ws, stats = evaluate(iyd, sec, alt, glat, glon, ap=ap, sort=True, return_stats=True)
+        np.testing.assert_array_equal(ws, w)
+        assert stats["points"] == n
+
+        _, unsorted = evaluate(iyd, sec, alt, glat, glon, ap=ap, return_stats=True)
+        assert stats["basis"] > unsorted["basis"]
+        assert stats["latitude"] > unsorted["latitude"]
+
+        parts = evaluate(iyd, sec, alt, glat, glon, ap=ap, components=True, sort=True)
+        np.testing.assert_array_equal(parts[2], w)
+
+    def test_dedupe(self) -> None:
+        """Test that points differing only in ignored inputs are evaluated once."""
+        doy, sec, alt, glat, glon, ap = canonicalize(
+            [93323, 14323, -1323], 42000.0, 250.0, -0.0, 0.0, [-5.0, np.nan, 35.0]
+        )
+        np.testing.assert_array_equal(doy, [323, 323, -323])
+        np.testing.assert_array_equal(ap, [-1.0, -1.0, 35.0])
+        assert not np.signbit(glat).any()
+
+        # a ten-year F10.7 ensemble of 20 points, half of them in quiet time
+        rng = np.random.default_rng(7)
+        year = np.arange(10)[:, None] * 1000
+        base = (
+            np.full(20, 323),
+            rng.uniform(0.0, 86400.0, 20),
+            rng.uniform(80.0, 400.0, 20),
+            rng.uniform(-90.0, 90.0, 20),
+            rng.uniform(-180.0, 180.0, 20),
+        )
+        ap = np.where(np.arange(20) < 10, rng.uniform(-9.0, 0.0, 20), 35.0)
+        f107 = rng.uniform(70.0, 250.0, (10, 20))
+        iyd = base[0] + year
+        points, inverse = unique_points(iyd, *base[1:], ap=ap)
+        assert points[0].size == 20 and inverse.shape == (200,)
+
+        w = evaluate(iyd, *base[1:], f107=f107, ap=ap)
+        wd, stats = evaluate(iyd, *base[1:], f107=f107, ap=ap, dedupe=True, return_stats=True)
+        np.testing.assert_array_equal(wd, w)
+        assert wd.shape == (10, 20, 2) and stats["points"] == 20
+        parts = evaluate(iyd, *base[1:], ap=ap, components=True, dedupe=True, sort=True)
+        np.testing.assert_array_equal(parts[2], w)
+
+    def test_time_series(self) -> None:
+        """Test datetime conversion and day-ordered time-series evaluation."""
+        iyd, sec = time_to_iyd(["1993-11-19T11:40", "2000-02-29T23:59:59.5", "2024-12-31"])
+        np.testing.assert_array_equal(iyd, [93323, 60, 24366])
+        np.testing.assert_array_equal(sec, [42000.0, 86399.5, 0.0])
+        assert time_to_iyd(datetime(1993, 11, 19, 11, 40))[0] == 93323
+
+        time = np.arange("2023-01-01T00", "2023-02-01T00", dtype="datetime64[h]")
+        iyd, sec = time_to_iyd(time)
+        expected = evaluate(iyd, sec, 250.0, -11.95, -76.77, ap=35.0)
+        set_profiling(True)
+        try:
+            stats(reset=True)
+            w = time_series(time, 250.0, -11.95, -76.77, ap=35.0)
+            np.testing.assert_array_equal(w, expected)
+            assert stats(reset=True)["counts"]["hwmqt_refresh1"] == 31
+
+            # shuffled times are evaluated day by day and scattered back
+            order = np.random.default_rng(3).permutation(time.size)
+            w = time_series(time[order], 250.0, -11.95, -76.77, ap=35.0)
+            np.testing.assert_array_equal(w, expected[order])
+            assert stats(reset=True)["counts"]["hwmqt_refresh1"] == 31
+        finally:
+            set_profiling(False)
+
+        # a height-time section along a moving track
+        alt = np.array([150.0, 300.0])
+        glat = np.linspace(-50.0, 50.0, time.size)[:, None]
+        w = time_series(time[:, None], alt, glat, 20.0, components=True)
+        assert w[2].shape == (time.size, 2, 2)
+        np.testing.assert_array_equal(w[2], evaluate(iyd[:, None], sec[:, None], alt, glat, 20.0))
+
+    def test_schedule_and_cache_hits(self) -> None:
+        """Test the evaluation order and the cache-hit counters."""
+        iyd = np.array([93002, 93001, 93001, 93001])
+        sec = np.array([0.0, 3600.0, 0.0, 0.0])
+        alt = np.array([100.0, 100.0, 200.0, 100.0])
+        glat = np.zeros(4)
+        glon = np.zeros(4)
+        order = schedule(iyd, sec, alt, glat, glon)
+        np.testing.assert_array_equal(order, [3, 2, 1, 0])
+
+        stats = cache_hits(iyd[order], sec[order], alt[order], glat[order], glon[order])
+        assert stats == {
+            "points": 4,
+            "season": 2,
+            "latitude": 3,
+            "longitude": 3,
+            "tides": 1,
+            "altitude": 1,
+            "basis": 1,
+        }
+
+        # The model sees day -150 for -1150, not 850
+        iyd = np.array([-1150, 850, -1150])
+        order = schedule(iyd, 0.0, 100.0, 0.0, 0.0)
+        np.testing.assert_array_equal(order, [0, 2, 1])
+        assert cache_hits(iyd, *np.zeros((4, 3)))["season"] == 0
+
+    def test_concurrent_threads(self) -> None:
+        """Test that batches evaluated on several threads match a serial run."""
+        rng = np.random.default_rng(6)
+        n = 4000
+        iyd = 93000 + rng.integers(1, 366, n)
+        sec = rng.uniform(0.0, 86400.0, n)
+        alt = rng.uniform(0.0, 500.0, n)
+        glat = rng.uniform(-90.0, 90.0, n)
+        glon = rng.uniform(-180.0, 180.0, n)
+        ap = rng.choice([-1.0, 35.0], n)
+
+        expected = evaluate(iyd, sec, alt, glat, glon, ap=ap)
+        chunks = np.array_split(np.arange(n), 8)
+        with ThreadPoolExecutor(4) as pool:
+            parts = pool.map(
+                lambda i: evaluate(iyd[i], sec[i], alt[i], glat[i], glon[i], ap=ap[i]), chunks
+            )
+            np.testing.assert_array_equal(np.concatenate(list(parts)), expected)
+
+    def test_num_threads(self) -> None:
+        """Test that the OpenMP thread count does not change the results."""
+        rng = np.random.default_rng(7)
+        n = 2000
+        args = (
+            93000 + rng.integers(1, 366, n),
+            rng.uniform(0.0, 86400.0, n),
+            rng.uniform(0.0, 500.0, n),
+            rng.uniform(-90.0, 90.0, n),
+            rng.uniform(-180.0, 180.0, n),
+        )
+        ap = rng.choice([-1.0, 35.0], n)
+        try:
+            set_num_threads(1)
+            assert get_num_threads() == 1
+            expected = evaluate(*args, ap=ap, components=True)
+            set_num_threads(4)
+            assert get_num_threads() in (1, 4)
+            for result, reference in zip(evaluate(*args, ap=ap, components=True), expected):
+                np.testing.assert_array_equal(result, reference)
+        finally:
+            set_num_threads()
+
+    def test_alf_cache_size(self) -> None:
+        """Test that the Legendre basis cache size does not change the results."""
+        # a longitude-latitude map with latitude innermost revisits latitudes
+        glon, glat = np.meshgrid(
+            np.arange(-180.0, 180.0, 30.0), np.arange(-90.0, 91.0, 5.0), indexing="ij"
+        )
+        args = (93323, 43200.0, 250.0, glat, glon)
+        try:
+            set_alf_cache_size(1)
+            assert get_alf_cache_size() == 1
+            expected = evaluate(*args, ap=35.0, components=True)
+            set_alf_cache_size(64)
+            assert get_alf_cache_size() == 64
+            for result, reference in zip(evaluate(*args, ap=35.0, components=True), expected):
+                np.testing.assert_array_equal(result, reference)
+            set_alf_cache_size(0)
+            assert get_alf_cache_size() == 1
+        finally:
+            set_alf_cache_size()
+
+        # single-point calls share the default workspace across routines
+        w = hwm14.hwm14(93323, 43200.0, 250.0, 40.0, -105.0, 0.0, 0.0, 0.0, [-1.0, 35.0])
+        hwm14.gd2qd(40.0, -105.0)
+        np.testing.assert_array_equal(
+            hwm14.hwm14(93323, 43200.0, 250.0, 40.0, -105.0, 0.0, 0.0, 0.0, [-1.0, 35.0]), w
+        )
+
+    def test_height_profile_kernel(self) -> None:
+        """Test that the height-profile kernel reproduces evaluate exactly."""
+        alt = np.arange(0.0, 501.0, 2.5)
+        for ap in (-1.0, 35.0):
+            args = (93323, 42000.0, alt, -11.95, -76.77)
+            expected = evaluate(*args, ap=ap, components=True)
+            result = height_profile(*args, ap=ap, components=True)
+            for w, reference in zip(result, expected):
+                np.testing.assert_array_equal(w, reference)
+            np.testing.assert_array_equal(height_profile(*args, ap=ap), expected[2])
+        assert height_profile(93323, 0.0, alt[1:].reshape(-1, 2), 0.0, 0.0).shape == (100, 2, 2)
+        assert height_profile(93323, 0.0, [], 0.0, 0.0).shape == (0, 2)
+
+    def test_stats(self) -> None:
+        """Test the profiling counters on a profile and a single point."""
+        alt = np.arange(100.0, 400.0, 10.0)
+        expected = evaluate(93323, 42000.0, alt, -11.95, -76.77, ap=35.0)
+        try:
+            set_profiling(True)
+            stats(reset=True)
+            w = evaluate(93323, 42000.0, alt, -11.95, -76.77, ap=35.0)
+            result = stats()
+        finally:
+            set_profiling(False)
+        np.testing.assert_array_equal(w, expected)
+
+        counts = result["counts"]
+        assert result["profiling"]
+        assert counts["hwmqt"] == counts["dwm07"] == counts["vertwght"] == alt.size
+        # only the altitude changes: the horizontal terms are built once
+        assert counts["hwmqt_refresh1"] == counts["gd2qd"] == counts["mltcalc"] == 1
+        assert counts["dwm07b_vshterms"] == counts["ap2kp"] == 1
+        # hwmqt, gd2qd, the anti-sunward point of mltcalc and dwm07b
+        assert counts["alfbasis"] == counts["alf_gd2qd_misses"] + 2 == 4
+        assert all(t >= 0.0 for t in result["seconds"].values())
+        assert result["seconds"]["hwmqt"] > 0.0
+
+        # disabled profiling counts nothing; single points are merged on read
+        stats(reset=True)
+        evaluate(93323, 42000.0, alt, -11.95, -76.77, ap=35.0)
+        assert not any(stats()["counts"].values())
+        try:
+            set_profiling(True)
+            hwm14.dwm07(93323, 42000.0, 250.0, 10.0, 10.0, [-1.0, 35.0])
+            assert stats(reset=True)["counts"]["dwm07"] == 1
+        finally:
+            set_profiling(False)
+        assert not any(stats()["counts"].values())
+
+    def test_init(self, tmp_path) -> None:
+        """Test that init loads the coefficients once and can reload them."""
+        init()
+        assert not hwm14.hwm.hwminit
+        args = (93323, 43200.0, 250.0, 40.0, -105.0)
+        expected = evaluate(*args, ap=35.0)
+        init()
+        init(force=True)
+        np.testing.assert_array_equal(evaluate(*args, ap=35.0), expected)
+
+        # a missing data file raises and keeps the previous directory
+        with pytest.raises(FileNotFoundError):
+            init(data_dir=str(tmp_path))
+        np.testing.assert_array_equal(evaluate(*args, ap=35.0), expected)
+
+        # paths that do not fit the Fortran buffer are rejected, not cut
+        with pytest.raises(ValueError, match="at most 256 bytes"):
+            init(data_dir=str(tmp_path / ("x" * 300)))
+        np.testing.assert_array_equal(evaluate(*args, ap=35.0), expected)
+
+    def test_lazy_import(self) -> None:
+        """Test that importing the package skips the plotting and pool modules."""
+        code = (
+            "import sys, pyhwm2014; "
+            "print(sorted(m for m in ('pyhwm2014.plotting', 'pyhwm2014.parallel', "
+            "'pyhwm2014.numpy_backend', 'multiprocessing') if m in sys.modules)); "
+            "pyhwm2014.HWM14Plot; print('pyhwm2014.plotting' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, check=True, text=True
+        )
+        assert result.stdout.split("\n")[:2] == ["[]", "True"]
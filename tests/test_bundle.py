@@ -0,0 +1,50 @@
+"""Unit tests for the memory-mapped coefficient bundle."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pyhwm2014 import HWMPATH, numpy_backend
+from pyhwm2014.bundle import BUNDLE_VERSION, _load_bundle, load_bundle
+
+
+class TestBundle:
+    """Test that the bundle reproduces the parsed coefficient files."""
+
+    def test_build_and_map(self, tmp_path) -> None:
+        """Test that the bundle is written once and then memory-mapped."""
+        bundle = load_bundle(directory=str(tmp_path))
+        paths = list(tmp_path.glob(f"coefficients-v{BUNDLE_VERSION}-*"))
+        assert len(paths) == 1 and bundle.path == paths[0]
+        assert isinstance(bundle.qwm.mparm, np.memmap)
+
+        parsed = numpy_backend.QWMCoefficients(Path(HWMPATH) / "hwm123114.bin")
+        for attr in ("vnode", "order", "mparm", "tparm", "e1", "e2"):
+            np.testing.assert_array_equal(getattr(bundle.qwm, attr), getattr(parsed, attr))
+        assert bundle.qwm.alttns == parsed.alttns
+        assert bundle.dwm.twidth.dtype == np.float32
+
+        _load_bundle.cache_clear()
+        again = load_bundle(directory=str(tmp_path), verify=True)
+        args = (93323, 42000.0, np.arange(0.0, 500.0, 25.0), -11.95, -76.77)
+        np.testing.assert_array_equal(
+            numpy_backend.hwmqt(*args, qwm=again.qwm), numpy_backend.hwmqt(*args, qwm=parsed)
+        )
+
+    def test_verify(self, tmp_path) -> None:
+        """Test that a modified array fails verification."""
+        bundle = load_bundle(directory=str(tmp_path))
+        np.save(bundle.path / "dwm.coeff.npy", np.zeros_like(bundle.dwm.coeff))
+        _load_bundle.cache_clear()
+        load_bundle(directory=str(tmp_path))
+        with pytest.raises(ValueError, match="dwm.coeff"):
+            load_bundle(directory=str(tmp_path), verify=True)
+
+        manifest = json.loads((bundle.path / "manifest.json").read_text())
+        manifest["version"] = BUNDLE_VERSION + 1
+        (bundle.path / "manifest.json").write_text(json.dumps(manifest))
+        _load_bundle.cache_clear()
+        with pytest.raises(ValueError, match="version"):
+            load_bundle(directory=str(tmp_path))
@@ -0,0 +1,159 @@
+"""Unit tests for the two-tier result cache."""
+
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from pyhwm2014 import (
+    HWM14,
+    HWM142D,
+    HWMPATH,
+    ResultCache,
+    evaluate,
+    evaluate_grid,
+    height_profile,
+    init,
+)
+
+
+class TestResultCache:
+    """Test ResultCache storage, eviction and its use by the evaluators."""
+
+    def test_memory_lru(self) -> None:
+        """Test hits, copies and size-based eviction of the memory tier."""
+        cache = ResultCache(maxbytes=2 * 800)
+        keys = [cache.key("test", np.arange(k)) for k in range(3)]
+        assert len(set(keys)) == 3
+        assert cache.key("test", np.arange(1)) == keys[1]
+        assert cache.key("test", np.arange(1), flag=True) != keys[1]
+        assert cache.key("test", np.arange(1, dtype=np.int32)) != keys[1]
+
+        assert cache.get(keys[0]) is None
+        cache.put(keys[0], np.zeros(100))
+        cache.put(keys[1], (np.ones(50), np.ones(50)))
+        assert isinstance(cache.get(keys[1]), tuple)
+        w = cache.get(keys[0])
+        w[:] = 1.0
+        np.testing.assert_array_equal(cache.get(keys[0]), 0.0)
+
+        # keys[0] was used last, so keys[1] is evicted
+        cache.put(keys[2], np.zeros(100))
+        assert cache.get(keys[1]) is None
+        assert cache.stats() == {
+            "hits": 3,
+            "disk_hits": 0,
+            "misses": 2,
+            "entries": 2,
+            "bytes": 1600,
+        }
+        cache.clear()
+        assert cache.stats()["entries"] == cache.stats()["hits"] == 0
+
+    def test_data_version(self, tmp_path: Path) -> None:
+        """Test that keys follow coefficient files edited in place and reloaded."""
+        cache = ResultCache()
+        data_dir = shutil.copytree(HWMPATH, tmp_path / "data")
+        try:
+            init(data_dir=str(data_dir))
+            key = cache.key("test", np.arange(3))
+
+            # the keys describe the coefficients loaded, not the files on disk
+            with open(data_dir / "dwm07b104i.dat", "ab") as f:
+                f.write(b"\0")
+            assert cache.key("test", np.arange(3)) == key
+            init(force=True)
+            assert cache.key("test", np.arange(3)) != key
+        finally:
+            init(data_dir=HWMPATH)
+
+    def test_disk(self, tmp_path: Path) -> None:
+        """Test that the disk tier is shared, atomic and survives damage."""
+        writer = ResultCache(directory=tmp_path)
+        key = writer.key("test", np.arange(10))
+        writer.put(key, (np.arange(10.0), np.arange(3)))
+        assert not list(tmp_path.rglob("*.tmp"))
+
+        reader = ResultCache(directory=tmp_path)
+        a, b = reader.get(key)
+        np.testing.assert_array_equal(a, np.arange(10.0))
+        np.testing.assert_array_equal(b, np.arange(3))
+        reader.get(key)
+        assert reader.stats()["disk_hits"] == reader.stats()["hits"] == 1
+
+        path = next(tmp_path.rglob("*.npz"))
+        path.write_bytes(b"truncated")
+        assert ResultCache(directory=tmp_path).get(key) is None
+        writer.clear(disk=True)
+        assert not path.exists()
+
+        # concurrent writers and readers of the same entries
+        def work(k: int) -> None:
+            for j in range(20):
+                value = np.full(1000, j % 5, dtype=np.float32)
+                key = writer.key("concurrent", value)
+                if k % 2:
+                    writer.put(key, value)
+                else:
+                    got = ResultCache(directory=tmp_path).get(key)
+                    assert got is None or np.array_equal(got, value)
+
+        threads = [threading.Thread(target=work, args=(k,)) for k in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(list(tmp_path.rglob("*.npz"))) == 5
+
+    def test_evaluators(self) -> None:
+        """Test that cached results of the evaluators match fresh ones."""
+        cache = ResultCache()
+        alt = np.arange(90.0, 201.0, 10.0)
+        args = (93323, 42000.0, alt, -11.95, -76.77)
+        expected = evaluate(*args, ap=35.0, components=True)
+        for _ in range(2):
+            result = evaluate(*args, ap=35.0, components=True, sort=True, cache=cache)
+            for r, e in zip(result, expected):
+                np.testing.assert_array_equal(r, e)
+        w, stats = evaluate(*args, ap=35.0, cache=cache, return_stats=True)
+        np.testing.assert_array_equal(w, expected[2])
+        assert stats["points"] == alt.size
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+        # float32 canonicalization: float64 inputs that round alike share a key
+        w_hit, stats_hit = evaluate(*args, ap=35.0 + 1e-12, cache=cache, return_stats=True)
+        np.testing.assert_array_equal(w_hit, w)
+        assert stats_hit == stats == evaluate(*args, ap=35.0, return_stats=True)[1]
+        assert cache.stats()["hits"] == 2
+
+        profile = height_profile(*args, ap=35.0)
+        for _ in range(2):
+            np.testing.assert_array_equal(height_profile(*args, ap=35.0, cache=cache), profile)
+
+        grid = evaluate_grid(alt=alt, ut=np.arange(0.0, 24.0, 6.0), doy=323, ap=35.0)
+        for _ in range(2):
+            g = evaluate_grid(alt=alt, ut=np.arange(0.0, 24.0, 6.0), doy=323, ap=35.0, cache=cache)
+            np.testing.assert_array_equal(g.wind, grid.wind)
+        assert cache.stats()["hits"] == 4
+
+    def test_classes(self, tmp_path: Path) -> None:
+        """Test the cache argument of HWM14 and HWM142D."""
+        cache = ResultCache(directory=tmp_path)
+        kwargs = {"altlim": [90, 200], "altstp": 5, "ap": [-1, 35], "verbose": False}
+        for option in (1, 2):
+            expected = HWM14(option=option, **kwargs)
+            cached = [HWM14(option=option, cache=cache, **kwargs) for _ in range(2)]
+            for hwm in cached:
+                np.testing.assert_array_equal(hwm.Uwind, expected.Uwind)
+                np.testing.assert_array_equal(hwm.Vwind, expected.Vwind)
+
+        assert cache.stats()["hits"] == 2
+
+        # a second process finds the grid in the shared directory
+        expected = HWM142D(option=6, verbose=False)
+        HWM142D(option=6, verbose=False, cache=cache)
+        other = ResultCache(directory=tmp_path)
+        cached = HWM142D(option=6, verbose=False, cache=other)
+        np.testing.assert_array_equal(cached.Uwind, expected.Uwind)
+        assert other.stats()["disk_hits"] == 1
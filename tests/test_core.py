@@ -1,5 +1,6 @@
 """Unit tests for HWM14 core functionality."""
 
+import numpy as np
 import pytest
 from pyhwm2014 import HWM14, HWM142D
 
@@ -77,6 +78,36 @@ class TestHWM14Initialization:
         assert len(h.Uwind) > 0
         assert len(h.Vwind) > 0
 
+    def test_hwm14_gmt_profile_values(self) -> None:
+        """Test that every GMT profile point matches a direct model call."""
+        from pyhwm2014 import hwm14
+
+        h = HWM14(
+            alt=300,
+            ap=[-1, 35],
+            day=323,
+            glat=-11.95,
+            glon=-76.77,
+            option=3,
+            utlim=[0, 6],
+            utstp=1,
+            verbose=False,
+            year=1993,
+        )
+        for ut, u, v in zip(h.utbins, h.Uwind, h.Vwind):
+            w = hwm14.hwm14(93323, ut * 3600.0, 300, -11.95, -76.77, -1, -1, -1, [-1, 35])
+            assert u == pytest.approx(w[1], abs=1e-4)
+            assert v == pytest.approx(w[0], abs=1e-4)
+
+    def test_hwm14_verbose_output(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that verbose mode prints one row per profile point."""
+        h = HWM14(altlim=[90, 200], altstp=10, option=1, verbose=True)
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == "HEIGHT PROFILE"
+        assert len(lines) == 3 + len(h.altbins)
+        total_zon = [float(line.split()[-1]) for line in lines[3:]]
+        assert total_zon == pytest.approx(h.Uwind, abs=1e-3)
+
     @pytest.mark.parametrize("option,expected_attr", [
         (1, "altbins"),
         (2, "glatbins"),
@@ -92,7 +123,16 @@ class TestHWM14Initialization:
         """Test that invalid option doesn't crash."""
         h = HWM14(option=5, verbose=False)  # type: ignore
         # Should handle gracefully
-        assert h.Uwind == []
+        assert len(h.Uwind) == 0
+
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_hwm14_dtype(self, dtype: type) -> None:
+        """Test that wind profiles are ndarrays of the requested dtype."""
+        h = HWM14(altlim=[90, 200], altstp=10, option=1, verbose=False, dtype=dtype)
+        assert isinstance(h.Uwind, np.ndarray)
+        assert h.Uwind.dtype == dtype
+        assert h.Vwind.dtype == dtype
+        assert h.Uwind.shape == h.altbins.shape
 
     def test_hwm14_mutable_defaults(self) -> None:
         """Test that mutable defaults are properly isolated."""
@@ -121,14 +161,70 @@ class TestHWM142D:
         )
         assert len(h.Uwind) > 0
         assert len(h.Vwind) > 0
+        assert h.iyd == 93323
 
-    @pytest.mark.parametrize("option", [1, 2, 4, 6])
+    @pytest.mark.parametrize("option", [1, 2, 3, 4, 5, 6])
     def test_hwm142d_options(self, option: int) -> None:
         """Test various HWM142D profile options."""
         h = HWM142D(option=option, verbose=False)
         assert len(h.Uwind) > 0
         assert len(h.Vwind) > 0
 
+    @pytest.mark.parametrize(
+        "option,shape",
+        [
+            (1, (6, 5)),
+            (2, (6, 17)),
+            (3, (17, 5)),
+            (4, (6, 17)),
+            (5, (17, 5)),
+            (6, (17, 17)),
+        ],
+    )
+    def test_hwm142d_shapes(self, option: int, shape: tuple[int, int]) -> None:
+        """Test the grid shapes (rows = y bins, columns = x bins)."""
+        h = HWM142D(
+            altlim=[100, 200],
+            altstp=20,
+            option=option,
+            utlim=[0, 12],
+            utstp=3,
+            verbose=False,
+        )
+        assert h.Uwind.shape == shape
+        assert h.Vwind.shape == shape
+
+    def test_hwm142d_rows_match_profiles(self) -> None:
+        """Test that each longitude/latitude row equals the 1D profile."""
+        h = HWM142D(
+            alt=130.0,
+            glatlim=[-20, 20],
+            glatstp=10,
+            glonlim=[-40, 40],
+            glonstp=20,
+            option=6,
+            verbose=False,
+            dtype=np.float32,
+        )
+        assert h.Uwind.dtype == np.float32
+        for i, glat in enumerate(h.glatbins):
+            p = HWM14(
+                alt=130.0,
+                glat=glat,
+                glonlim=[-40, 40],
+                glonstp=20,
+                option=4,
+                verbose=False,
+            )
+            np.testing.assert_allclose(h.Uwind[i], p.Uwind, rtol=1e-6)
+            np.testing.assert_allclose(h.Vwind[i], p.Vwind, rtol=1e-6)
+
+    def test_hwm142d_workers(self) -> None:
+        """Test that worker processes reproduce the in-process grid."""
+        kwargs = {"altlim": [100, 200], "altstp": 20, "option": 2, "verbose": False}
+        h = HWM142D(workers=2, **kwargs)
+        np.testing.assert_array_equal(h.Uwind, HWM142D(**kwargs).Uwind)
+
 
 class TestDataPathConfiguration:
     """Test data path is properly configured."""
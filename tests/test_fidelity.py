@@ -0,0 +1,66 @@
+"""Unit tests for the reduced-fidelity quiet-time coefficients."""
+
+import copy
+
+import numpy as np
+import pytest
+
+from pyhwm2014 import numpy_backend
+from pyhwm2014.fidelity import rms_error, truncate
+from pyhwm2014.numpy_backend import _basis_recipe
+
+
+class TestFidelity:
+    """Test truncated coefficients against zeroed terms of the full model."""
+
+    grid = {
+        "doy": np.array([80, 266]),
+        "ut": np.array([0.0, 12.0]),
+        "alt": np.array([150.0, 300.0]),
+        "glat": np.arange(-60.0, 61.0, 30.0),
+        "glon": np.arange(-180.0, 180.0, 60.0),
+    }
+
+    def test_full_order(self) -> None:
+        """Test that truncating nothing reproduces the model exactly."""
+        error = rms_error(truncate(), grid=self.grid)
+        assert error == {"meridional": 0.0, "zonal": 0.0, "max": 0.0}
+
+    @pytest.mark.parametrize("limits", [{"maxn": 5, "maxs": 1}, {"maxl": 2}, {"waves": False}])
+    def test_truncate(self, limits: dict) -> None:
+        """Test that a truncated model drops exactly the terms beyond the limits."""
+        full = numpy_backend.load_qwm()
+        reduced = truncate(**limits)
+        assert reduced.nbf < full.nbf
+
+        # zero the dropped coefficients of the full model instead
+        zeroed = copy.copy(full)
+        zeroed.mparm, zeroed.tparm = np.array(full.mparm), np.array(full.tparm)
+        bounds = (full.maxn, full.maxm, full.maxl, full.maxs)
+        for d in range(full.order.shape[0]):
+            kept = set(zip(*_basis_recipe(tuple(reduced.order[d]), *bounds)))
+            columns = zip(*_basis_recipe(tuple(full.order[d]), *bounds))
+            dropped = [c for c, column in enumerate(columns) if column not in kept]
+            zeroed.mparm[dropped, d] = 0.0
+            zeroed.tparm[dropped, d] = 0.0
+
+        args = (93323, 42000.0, np.arange(100.0, 450.0, 50.0), -11.95, -76.77)
+        np.testing.assert_allclose(
+            numpy_backend.hwmqt(*args, qwm=reduced),
+            numpy_backend.hwmqt(*args, qwm=zeroed),
+            atol=1e-4,
+        )
+        error = rms_error(reduced, grid=self.grid)
+        assert 0.0 < error["meridional"] <= error["max"]
+
+    def test_single_component(self) -> None:
+        """Test that one wind component is computed alone."""
+        args = (93323, 42000.0, np.arange(0.0, 500.0, 25.0), -11.95, -76.77)
+        both = numpy_backend.hwmqt(*args)
+        zonal = numpy_backend.hwmqt(*args, wind="zonal")
+        meridional = numpy_backend.hwmqt(*args, wind="meridional")
+        np.testing.assert_array_equal(zonal[:, 1], both[:, 1])
+        np.testing.assert_array_equal(meridional[:, 0], both[:, 0])
+        assert not np.any(zonal[:, 0]) and not np.any(meridional[:, 1])
+        with pytest.raises(ValueError):
+            numpy_backend.hwmqt(*args, wind="vertical")
@@ -0,0 +1,64 @@
+"""Unit tests for the N-D grid evaluation engine."""
+
+import numpy as np
+import pytest
+
+from pyhwm2014 import evaluate, evaluate_grid
+
+
+class TestEvaluateGrid:
+    """Test evaluate_grid axis handling and values."""
+
+    def test_axes_and_shape(self) -> None:
+        """Test that array inputs become labelled axes in keyword order."""
+        alt = np.arange(100.0, 301.0, 50.0)
+        ut = np.arange(0.0, 24.0, 6.0)
+        g = evaluate_grid(alt=alt, ut=ut, glat=-11.95, glon=-76.77, doy=323, ap=35)
+        assert g.axes == ("alt", "ut")
+        assert g.shape == (5, 4)
+        assert g.wind.shape == (5, 4, 2)
+        assert g.Uwind.shape == g.Vwind.shape == (5, 4)
+        np.testing.assert_array_equal(g.coords["alt"], alt)
+        assert g.coords["glat"].ndim == 0
+
+    def test_values_match_evaluate(self) -> None:
+        """Test grid values against direct point evaluation."""
+        alt = np.array([120.0, 250.0])
+        glat = np.array([-30.0, 0.0, 30.0])
+        ut = np.array([3.0, 15.0])
+        doy = np.array([80, 172])
+        g = evaluate_grid(alt=alt, glat=glat, ut=ut, doy=doy, glon=20.0, ap=35)
+        assert g.axes == ("alt", "glat", "ut", "doy")
+
+        a, la, u, d = np.meshgrid(alt, glat, ut, doy, indexing="ij")
+        expected = evaluate(d, u * 3600.0, a, la, 20.0, ap=35)
+        np.testing.assert_array_equal(g.wind, expected)
+
+    def test_axes_order(self) -> None:
+        """Test that the requested axis order transposes the result."""
+        glat = np.linspace(-60.0, 60.0, 5)
+        glon = np.linspace(-180.0, 180.0, 7)
+        g = evaluate_grid(glat=glat, glon=glon)
+        gt = evaluate_grid(glat=glat, glon=glon, axes=("glon", "glat"))
+        assert gt.axes == ("glon", "glat")
+        np.testing.assert_array_equal(gt.Uwind, g.Uwind.T)
+
+    def test_ap_axis_and_components(self) -> None:
+        """Test an ap axis and the quiet/disturbance decomposition."""
+        g = evaluate_grid(
+            alt=np.array([150.0, 300.0]),
+            ap=np.array([-1.0, 10.0, 80.0]),
+            components=True,
+            dtype=np.float64,
+        )
+        assert g.wind.dtype == np.float64
+        np.testing.assert_allclose(g.wind, g.quiet + g.disturbance, atol=1e-4)
+        np.testing.assert_array_equal(g.disturbance[:, 0], 0.0)
+        np.testing.assert_array_equal(g.quiet[:, 0], g.quiet[:, 2])
+
+    def test_invalid_axes(self) -> None:
+        """Test that axes must name exactly the array inputs."""
+        with pytest.raises(ValueError):
+            evaluate_grid(alt=np.arange(3.0), axes=("glat",))
+        with pytest.raises(ValueError):
+            evaluate_grid(alt=np.ones((2, 2)))
@@ -0,0 +1,68 @@
+"""Unit tests for the model handles."""
+
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pyhwm2014 import HWMPATH, Model, evaluate
+
+
+class TestModel:
+    """Test Model handles against the process-wide model."""
+
+    args = (93323, 42000.0, np.arange(90.0, 400.0, 10.0), -11.95, -76.77)
+
+    def test_default(self) -> None:
+        """Test that the default handle agrees with evaluate."""
+        w = Model().evaluate(*self.args, ap=35.0)
+        np.testing.assert_allclose(w, evaluate(*self.args, ap=35.0), atol=1e-3)
+
+    def test_data_dir_and_bytes(self, tmp_path) -> None:
+        """Test handles reading a directory and in-memory files."""
+        for name in ("hwm123114.bin", "dwm07b104i.dat", "gd2qd.dat"):
+            shutil.copy(Path(HWMPATH) / name, tmp_path / name)
+        data = {name: (Path(HWMPATH) / name).read_bytes() for name in ("hwm123114.bin",)}
+        expected = Model().evaluate(*self.args, ap=35.0, components=True)
+        for model in (Model(data_dir=tmp_path), Model(data_dir=tmp_path, data=data)):
+            for w, reference in zip(model.evaluate(*self.args, ap=35.0, components=True), expected):
+                np.testing.assert_array_equal(w, reference)
+
+    def test_independent_handles(self, tmp_path) -> None:
+        """Test that a handle with other coefficients leaves the others alone."""
+        raw = bytearray((Path(HWMPATH) / "dwm07b104i.dat").read_bytes())
+        # zero the coupled-term coefficients (third record)
+        header = int.from_bytes(raw[:4], "little")
+        termarr = int.from_bytes(raw[header + 8 : header + 12], "little")
+        start = header + termarr + 16 + 4
+        size = int.from_bytes(raw[start - 4 : start], "little")
+        raw[start : start + size] = bytes(size)
+        quiet = Model(data={"dwm07b104i.dat": bytes(raw)}, preload=False)
+        default = Model()
+
+        results = {}
+        threads = [
+            threading.Thread(
+                target=lambda k, m: results.update({k: m.evaluate(*self.args, ap=200.0)}),
+                args=(k, m),
+            )
+            for k, m in (("quiet", quiet), ("default", default))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        np.testing.assert_array_equal(results["quiet"], default.evaluate(*self.args))
+        assert np.any(results["default"] != results["quiet"])
+
+    def test_errors(self, tmp_path) -> None:
+        """Test that missing files raise instead of stopping the process."""
+        with pytest.raises(FileNotFoundError, match="hwm123114.bin"):
+            Model(data_dir=tmp_path)
+        model = Model(data_dir=tmp_path, preload=False)
+        with pytest.raises(FileNotFoundError):
+            model.evaluate(*self.args)
+        with pytest.raises(ValueError, match="unknown"):
+            Model(data={"hwm14.bin": b""})
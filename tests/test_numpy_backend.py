@@ -0,0 +1,159 @@
+"""Unit tests for the NumPy implementation of the quiet-time model."""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pyhwm2014 import HWMPATH, evaluate, hwm14, init, numpy_backend
+
+
+class TestNumpyBackend:
+    """Test pyhwm2014.numpy_backend against the Fortran routines."""
+
+    def setup_class(self) -> None:
+        """Load the Fortran coefficients used as the reference."""
+        init()
+
+    def test_alfbasis(self) -> None:
+        """Test the vectorized alfbasis against the Fortran one."""
+        theta = np.linspace(0.01, np.pi - 0.01, 9)
+        P, V, W = numpy_backend.alfbasis(theta, 8, 4)
+        for i, t in enumerate(theta):
+            for result, reference in zip(
+                (P[i], V[i], W[i]), hwm14.alf.alfbasis(8, 4, t), strict=True
+            ):
+                np.testing.assert_allclose(result, reference, rtol=1e-12, atol=1e-14)
+
+    def test_vertwght(self) -> None:
+        """Test the vertical weights, including the exponential top levels."""
+        alt = np.array([0.0, 2.5, 50.0, 117.5, 150.0, 199.9, 200.0, 250.0, 350.0, 500.0])
+        wght, iz = numpy_backend.vertwght(alt)
+        for i, a in enumerate(alt):
+            reference, izref = hwm14.vertwght(a)
+            assert iz[i] == izref
+            np.testing.assert_allclose(wght[i], reference, rtol=1e-12, atol=1e-14)
+
+    def test_vertwght_cache(self) -> None:
+        """Test that cached weights of a fixed altitude grid match the direct ones."""
+        altbins = np.arange(0.0, 500.0, 2.5)
+        alt = np.tile(altbins, 3)[::-1]
+        expected = numpy_backend.vertwght(alt)
+        for _ in range(2):
+            for result, reference in zip(
+                numpy_backend.vertwght(alt, cache=True), expected, strict=True
+            ):
+                np.testing.assert_array_equal(result, reference)
+        args = (93323, 42000.0, alt, -11.95, -76.77)
+        np.testing.assert_array_equal(
+            numpy_backend.hwmqt(*args, chunksize=128, altcache=True),
+            numpy_backend.hwmqt(*args, chunksize=128),
+        )
+
+    def test_hwmqt(self) -> None:
+        """Test the quiet-time winds against the Fortran hwmqt."""
+        rng = np.random.default_rng(9)
+        n = 5000
+        args = (
+            93000 + rng.integers(1, 366, n),
+            rng.uniform(0.0, 86400.0, n),
+            rng.uniform(0.0, 500.0, n),
+            rng.uniform(-90.0, 90.0, n),
+            rng.uniform(-180.0, 180.0, n),
+        )
+        w = numpy_backend.hwmqt(*args, chunksize=1024)
+        assert w.shape == (n, 2) and w.dtype == np.float32
+        np.testing.assert_allclose(w, evaluate(*args), rtol=1e-5, atol=1e-4)
+
+        alt = np.arange(0.0, 400.0, 100.0)[:, None]
+        w = numpy_backend.hwmqt(93323, 43200.0, alt, 0.0, [-90.0, 0.0])
+        assert w.shape == (4, 2, 2)
+
+    def test_gd2qd_and_mltcalc(self) -> None:
+        """Test the vectorized coordinate conversions against Fortran."""
+        rng = np.random.default_rng(10)
+        glat = rng.uniform(-90.0, 90.0, 200).astype(np.float32)
+        glon = rng.uniform(-180.0, 180.0, 200).astype(np.float32)
+        result = numpy_backend.gd2qd(glat, glon)
+        reference = np.array([hwm14.gd2qd(a, b) for a, b in zip(glat, glon, strict=True)]).T
+        np.testing.assert_allclose(np.array(result), reference, rtol=1e-6, atol=1e-5)
+
+        qlat, qlon = result[:2]
+        day = rng.integers(1, 366, 200).astype(np.float32)
+        ut = rng.uniform(0.0, 24.0, 200).astype(np.float32)
+        mlt = numpy_backend.mltcalc(qlat, qlon, day, ut)
+        reference = [hwm14.mltcalc(*args) for args in zip(qlat, qlon, day, ut, strict=True)]
+        np.testing.assert_allclose(mlt, reference, atol=1e-5)
+
+    def test_ap2kp(self) -> None:
+        """Test the ap to Kp conversion at and between the table nodes."""
+        ap = np.array([-3.0, 0.0, 2.0, 3.5, 7.5, 80.0, 399.0, 400.0, 500.0], dtype=np.float32)
+        np.testing.assert_array_equal(numpy_backend.ap2kp(ap), [hwm14.ap2kp(a) for a in ap])
+
+    def test_dwm07(self) -> None:
+        """Test the disturbance winds against the Fortran dwm07."""
+        rng = np.random.default_rng(11)
+        n = 1000
+        args = (
+            93000 + rng.integers(1, 366, n),
+            rng.uniform(0.0, 86400.0, n),
+            rng.uniform(0.0, 500.0, n),
+            rng.uniform(-90.0, 90.0, n),
+            rng.uniform(-180.0, 180.0, n),
+        )
+        ap = rng.choice([-1.0, 0.0, 4.0, 35.0, 200.0, 400.0], n)
+        for result, reference in zip(
+            evaluate(*args, ap=ap, components=True, backend="numpy"),
+            evaluate(*args, ap=ap, components=True),
+            strict=True,
+        ):
+            np.testing.assert_allclose(result, reference, rtol=1e-5, atol=2e-3)
+
+    def test_evaluate_backend(self) -> None:
+        """Test backend selection in evaluate."""
+        w = evaluate(93323, 43200.0, [100.0, 300.0], 60.0, -70.0, ap=35.0, backend="numpy")
+        assert w.shape == (2, 2) and w.dtype == np.float32
+        assert evaluate(93323, 0.0, np.array([]), 0.0, 0.0, backend="numpy").shape == (0, 2)
+        with pytest.raises(ValueError, match="backend"):
+            evaluate(93323, 0.0, 100.0, 0.0, 0.0, backend="cuda")
+
+    def test_evaluate_data_dir(self, tmp_path: Path) -> None:
+        """Test that the NumPy backend reads the coefficients of init's directory."""
+        data_dir = shutil.copytree(HWMPATH, tmp_path / "data")
+        dwm = data_dir / "dwm07b104i.dat"
+        original = dwm.read_bytes()
+        raw = bytearray(original)
+        # zero the coupled-term coefficients (third record)
+        header = int.from_bytes(raw[:4], "little")
+        termarr = int.from_bytes(raw[header + 8 : header + 12], "little")
+        start = header + termarr + 16 + 4
+        size = int.from_bytes(raw[start - 4 : start], "little")
+        raw[start : start + size] = bytes(size)
+
+        args = (93323, 42000.0, np.arange(100.0, 400.0, 50.0), -11.95, -76.77)
+        default = evaluate(*args, ap=200.0, backend="numpy")
+        try:
+            dwm.write_bytes(bytes(raw))
+            init(data_dir=str(data_dir))
+            w = evaluate(*args, ap=200.0, backend="numpy")
+            np.testing.assert_allclose(w, evaluate(*args, ap=200.0), rtol=1e-5, atol=2e-3)
+            assert np.any(w != default)
+
+            # files edited in place are read again with init(force=True)
+            dwm.write_bytes(original)
+            init(force=True)
+            np.testing.assert_array_equal(evaluate(*args, ap=200.0, backend="numpy"), default)
+        finally:
+            init(data_dir=HWMPATH)
+
+    def test_negative_iyd(self) -> None:
+        """Test that a negative iyd gives the day of the Fortran mod."""
+        iyd = np.array([-23150, -1, 23150])
+        args = (42000.0, 250.0, -11.95, -76.77)
+        for result, reference in zip(
+            evaluate(iyd, *args, ap=35.0, components=True, backend="numpy"),
+            evaluate(iyd, *args, ap=35.0, components=True),
+            strict=True,
+        ):
+            np.testing.assert_allclose(result, reference, rtol=1e-5, atol=2e-3)
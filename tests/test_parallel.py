@@ -0,0 +1,74 @@
+"""Unit tests for the multi-process evaluation API."""
+
+import numpy as np
+import pytest
+
+from pyhwm2014 import evaluate, evaluate_grid, parallel
+
+
+class TestParallelEvaluate:
+    """Test pyhwm2014.parallel.evaluate against the in-process batch API."""
+
+    def test_matches_batch(self) -> None:
+        """Test that chunks evaluated by workers reproduce evaluate exactly."""
+        rng = np.random.default_rng(8)
+        n = 3000
+        args = (
+            93000 + rng.integers(1, 366, n),
+            rng.uniform(0.0, 86400.0, n),
+            rng.uniform(0.0, 500.0, n),
+            rng.uniform(-90.0, 90.0, n),
+            rng.uniform(-180.0, 180.0, n),
+        )
+        ap = rng.choice([-1.0, 35.0], n)
+
+        w = parallel.evaluate(*args, ap=ap, workers=2, chunksize=700)
+        np.testing.assert_array_equal(w, evaluate(*args, ap=ap))
+
+        parts = parallel.evaluate(*args, ap=ap, workers=2, components=True)
+        for result, reference in zip(parts, evaluate(*args, ap=ap, components=True), strict=True):
+            np.testing.assert_array_equal(result, reference)
+
+    def test_broadcast_and_empty(self) -> None:
+        """Test broadcast shapes and empty inputs."""
+        alt = np.arange(100.0, 300.0, 50.0)[:, None]
+        glat = np.linspace(-30.0, 30.0, 3)[None, :]
+        w = parallel.evaluate(93323, 43200.0, alt, glat, -76.77, workers=2)
+        assert w.shape == (4, 3, 2)
+        np.testing.assert_array_equal(w, evaluate(93323, 43200.0, alt, glat, -76.77))
+
+        assert parallel.evaluate(93323, 43200.0, np.array([]), 0.0, 0.0, workers=2).shape == (0, 2)
+
+    def test_pool(self) -> None:
+        """Test that a pool serves many calls with the same workers."""
+        glat = np.linspace(-90.0, 90.0, 500)
+        with parallel.Pool(2) as pool:
+            pids = set()
+            for day in (1, 100, 200):
+                w = pool.evaluate(23000 + day, 43200.0, 300.0, glat, 0.0, chunksize=50)
+                np.testing.assert_array_equal(w, evaluate(23000 + day, 43200.0, 300.0, glat, 0.0))
+                pids |= {p.pid for p in pool._executor._processes.values()}
+            assert len(pids) == 2
+        assert pool.closed
+        with pytest.raises(RuntimeError, match="closed"):
+            pool.evaluate(23001, 0.0, 300.0, 0.0, 0.0)
+
+        # evaluate reuses its pool until close()
+        parallel.evaluate(23001, 0.0, 300.0, glat, 0.0, workers=2)
+        first = parallel._pools[2]
+        parallel.evaluate(23002, 0.0, 300.0, glat, 0.0, workers=2)
+        assert parallel._pools[2] is first
+        parallel.close()
+        assert first.closed and not parallel._pools
+
+    def test_grid_workers(self) -> None:
+        """Test evaluate_grid with worker processes."""
+        kwargs = {
+            "alt": np.arange(100.0, 400.0, 50.0),
+            "glat": np.arange(-40.0, 41.0, 20.0),
+            "ap": 35,
+        }
+        g = evaluate_grid(workers=2, components=True, **kwargs)
+        ref = evaluate_grid(components=True, **kwargs)
+        np.testing.assert_array_equal(g.wind, ref.wind)
+        np.testing.assert_array_equal(g.quiet, ref.quiet)
@@ -0,0 +1,75 @@
+"""Unit tests for the quasi-dipole coordinate lookup table."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pyhwm2014 import numpy_backend
+from pyhwm2014.qdtable import GD2QDTable, _load_table, load_table
+
+
+class TestGD2QDTable:
+    """Test the interpolated gd2qd against the exact expansion."""
+
+    def test_cache(self, tmp_path) -> None:
+        """Test that the table is written once and then memory-mapped."""
+        table = load_table(resolution=2.0, directory=str(tmp_path))
+        files = list(tmp_path.glob("gd2qd-2-*.npy"))
+        assert len(files) == 1
+        assert isinstance(table.values, np.memmap)
+
+        _load_table.cache_clear()
+        again = load_table(resolution=2.0, directory=str(tmp_path))
+        np.testing.assert_array_equal(again.values, table.values)
+        assert table.values.shape == (7, 93, 183)
+
+    def test_concurrent_build(self, tmp_path) -> None:
+        """Test that threads building the same table do not share a temporary file."""
+        _load_table.cache_clear()
+        with ThreadPoolExecutor(4) as pool:
+            tables = list(pool.map(lambda _: load_table(4.0, str(tmp_path)), range(4)))
+        _load_table.cache_clear()
+        expected = GD2QDTable.build(resolution=4.0).values
+        for table in [*tables, load_table(4.0, str(tmp_path))]:
+            np.testing.assert_array_equal(table.values, expected)
+        assert [path.suffix for path in tmp_path.iterdir()] == [".npy"]
+
+    def test_interpolation(self) -> None:
+        """Test the interpolation error away from the quasi-dipole poles."""
+        table = GD2QDTable.build(resolution=1.0)
+        rng = np.random.default_rng(12)
+        glat = rng.uniform(-90.0, 90.0, 5000)
+        glon = rng.uniform(-180.0, 180.0, 5000)
+        result = table(glat, glon)
+        exact = numpy_backend.gd2qd(glat, glon)
+
+        # error bounds at 0.5 degrees, times 8 for the cubic scaling
+        mask = np.abs(exact[0]) < 80.0
+        dqlon = np.abs(result[1] - exact[1])
+        dqlon = np.minimum(dqlon, 360.0 - dqlon)
+        assert np.all(np.abs(result[0] - exact[0])[mask] < 4e-4)
+        assert np.all(dqlon[mask] < 4e-3)
+        for k in range(2, 6):
+            assert np.all(np.abs(result[k] - exact[k])[mask] < 8e-5)
+
+        # grid nodes and the longitude seam
+        nodes = table(np.array([0.0, 45.0, -30.0]), np.array([-180.0, 180.0, 540.0]))
+        exact = numpy_backend.gd2qd([0.0, 45.0, -30.0], [-180.0, 180.0, 180.0])
+        np.testing.assert_allclose(np.array(nodes), np.array(exact), atol=1e-4)
+
+    def test_dwm07(self) -> None:
+        """Test the disturbance winds with interpolated coordinates."""
+        table = GD2QDTable.build(resolution=1.0)
+        rng = np.random.default_rng(13)
+        n = 500
+        args = (
+            93000 + rng.integers(1, 366, n),
+            rng.uniform(0.0, 86400.0, n),
+            rng.uniform(100.0, 400.0, n),
+            rng.uniform(-60.0, 60.0, n),
+            rng.uniform(-180.0, 180.0, n),
+            rng.choice([4.0, 35.0, 200.0], n),
+        )
+        np.testing.assert_allclose(
+            numpy_backend.dwm07(*args, qdtable=table), numpy_backend.dwm07(*args), atol=0.05
+        )
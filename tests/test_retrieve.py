@@ -0,0 +1,154 @@
+"""Unit tests for the file mode of scripts/retrieve.py."""
+
+import importlib.util
+import json
+from pathlib import Path
+from types import ModuleType
+
+import numpy as np
+import pytest
+
+from pyhwm2014 import evaluate
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "retrieve.py"
+
+# iyd, sec, alt, glat, glon, ap of the test points
+POINTS = np.array(
+    [
+        (23150, 43200.0, 300.0, 40.0, -105.0, 10.0),
+        (23150, 45000.0, 250.0, -12.0, -76.9, 35.0),
+        (23151, 3600.0, 150.0, 65.0, 20.0, 10.0),
+    ]
+)
+
+
+@pytest.fixture(scope="module")
+def retrieve() -> ModuleType:
+    """Load the script as a module."""
+    spec = importlib.util.spec_from_file_location("retrieve", SCRIPT)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(retrieve: ModuleType, monkeypatch: pytest.MonkeyPatch, *args: str | Path) -> None:
+    """Run the main function of the script with the given arguments."""
+    monkeypatch.setattr("sys.argv", ["retrieve.py", *map(str, args)])
+    retrieve.main()
+
+
+def expected(points: np.ndarray) -> np.ndarray:
+    """Winds of the test points, evaluated directly."""
+    iyd, sec, alt, glat, glon, ap = points.T
+    return evaluate(iyd.astype(int), sec, alt, glat, glon, ap=ap)
+
+
+def write_csv(path: Path, points: np.ndarray, trailer: str = "") -> None:
+    """Write points to a CSV file with a header row."""
+    lines = ["iyd,sec,alt,glat,glon,ap"]
+    lines += [f"{int(p[0])},{p[1]},{p[2]},{p[3]},{p[4]},{p[5]}" for p in points]
+    path.write_text("\n".join(lines) + "\n" + trailer)
+
+
+class TestRetrieveFile:
+    """Test reading point files and writing their winds."""
+
+    def test_npy_writer(self, retrieve: ModuleType, tmp_path: Path) -> None:
+        """Test that the NPY header is rewritten with the final row count."""
+        path = tmp_path / "winds.npy"
+        writer = retrieve.NpyWriter(path)
+        w = np.arange(10.0, dtype=np.float32).reshape(5, 2)
+        writer.write(w[:2])
+        writer.write(w[2:])
+        writer.close()
+
+        rows = np.load(path)
+        assert rows.dtype == retrieve.OUTPUT_DTYPE
+        assert rows.shape == (5,)
+        np.testing.assert_array_equal(rows["meridional"], w[:, 0])
+        np.testing.assert_array_equal(rows["zonal"], w[:, 1])
+
+        retrieve.NpyWriter(path).close()
+        assert np.load(path).shape == (0,)
+
+    def test_csv(
+        self, retrieve: ModuleType, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test CSV input, including trailing blank lines, and CSV output."""
+        source, output = tmp_path / "points.csv", tmp_path / "winds.csv"
+        # the last chunk holds only the blank lines
+        write_csv(source, POINTS[:2], trailer="\n\n")
+        run(retrieve, monkeypatch, "--input", source, "--output", output, "--chunk-size", 2)
+
+        lines = output.read_text().splitlines()
+        assert lines[0] == "meridional,zonal"
+        w = np.loadtxt(lines[1:], delimiter=",")
+        np.testing.assert_allclose(w, expected(POINTS[:2]), rtol=1e-6)
+
+    def test_npy(
+        self, retrieve: ModuleType, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test structured NPY input with a time column, and NPY output."""
+        source, output = tmp_path / "points.npy", tmp_path / "winds.npy"
+        names = ("alt", "lat", "lon", "ap")
+        points = np.zeros(len(POINTS), dtype=[("time", "M8[s]")] + [(name, "f8") for name in names])
+        points["time"] = [
+            np.datetime64("2023-05-30T12:00"),
+            np.datetime64("2023-05-30T12:30"),
+            np.datetime64("2023-05-31T01:00"),
+        ]
+        for k, name in enumerate(names, start=2):
+            points[name] = POINTS[:, k]
+        np.save(source, points)
+        run(retrieve, monkeypatch, "--input", source, "--output", output, "--chunk-size", 2)
+
+        rows = np.load(output)
+        assert rows.shape == (len(POINTS),)
+        w = np.stack([rows["meridional"], rows["zonal"]], axis=-1)
+        np.testing.assert_array_equal(w, expected(POINTS))
+
+    def test_ndjson(
+        self,
+        retrieve: ModuleType,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+        tmp_path: Path,
+    ) -> None:
+        """Test NDJSON output, to a file and to stdout."""
+        source, output = tmp_path / "points.csv", tmp_path / "winds.ndjson"
+        write_csv(source, POINTS)
+        run(retrieve, monkeypatch, "--input", source, "--output", output, "--json")
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        w = np.array([[row["meridional"], row["zonal"]] for row in rows])
+        np.testing.assert_allclose(w, expected(POINTS), rtol=1e-6)
+
+        run(retrieve, monkeypatch, "--input", source, "--json")
+        assert capsys.readouterr().out == output.read_text()
+
+    def test_arguments(
+        self,
+        retrieve: ModuleType,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+        tmp_path: Path,
+    ) -> None:
+        """Test that inconsistent file-mode arguments are rejected."""
+        output = tmp_path / "winds.npy"
+        with pytest.raises(SystemExit) as exc:
+            run(retrieve, monkeypatch, "--output", output)
+        assert exc.value.code == 2
+        assert "--output requires --input" in capsys.readouterr().err
+
+        source = tmp_path / "points.csv"
+        write_csv(source, POINTS)
+        with pytest.raises(SystemExit) as exc:
+            run(retrieve, monkeypatch, "--input", source, "--output", output, "--json")
+        assert exc.value.code == 2
+        assert "--json" in capsys.readouterr().err
+        assert not output.exists()
+
+        with pytest.raises(SystemExit) as exc:
+            run(retrieve, monkeypatch, "--input", tmp_path / "missing.csv")
+        assert exc.value.code == 1
+        assert "not found" in capsys.readouterr().err
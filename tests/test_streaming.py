@@ -0,0 +1,103 @@
+"""Unit tests for the streaming evaluation API."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from pyhwm2014 import evaluate, stream
+
+
+def _points(n: int, seed: int = 0) -> tuple[np.ndarray, ...]:
+    """Random iyd, sec, alt, glat, glon and ap."""
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(1, 366, n) + 23000,
+        rng.uniform(0.0, 86400.0, n),
+        rng.uniform(80.0, 500.0, n),
+        rng.uniform(-90.0, 90.0, n),
+        rng.uniform(-180.0, 180.0, n),
+        np.where(rng.random(n) < 0.5, -1.0, rng.uniform(0.0, 300.0, n)),
+    )
+
+
+class TestStream:
+    """Test pyhwm2014.stream against pyhwm2014.evaluate."""
+
+    def test_rechunking(self) -> None:
+        """Test that any chunking reproduces a single evaluate call."""
+        points = _points(1000)
+        expected = evaluate(*points[:5], ap=points[5])
+        bounds = [0, 3, 3, 400, 401, 950, 1000]
+        chunks = [
+            tuple(a[i:j] for a in points) for i, j in zip(bounds[:-1], bounds[1:], strict=True)
+        ]
+        for batch_size in (1, 64, 100_000):
+            for readahead in (0, 2):
+                results = list(stream(chunks, batch_size=batch_size, readahead=readahead))
+                assert [len(w) for w in results] == [
+                    j - i for i, j in zip(bounds[:-1], bounds[1:], strict=True)
+                ]
+                np.testing.assert_array_equal(np.concatenate(results), expected)
+
+    def test_record_batches(self) -> None:
+        """Test record batches with named columns, aliases and a time column."""
+        iyd, sec, alt, glat, glon, ap = _points(50)
+        expected = evaluate(iyd, sec, alt, glat, glon, ap=ap)
+        batch = {"iyd": iyd, "sec": sec, "alt": alt, "lat": glat, "lon": glon, "ap": ap}
+        np.testing.assert_array_equal(next(stream([batch])), expected)
+
+        records = np.rec.fromarrays(
+            [iyd, sec, alt, glat, glon, ap], names="iyd,sec,alt,glat,glon,ap"
+        )
+        np.testing.assert_array_equal(next(stream([records])), expected)
+
+        # a datetime64 column replaces iyd and sec; ap defaults to quiet time
+        time = np.datetime64("2023-05-30") + (np.arange(24) * 3600).astype("timedelta64[s]")
+        w = next(stream([{"time": time, "alt": 300.0, "glat": 40.0, "glon": -105.0}]))
+        np.testing.assert_array_equal(
+            w, evaluate(23150, np.arange(24) * 3600.0, 300.0, 40.0, -105.0)
+        )
+
+        with pytest.raises(KeyError, match="glon"):
+            next(stream([{"iyd": iyd, "sec": sec, "alt": alt, "glat": glat}]))
+
+    def test_components(self) -> None:
+        """Test that components=True yields quiet, disturbance and total winds."""
+        points = _points(100)
+        expected = evaluate(*points[:5], ap=points[5], components=True)
+        chunks = [tuple(a[:60] for a in points), tuple(a[60:] for a in points)]
+        results = list(stream(chunks, batch_size=32, components=True))
+        for k in range(3):
+            np.testing.assert_array_equal(
+                np.concatenate([result[k] for result in results]), expected[k]
+            )
+
+    def test_readahead(self) -> None:
+        """Test that read-ahead raises source errors and stops when closed."""
+
+        def failing():
+            yield _points(10)
+            raise OSError("feed lost")
+
+        with pytest.raises(OSError, match="feed lost"):
+            list(stream(failing(), batch_size=1, readahead=1))
+
+        def endless():
+            while True:
+                yield _points(10)
+
+        results = stream(endless(), batch_size=10, readahead=4)
+        assert len(next(results)) == 10
+        results.close()
+        for thread in threading.enumerate():
+            if thread.name == "pyhwm2014-readahead":
+                thread.join(timeout=5.0)
+                assert not thread.is_alive()
+
+    def test_workers(self) -> None:
+        """Test that batches evaluated on worker processes match."""
+        points = _points(300)
+        chunks = [tuple(a[i : i + 100] for a in points) for i in range(0, 300, 100)]
+        results = list(stream(chunks, batch_size=200, workers=2))
+        np.testing.assert_array_equal(np.concatenate(results), evaluate(*points[:5], ap=points[5]))